@@ -1,13 +1,78 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import OuterRef, Subquery
+from django.utils.functional import cached_property
+from django.utils.html import format_html_join
+from .exports import export_filename, queryset_rows, stream_csv
+from .forms import CustomerPhoneForm
 from .models import (
     Customer, CustomerPhone, Hotel, Room, Booking, Payment, Review,
-    RoomImage, Facility, Cancellation, Offer
+    RoomImage, Facility, Cancellation, Offer, CustomerSummary, ArchivedBooking, PricingRule, PaymentAdjustment
 )
 
+# Below this many rows an exact count(*) is cheap enough, so we don't estimate
+ESTIMATED_COUNT_THRESHOLD = 100000
+
+
+# --- Estimated Counts for Big Tables ---
+def estimated_row_count(model, using='default'):
+    # Ask the database for its table statistics instead of counting every row
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table]
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        # Only the unfiltered changelist uses the estimate; searches and
+        # filters still get an exact count.
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+# --- Base Admin for the Big Tables ---
+class ScalableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # Skips the second count(*) on filtered pages
+    list_per_page = 50
+    actions = ['export_as_csv']
+
+    # Subclasses list the columns (ORM lookups are fine) that go into the CSV
+    export_fields = ()
+
+    @admin.action(description='Export selected rows as CSV')
+    def export_as_csv(self, request, queryset):
+        fields = self.export_fields or [f.attname for f in self.model._meta.concrete_fields]
+        return stream_csv(
+            export_filename(self.model._meta.model_name),
+            fields,
+            queryset_rows(queryset, fields)
+        )
+
+
 # --- Inlines for Composite Key Models ---
 # This lets you edit CustomerPhone from the Customer admin page
 class CustomerPhoneInline(admin.TabularInline):
     model = CustomerPhone
+    form = CustomerPhoneForm  # Normalizes the number like the profile page
     extra = 1  # Shows 1 blank form by default
 
 # This lets you edit Room from the Hotel admin page
@@ -15,34 +80,196 @@ class RoomInline(admin.TabularInline):
     model = Room
     extra = 1
 
+# Adjustments are written by date changes and kept as history (read-only)
+class PaymentAdjustmentInline(admin.TabularInline):
+    model = PaymentAdjustment
+    fk_name = 'payment'
+    extra = 0
+    can_delete = False
+    fields = ('date', 'amount', 'reason', 'previous_checkin', 'previous_checkout', 'checkin', 'checkout')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 # --- Admin Classes for Parent Models ---
 class CustomerAdmin(admin.ModelAdmin):
     inlines = [CustomerPhoneInline]  # Add the phone inline here
-    # You can add more customizations later
     list_display = ('email', 'first_name', 'last_name', 'is_staff')
+    search_fields = ('^email', '^last_name')
+    list_filter = ('is_staff', 'is_active')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+class CustomerSummaryAdmin(admin.ModelAdmin):
+    # Read-only: rows are maintained by signals and rebuild_customer_summaries
+    list_display = (
+        'cust_id', 'customer_email', 'total_bookings', 'total_nights',
+        'total_spend', 'last_stay_display', 'cancellation_rate_display'
+    )
+    search_fields = ('=cust_id',)
+    ordering = ('-total_spend',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        email = Customer.objects.filter(pk=OuterRef('cust_id')).values('email')[:1]
+        return super().get_queryset(request).annotate(customer_email=Subquery(email))
+
+    @admin.display(description='Customer')
+    def customer_email(self, obj):
+        return obj.customer_email
+
+    @admin.display(description='Last stay')
+    def last_stay_display(self, obj):
+        return obj.past_stay
+
+    @admin.display(description='Cancellation rate')
+    def cancellation_rate_display(self, obj):
+        return f'{obj.cancellation_rate:.0%}'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    # Read-only: rows are moved here by archive_bookings
+    list_display = ('booking_id', 'cust_id', 'hotel_id', 'room_number', 'checkin', 'checkout', 'status', 'archived_at')
+    search_fields = ('=booking_id', '=cust_id')
+    date_hierarchy = 'checkin'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 class HotelAdmin(admin.ModelAdmin):
     inlines = [RoomInline]  # Add the room inline here
     list_display = ('name', 'city', 'rating')
+    search_fields = ('^name', '^city', '^state')
+    list_filter = ('state',)
+    readonly_fields = ('room_images',)
+
+    # RoomImage has no foreign key to Hotel, so it can't be an inline.
+    # Show the images read-only on the hotel page instead.
+    @admin.display(description='Room images')
+    def room_images(self, obj):
+        images = RoomImage.objects.filter(hotel_id=obj.pk).order_by('room_number')
+        return format_html_join(
+            '\n', '<div>Room {}: <a href="{}">{}</a></div>',
+            ((image.room_number, image.image_url, image.reference_name or image.image_url) for image in images)
+        ) or '-'
+
+
+# --- Admin Classes for the Big Tables ---
+class BookingAdmin(ScalableAdmin):
+    list_display = ('booking_id', 'cust', 'hotel_name', 'room_number', 'checkin', 'checkout', 'status')
+    list_select_related = ('cust',)
+    list_filter = ('status',)
+    search_fields = ('=booking_id', '^cust__email', '=hotel_id', '=room_number')
+    date_hierarchy = 'checkin'
+    ordering = ('-booking_id',)
+    raw_id_fields = ('cust',)
+    export_fields = (
+        'booking_id', 'cust__email', 'hotel_id', 'room_number',
+        'bookingdate', 'checkin', 'checkout', 'status'
+    )
+
+    def get_queryset(self, request):
+        # Booking only stores a plain hotel_id, so fetch the name in the same query
+        hotel_name = Hotel.objects.filter(pk=OuterRef('hotel_id')).values('name')[:1]
+        return super().get_queryset(request).annotate(hotel_name=Subquery(hotel_name))
+
+    @admin.display(description='Hotel')
+    def hotel_name(self, obj):
+        return obj.hotel_name
+
+class PaymentAdmin(ScalableAdmin):
+    list_display = ('payment_id', 'booking', 'customer', 'amount', 'mode', 'date', 'status')
+    list_select_related = ('booking__cust',)
+    list_filter = ('status', 'mode')
+    search_fields = ('=payment_id', '=booking__booking_id', '^booking__cust__email')
+    date_hierarchy = 'date'
+    ordering = ('-payment_id',)
+    raw_id_fields = ('booking',)
+    inlines = [PaymentAdjustmentInline]
+    export_fields = (
+        'payment_id', 'booking_id', 'booking__cust__email', 'booking__hotel_id',
+        'amount', 'mode', 'date', 'status'
+    )
+
+    @admin.display(description='Customer')
+    def customer(self, obj):
+        return obj.booking.cust if obj.booking else None
+
+class ReviewAdmin(ScalableAdmin):
+    list_display = ('review_id', 'hotel', 'cust', 'rating', 'date')
+    list_select_related = ('hotel', 'cust')
+    list_filter = ('rating',)
+    search_fields = ('=review_id', '^hotel__name', '^cust__email')
+    date_hierarchy = 'date'
+    ordering = ('-review_id',)
+    raw_id_fields = ('cust', 'hotel')
+    export_fields = ('review_id', 'hotel_id', 'hotel__name', 'cust__email', 'rating', 'comment', 'date')
+
+class CancellationAdmin(ScalableAdmin):
+    list_display = ('cancellation_id', 'booking', 'customer', 'cancel_date', 'reason')
+    list_select_related = ('booking__cust',)
+    search_fields = ('=cancellation_id', '=booking__booking_id', '^booking__cust__email')
+    date_hierarchy = 'cancel_date'
+    ordering = ('-cancellation_id',)
+    raw_id_fields = ('booking',)
+    export_fields = (
+        'cancellation_id', 'booking_id', 'booking__cust__email', 'booking__hotel_id',
+        'cancel_date', 'reason'
+    )
+
+    @admin.display(description='Customer')
+    def customer(self, obj):
+        return obj.booking.cust if obj.booking else None
+
+class OfferAdmin(ScalableAdmin):
+    list_display = ('offer_id', 'hotel', 'description', 'discount', 'start_date', 'end_date')
+    list_select_related = ('hotel',)
+    search_fields = ('^hotel__name', 'description')
+    date_hierarchy = 'start_date'
+    raw_id_fields = ('hotel',)
+    export_fields = ('offer_id', 'hotel_id', 'hotel__name', 'description', 'discount', 'start_date', 'end_date')
+
+class FacilityAdmin(admin.ModelAdmin):
+    list_display = ('facility_name', 'hotel')
+    list_select_related = ('hotel',)
+    search_fields = ('^facility_name', '^hotel__name')
+    raw_id_fields = ('hotel',)
+
+class PricingRuleAdmin(admin.ModelAdmin):
+    list_display = ('hotel', 'roomtype', 'min_occupancy', 'max_occupancy', 'min_lead_days', 'max_lead_days', 'adjustment', 'active')
+    list_select_related = ('hotel',)
+    list_filter = ('active',)
+    search_fields = ('^hotel__name', 'roomtype')
+    raw_id_fields = ('hotel',)
 
 # --- Register Parent Models with their new Admin Classes ---
 admin.site.register(Customer, CustomerAdmin)
+admin.site.register(CustomerSummary, CustomerSummaryAdmin)
 admin.site.register(Hotel, HotelAdmin)
 
 # --- Register all other normal models ---
-admin.site.register(Booking)
-admin.site.register(Payment)
-admin.site.register(Review)
-admin.site.register(Facility)
-admin.site.register(Cancellation)
-admin.site.register(Offer)
+admin.site.register(Booking, BookingAdmin)
+admin.site.register(ArchivedBooking, ArchivedBookingAdmin)
+admin.site.register(Payment, PaymentAdmin)
+admin.site.register(Review, ReviewAdmin)
+admin.site.register(Facility, FacilityAdmin)
+admin.site.register(Cancellation, CancellationAdmin)
+admin.site.register(Offer, OfferAdmin)
+admin.site.register(PricingRule, PricingRuleAdmin)
 
 # --- Models we CANNOT register ---
-# These models have composite keys and are NOT registered.
-# We edit CustomerPhone and Room using the inlines above.
-# RoomImage also has a composite key and cannot be registered.
-# For now, it must be omitted from the admin.
-#
-# admin.site.register(CustomerPhone) # <-- This caused the error
-# admin.site.register(Room)          # <-- This would also cause an error
-# admin.site.register(RoomImage)     # <-- This would also cause an error
\ No newline at end of file
+# Django refuses to register models with a composite primary key
+# (CustomerPhone, Room, RoomImage). CustomerPhone and Room are edited with
+# the inlines above, and RoomImage is shown read-only on the Hotel page.
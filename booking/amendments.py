@@ -0,0 +1,56 @@
+import datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+
+from .ledger import stay_changes
+from .pricing import CENTS, quote_stay
+
+
+# --- Pricing a Change of Dates ---
+def adjustment_amount(paid, previous_nights, added, removed, rates):
+    # Added nights cost today's rate for that night; given-up nights are
+    # refunded at the average the guest paid per night, so a stay can never
+    # be refunded more than was charged for it
+    charge = sum((rate for night, rate in rates if night in added), Decimal('0'))
+    refund = paid / previous_nights * len(removed) if previous_nights else Decimal('0')
+    return (charge - refund).quantize(CENTS)
+
+
+# --- Changing a Booking's Dates ---
+def amend_stay(booking, room, checkin, checkout, today=None):
+    # Moves the booking to the new dates as a diff of nights: the ledger
+    # inserts only added nights (its unique key still rejects a clash that
+    # slipped past the form) and deletes given-up ones, and the price
+    # difference is recorded as a PaymentAdjustment. The original payment
+    # row is never rewritten. Returns the adjustment, or None.
+    today = today or datetime.date.today()
+    previous_checkin, previous_checkout = booking.checkin, booking.checkout
+    added, removed = stay_changes(previous_checkin, previous_checkout, checkin, checkout)
+    using = booking._state.db
+
+    with transaction.atomic(using=using):
+        booking.checkin = checkin
+        booking.checkout = checkout
+        booking.save()
+
+        payment = booking.payment_set.exclude(status='Cancelled').first()
+        if payment is None or not (added or removed):
+            return None
+
+        adjusted = payment.adjustments.aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        paid = (payment.amount or Decimal('0')) + adjusted
+        rates = quote_stay(room, checkin, checkout, today=today)['rates'] if added else []
+        previous_nights = (previous_checkout - previous_checkin).days if previous_checkin and previous_checkout else 0
+        amount = adjustment_amount(paid, previous_nights, set(added), removed, rates)
+        return payment.adjustments.create(
+            booking=booking,
+            amount=amount,
+            reason='Dates changed',
+            previous_checkin=previous_checkin,
+            previous_checkout=previous_checkout,
+            checkin=checkin,
+            checkout=checkout,
+            date=today,
+        )
@@ -0,0 +1,95 @@
+import re
+from array import array
+
+from .catalog import catalog_index
+from .models import Facility
+
+# --- Amenity Vocabulary ---
+# Facility names are free text ("Swimming Pool", "Free Wi-Fi", "Spa & Wellness").
+# Each one is mapped onto this fixed list, and every amenity gets one bit in
+# a hotel's mask. Append new amenities at the end; there is room for 64.
+AMENITIES = [
+    # (key, label, keywords matched as whole words in the facility name)
+    ('pool', 'Swimming Pool', ['pool', 'swimming']),
+    ('spa', 'Spa', ['spa', 'massage', 'wellness']),
+    ('gym', 'Gym', ['gym', 'fitness']),
+    ('wifi', 'Wi-Fi', ['wifi', 'wi fi', 'internet']),
+    ('parking', 'Parking', ['parking', 'valet']),
+    ('room_service', 'Room Service', ['room service']),
+    ('restaurant', 'Restaurant', ['restaurant', 'dining']),
+    ('bar', 'Bar', ['bar', 'lounge', 'pub']),
+    ('breakfast', 'Breakfast', ['breakfast']),
+    ('airport_shuttle', 'Airport Shuttle', ['airport', 'shuttle']),
+    ('ac', 'Air Conditioning', ['air conditioning', 'ac', 'a c']),
+    ('laundry', 'Laundry', ['laundry', 'dry cleaning']),
+    ('business', 'Business Centre', ['business', 'conference', 'meeting']),
+    ('pets', 'Pet Friendly', ['pet', 'pets']),
+    ('kids', 'Kids Club', ['kids', 'children', 'play area']),
+    ('beach', 'Beach Access', ['beach']),
+]
+
+AMENITY_BITS = {key: 1 << bit for bit, (key, label, keywords) in enumerate(AMENITIES)}
+AMENITY_LABELS = {key: label for key, label, keywords in AMENITIES}
+
+
+def normalize_facility(name):
+    # 'Free Wi-Fi!' -> 'wifi'; returns None if it isn't in the vocabulary
+    words = ' ' + re.sub(r'[^a-z0-9]+', ' ', (name or '').lower()).strip() + ' '
+    for key, label, keywords in AMENITIES:
+        if any(f' {keyword} ' in words for keyword in keywords):
+            return key
+    return None
+
+
+def amenity_mask(keys):
+    mask = 0
+    for key in keys:
+        mask |= AMENITY_BITS.get(key, 0)
+    return mask
+
+
+# --- In-Memory Amenity Index ---
+# Two parallel arrays (hotel ids and their 64-bit masks) built from the
+# facility table in one query. A filter like "pool AND spa AND parking" is a
+# single pass of bitwise ANDs over the whole catalog, with no SQL joins.
+class AmenityIndex:
+    __slots__ = ('hotel_ids', 'masks')
+
+    def __init__(self, rows):
+        masks_by_hotel = {}
+        for hotel_id, facility_name in rows:
+            bit = AMENITY_BITS.get(normalize_facility(facility_name))
+            if hotel_id is not None and bit:
+                masks_by_hotel[hotel_id] = masks_by_hotel.get(hotel_id, 0) | bit
+
+        self.hotel_ids = array('q', masks_by_hotel.keys())
+        self.masks = array('Q', masks_by_hotel.values())
+
+    def matching(self, mask, match_all=True):
+        if match_all:
+            return [h for h, m in zip(self.hotel_ids, self.masks) if m & mask == mask]
+        return [h for h, m in zip(self.hotel_ids, self.masks) if m & mask]
+
+    def counts(self, hotel_ids=None):
+        # How many of the given hotels (default: all) have each amenity
+        wanted = None if hotel_ids is None else set(hotel_ids)
+        totals = [0] * len(AMENITIES)
+        for hotel_id, mask in zip(self.hotel_ids, self.masks):
+            if wanted is not None and hotel_id not in wanted:
+                continue
+            bit = 0
+            while mask:
+                if mask & 1:
+                    totals[bit] += 1
+                mask >>= 1
+                bit += 1
+        return [(key, totals[bit]) for bit, (key, label, keywords) in enumerate(AMENITIES)]
+
+
+def build_amenity_index():
+    return AmenityIndex(Facility.objects.values_list('hotel_id', 'facility_name').iterator())
+
+
+def amenity_index():
+    # One index per worker process, rebuilt when the catalog version moves
+    return catalog_index('amenities', build_amenity_index)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BookingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "booking"
+
+    def ready(self):
+        # Connect the signal handlers that keep derived tables in sync
+        from . import signals  # noqa: F401
@@ -0,0 +1,123 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import (
+    ArchivedBooking, ArchivedCancellation, ArchivedPayment, Booking, Cancellation, Payment, PaymentAdjustment, RoomNight
+)
+from .sharding import booking_shards
+
+# Bookings that checked out longer ago than this are moved to the archive
+ARCHIVE_AFTER_MONTHS = 12
+
+# How many bookings (with their payments and cancellations) move per transaction
+ARCHIVE_BATCH_SIZE = 500
+
+BOOKING_FIELDS = ('booking_id', 'cust_id', 'hotel_id', 'room_number', 'bookingdate', 'checkin', 'checkout', 'status')
+PAYMENT_FIELDS = ('payment_id', 'booking_id', 'amount', 'mode', 'date', 'status')
+CANCELLATION_FIELDS = ('cancellation_id', 'booking_id', 'cancel_date', 'reason')
+
+
+def archive_cutoff(months, today=None):
+    # The first day of the month `months` months before today
+    today = today or datetime.date.today()
+    month_index = today.year * 12 + today.month - 1 - months
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def archivable_bookings(cutoff, using='default'):
+    return Booking.objects.using(using).filter(checkout__lt=cutoff).order_by('pk')
+
+
+def copy_rows(model, queryset, fields):
+    return [model(**row) for row in queryset.values(*fields)]
+
+
+def archived_payments(payments, adjustments):
+    # Archived payments carry the amount after any adjustments; the
+    # adjustment rows themselves are not kept once their booking is archived
+    adjusted = dict(adjustments.values_list('payment_id').annotate(total=Sum('amount')).order_by())
+    rows = copy_rows(ArchivedPayment, payments, PAYMENT_FIELDS)
+    for row in rows:
+        if row.payment_id in adjusted:
+            row.amount = (row.amount or 0) + adjusted[row.payment_id]
+    return rows
+
+
+# --- Moving Bookings to the Archive ---
+def archive_batch(booking_ids, using='default'):
+    # Copy, then delete, in one transaction: a batch is either fully in the
+    # hot tables or fully in the archive. The deletes are raw DELETEs so no
+    # per-row signals fire; the customer summary already counts these
+    # bookings (it reads the archive too), and their past ledger nights are
+    # removed here directly. Each shard archives into its own archive tables.
+    with transaction.atomic(using=using):
+        bookings = Booking.objects.using(using).filter(pk__in=booking_ids)
+        payments = Payment.objects.using(using).filter(booking_id__in=booking_ids)
+        cancellations = Cancellation.objects.using(using).filter(booking_id__in=booking_ids)
+        adjustments = PaymentAdjustment.objects.using(using).filter(booking_id__in=booking_ids)
+
+        ArchivedBooking.objects.using(using).bulk_create(copy_rows(ArchivedBooking, bookings, BOOKING_FIELDS))
+        ArchivedPayment.objects.using(using).bulk_create(archived_payments(payments, adjustments))
+        ArchivedCancellation.objects.using(using).bulk_create(
+            copy_rows(ArchivedCancellation, cancellations, CANCELLATION_FIELDS)
+        )
+
+        cancelled = cancellations._raw_delete(cancellations.db)
+        adjustments._raw_delete(adjustments.db)
+        paid = payments._raw_delete(payments.db)
+        RoomNight.objects.using(using).filter(booking_id__in=booking_ids).delete()
+        archived = bookings._raw_delete(bookings.db)
+    return archived, paid, cancelled
+
+
+def archive_bookings(months=ARCHIVE_AFTER_MONTHS, batch_size=ARCHIVE_BATCH_SIZE, dry_run=False, today=None):
+    cutoff = archive_cutoff(months, today)
+    stats = {'cutoff': cutoff, 'bookings': 0, 'payments': 0, 'cancellations': 0}
+
+    for alias in booking_shards():
+        candidates = archivable_bookings(cutoff, alias)
+        if dry_run:
+            stats['bookings'] += candidates.count()
+            continue
+
+        # Walk by primary key so each batch is an index range, never an OFFSET
+        last_pk = 0
+        while True:
+            booking_ids = list(candidates.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not booking_ids:
+                break
+            last_pk = booking_ids[-1]
+
+            bookings, payments, cancellations = archive_batch(booking_ids, alias)
+            stats['bookings'] += bookings
+            stats['payments'] += payments
+            stats['cancellations'] += cancellations
+    return stats
+
+
+# --- Optional MySQL Partitioning ---
+def partition_sql(first_year, last_year):
+    # Range-partitions the booking archive by check-in year, so old years can
+    # be dropped or scanned on their own. MySQL wants the partition column in
+    # the primary key and NOT NULL, and partitioned InnoDB tables can't have
+    # foreign keys, which is why the hot booking table (referenced by payment
+    # and cancellation) is not partitioned.
+    partitions = ',\n'.join(
+        f"    PARTITION p{year} VALUES LESS THAN ('{year + 1}-01-01')"
+        for year in range(first_year, last_year + 1)
+    )
+    return (
+        "UPDATE booking_archive SET CheckIn = CheckOut WHERE CheckIn IS NULL;\n"
+        "ALTER TABLE booking_archive\n"
+        "    MODIFY CheckIn DATE NOT NULL,\n"
+        "    DROP PRIMARY KEY,\n"
+        "    ADD PRIMARY KEY (Booking_ID, CheckIn);\n"
+        "ALTER TABLE booking_archive\n"
+        "PARTITION BY RANGE COLUMNS (CheckIn) (\n"
+        f"    PARTITION p_old VALUES LESS THAN ('{first_year}-01-01'),\n"
+        f"{partitions},\n"
+        "    PARTITION p_future VALUES LESS THAN (MAXVALUE)\n"
+        ");"
+    )
@@ -0,0 +1,109 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.urls import reverse
+
+from .catalog import catalog_index
+from .models import Hotel
+
+# Prefixes up to this long match too many keys to rank on every keystroke;
+# their best suggestions are ranked once, when the index is built
+SHORT_PREFIX_LENGTH = 3
+
+# The most suggestions one lookup returns
+MAX_SUGGESTIONS = 20
+
+# Cities and states first (they narrow a search), then individual hotels
+KIND_ORDER = {'city': 0, 'state': 1, 'hotel': 2}
+
+
+def normalize(text):
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', (text or '').lower())).strip()
+
+
+# --- Prefix Index ---
+# One sorted list of (key, suggestion number). Every word of a name gets its
+# own key, so "pal" finds "Taj Palace" as well as "Palace Inn". Every match
+# is ranked, so a busy city that sorts late still comes first: short prefixes
+# answer from a table of top suggestions made at build time, longer ones
+# bisect into the list and rank the few keys sharing the prefix.
+class PrefixIndex:
+    __slots__ = ('keys', 'suggestions', 'labels', 'top')
+
+    def __init__(self, hotels):
+        city_counts = Counter()
+        state_counts = Counter()
+        suggestions = []
+
+        for hotel_id, name, city, state in hotels:
+            if name:
+                suggestions.append(('hotel', name, 1, reverse('hotel-detail', args=[hotel_id])))
+            if city:
+                city_counts[city] += 1
+            if state:
+                state_counts[state] += 1
+
+        hotel_list = reverse('hotel-list')
+        for city, count in city_counts.items():
+            suggestions.append(('city', city, count, f"{hotel_list}?{urlencode({'city': city})}"))
+        for state, count in state_counts.items():
+            suggestions.append(('state', state, count, f"{hotel_list}?{urlencode({'state': state})}"))
+
+        keys = []
+        for number, (kind, label, count, url) in enumerate(suggestions):
+            words = normalize(label).split(' ')
+            for i in range(len(words)):
+                keys.append((' '.join(words[i:]), number))
+        keys.sort()
+
+        self.keys = keys
+        self.suggestions = suggestions
+        self.labels = [normalize(label) for kind, label, count, url in suggestions]
+
+        short = {}
+        for key, number in keys:
+            for length in range(1, min(len(key), SHORT_PREFIX_LENGTH) + 1):
+                short.setdefault(key[:length], set()).add(number)
+        self.top = {prefix: self.rank(prefix, numbers, MAX_SUGGESTIONS) for prefix, numbers in short.items()}
+
+    def rank(self, prefix, numbers, limit):
+        # Matching from the first word ranks above matching a later word,
+        # then cities and states above hotels, then the most hotels
+        return heapq.nsmallest(limit, numbers, key=lambda number: (
+            not self.labels[number].startswith(prefix),
+            KIND_ORDER[self.suggestions[number][0]],
+            -self.suggestions[number][2],
+            self.suggestions[number][1],
+        ))
+
+    def matching(self, prefix):
+        numbers = set()
+        i = bisect_left(self.keys, (prefix, -1))
+        while i < len(self.keys) and self.keys[i][0].startswith(prefix):
+            numbers.add(self.keys[i][1])
+            i += 1
+        return numbers
+
+    def lookup(self, query, limit=8):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        limit = min(limit, MAX_SUGGESTIONS)
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            ranked = self.top.get(prefix, [])[:limit]
+        else:
+            ranked = self.rank(prefix, self.matching(prefix), limit)
+        return [dict(zip(('type', 'label', 'count', 'url'), self.suggestions[number])) for number in ranked]
+
+
+def build_prefix_index():
+    return PrefixIndex(Hotel.objects.values_list('hotel_id', 'name', 'city', 'state').iterator())
+
+
+def prefix_index():
+    # Built once per worker and rebuilt after the catalog version moves
+    return catalog_index('autocomplete', build_prefix_index)
@@ -0,0 +1,50 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .models import Customer
+
+# How long a cached customer is trusted. Every save or delete of the
+# customer row drops it at once (booking/signals.py); this only bounds how
+# long a change made behind the ORM's back (raw SQL) can go unnoticed.
+CUSTOMER_CACHE_SECONDS = 300
+
+
+def customer_cache_key(user_id):
+    return f'auth:customer:{user_id}'
+
+
+# --- Compact Customer Snapshots ---
+# Just the row's column values, not a pickled model instance, so entries
+# stay small and survive model changes that don't touch the columns.
+def customer_snapshot(customer):
+    return {field.attname: field.value_from_object(customer) for field in Customer._meta.concrete_fields}
+
+
+def customer_from_snapshot(snapshot):
+    # Built the way the ORM builds a loaded row, so saving it is an UPDATE
+    return Customer.from_db('default', list(snapshot), list(snapshot.values()))
+
+
+def forget_customer(user_id):
+    cache.delete(customer_cache_key(user_id))
+
+
+# --- Authentication Backend ---
+# AuthenticationMiddleware asks the backend for the session's user on every
+# request. This one answers from the cache and only reads the customer
+# table on a miss. Only listed with a shared cache (config/settings.py): a
+# per-process entry would outlive a change made through another worker.
+# Django still checks the session's password hash against the cached row,
+# and a password change saves the row, which drops the entry, so other
+# sessions are logged out as before.
+class CachedCustomerBackend(ModelBackend):
+    def get_user(self, user_id):
+        snapshot = cache.get(customer_cache_key(user_id))
+        if snapshot is not None:
+            user = customer_from_snapshot(snapshot)
+            return user if self.user_can_authenticate(user) else None
+
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(customer_cache_key(user_id), customer_snapshot(user), CUSTOMER_CACHE_SECONDS)
+        return user
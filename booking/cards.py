@@ -0,0 +1,105 @@
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min
+
+from .catalog import REVIEW_STATS, bump_catalog_version
+from .models import Hotel, HotelCard, Review, Room, RoomImage
+
+# How many card rows the rebuild writes per INSERT
+REBUILD_BATCH_SIZE = 1000
+
+# Card columns in the catalog snapshot; the review columns are versioned
+# apart (snapshot.review_stats)
+CATALOG_CARD_FIELDS = ('min_price', 'max_price', 'max_capacity', 'room_count', 'cover_image')
+
+
+def room_stats():
+    return Room.objects.values('hotel_id').annotate(
+        min_price=Min('price'),
+        max_price=Max('price'),
+        max_capacity=Max('capacity'),
+        room_count=Count('room_number'),
+    ).order_by()
+
+
+def review_stats():
+    return Review.objects.filter(hotel__isnull=False).values('hotel_id').annotate(
+        review_count=Count('review_id'),
+        review_average=Avg('rating'),
+    ).order_by()
+
+
+def cover_images():
+    # The first image of the lowest-numbered room stands in for the hotel
+    return RoomImage.objects.order_by('hotel_id', 'room_number', 'image_url').values_list('hotel_id', 'image_url')
+
+
+def build_card(hotel_id, rooms=None, reviews=None, cover_image=None):
+    rooms = rooms or {}
+    reviews = reviews or {}
+    return HotelCard(
+        hotel_id=hotel_id,
+        min_price=rooms.get('min_price'),
+        max_price=rooms.get('max_price'),
+        max_capacity=rooms.get('max_capacity'),
+        room_count=rooms.get('room_count', 0),
+        cover_image=cover_image,
+        review_count=reviews.get('review_count', 0),
+        review_average=reviews.get('review_average'),
+    )
+
+
+# --- Incremental Refresh (one hotel) ---
+def refresh_hotel_card(hotel_id):
+    # Only a change to the snapshot's card columns bumps the catalog version.
+    # A review only moves the review stats, whose own version rebuilds just
+    # those, so every worker's snapshot, indexes and searches survive it.
+    if not Hotel.objects.filter(pk=hotel_id).exists():
+        HotelCard.objects.filter(hotel_id=hotel_id).delete()
+        bump_catalog_version()
+        return None
+
+    previous = HotelCard.objects.filter(hotel_id=hotel_id).values(*CATALOG_CARD_FIELDS).first()
+    card = build_card(
+        hotel_id,
+        rooms=room_stats().filter(hotel_id=hotel_id).order_by('hotel_id').first(),
+        reviews=review_stats().filter(hotel_id=hotel_id).order_by('hotel_id').first(),
+        cover_image=cover_images().filter(hotel_id=hotel_id).values_list('image_url', flat=True).first(),
+    )
+    card.save()
+    if previous is None or any(previous[name] != getattr(card, name) for name in CATALOG_CARD_FIELDS):
+        bump_catalog_version()
+    else:
+        bump_catalog_version(REVIEW_STATS)
+    return card
+
+
+def schedule_card_refresh(hotel_id, using='default'):
+    if hotel_id:
+        transaction.on_commit(lambda: refresh_hotel_card(hotel_id), using=using)
+
+
+# --- Full Rebuild ---
+def rebuild_hotel_cards(batch_size=REBUILD_BATCH_SIZE):
+    # Three grouped queries for the whole catalog, then one INSERT per batch
+    rooms = {row['hotel_id']: row for row in room_stats()}
+    reviews = {row['hotel_id']: row for row in review_stats()}
+    covers = {}
+    for hotel_id, image_url in cover_images().iterator():
+        covers.setdefault(hotel_id, image_url)
+
+    written = 0
+    with transaction.atomic():
+        HotelCard.objects.all().delete()
+        batch = []
+        for hotel_id in Hotel.objects.values_list('pk', flat=True).iterator():
+            batch.append(build_card(hotel_id, rooms.get(hotel_id), reviews.get(hotel_id), covers.get(hotel_id)))
+            if len(batch) >= batch_size:
+                HotelCard.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            HotelCard.objects.bulk_create(batch)
+            written += len(batch)
+    bump_catalog_version()
+    bump_catalog_version(REVIEW_STATS)
+    return written
@@ -0,0 +1,67 @@
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models import CatalogVersion
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+# Rows of the catalog_version table. The hotel cards' review stats change with
+# every review, so they have their own version: a new review then rebuilds
+# only what is derived from the review stats, not every catalog index.
+CATALOG = 1
+REVIEW_STATS = 2
+
+# How long a worker trusts its cached version before asking the database again.
+# Other workers see a catalog change within this many seconds.
+CATALOG_VERSION_TTL = 5
+
+
+# --- Catalog Version Stamp ---
+def version_key(stamp):
+    return CATALOG_VERSION_KEY if stamp == CATALOG else f'{CATALOG_VERSION_KEY}:{stamp}'
+
+
+def catalog_version(stamp=CATALOG):
+    version = cache.get(version_key(stamp))
+    if version is None:
+        version = CatalogVersion.objects.filter(pk=stamp).values_list('version', flat=True).first() or 0
+        cache.set(version_key(stamp), version, CATALOG_VERSION_TTL)
+    return version
+
+
+def bump_catalog_version(stamp=CATALOG):
+    updated = CatalogVersion.objects.filter(pk=stamp).update(version=F('version') + 1)
+    if not updated:
+        CatalogVersion.objects.get_or_create(pk=stamp, defaults={'version': 1})
+    cache.delete(version_key(stamp))
+
+
+def schedule_catalog_bump(using='default'):
+    # Bump after commit so nobody rebuilds from rows that could still roll back
+    transaction.on_commit(bump_catalog_version, using=using)
+
+
+# --- Per-Process Catalog Indexes ---
+# In-memory structures derived from the catalog (amenity masks, the
+# autocomplete index, ...). Each one is built on first use and rebuilt the
+# next time it is asked for after the catalog version has moved.
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def catalog_index(name, build, stamp=CATALOG):
+    version = catalog_version(stamp)
+    cached = _indexes.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _indexes_lock:
+        cached = _indexes.get(name)
+        if cached is None or cached[0] != version:
+            # Swap in the new index whole; readers never see a half-built one
+            cached = (version, build())
+            _indexes[name] = cached
+        return cached[1]
@@ -0,0 +1,126 @@
+import datetime
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    AccountDeletion, ArchivedBooking, Booking, Cancellation, Customer, CustomerPhone,
+    CustomerSummary, Payment, Review
+)
+from .sharding import booking_shards
+
+# Rows touched per transaction, so no single statement holds locks for long
+DELETION_BATCH_SIZE = 200
+
+
+# --- Step 1: in the request ---
+def request_account_deletion(customer):
+    # Only the customer's own row is written here: it can no longer log in
+    # and no longer carries personal data. Everything else is left to the worker.
+    with transaction.atomic():
+        customer.is_active = False
+        customer.set_unusable_password()
+        customer.email = f'deleted-{customer.pk}@deleted.invalid'
+        customer.first_name = None
+        customer.last_name = None
+        customer.dateofbirth = None
+        customer.city = None
+        customer.state = None
+        customer.country = None
+        customer.save()
+        job, created = AccountDeletion.objects.get_or_create(cust_id=customer.pk)
+    return job
+
+
+# --- Step 2: the worker, one bounded batch at a time ---
+def cancel_upcoming_batch(cust_id, batch_size, today, using='default'):
+    # Stays that haven't started are cancelled the same way a customer
+    # cancels one, which frees their nights in the room ledger
+    with transaction.atomic(using=using):
+        bookings = list(
+            Booking.objects.using(using).filter(cust_id=cust_id, checkin__gte=today)
+            .exclude(status='Cancelled')
+            .order_by('pk')[:batch_size]
+        )
+        for booking in bookings:
+            booking.status = 'Cancelled'
+            booking.save()
+
+        booking_ids = [booking.pk for booking in bookings]
+        Payment.objects.using(using).filter(booking_id__in=booking_ids).update(status='Cancelled')
+        Cancellation.objects.using(using).bulk_create([
+            Cancellation(booking_id=booking_id, cancel_date=today, reason='Account deleted')
+            for booking_id in booking_ids
+        ])
+    return len(bookings)
+
+
+def detach_batch(model, cust_id, batch_size, using='default'):
+    # Bookings, payments and reviews are kept (they are financial records or
+    # part of a hotel's rating) but no longer point at the customer
+    rows = model.objects.using(using)
+    with transaction.atomic(using=using):
+        ids = list(rows.filter(cust_id=cust_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if ids:
+            rows.filter(pk__in=ids).update(cust_id=None)
+    return len(ids)
+
+
+def remove_account(cust_id):
+    with transaction.atomic():
+        CustomerPhone.objects.filter(cust_id=cust_id).delete()
+        CustomerSummary.objects.filter(cust_id=cust_id).delete()
+        # Nothing references the customer any more, so this is a single-row delete
+        Customer.objects.filter(pk=cust_id).delete()
+
+
+def run_batches(step, batch_size, pause):
+    # Repeats one batch until a short batch says there is nothing left
+    touched = 0
+    while True:
+        count = step()
+        touched += count
+        if count < batch_size:
+            return touched
+        if pause:
+            time.sleep(pause)
+
+
+def run_stage(stage, cust_id, batch_size, pause, today):
+    # Bookings are spread over the booking shards; each is worked through in turn
+    if stage == 'cancel':
+        return sum(
+            run_batches(lambda: cancel_upcoming_batch(cust_id, batch_size, today, alias), batch_size, pause)
+            for alias in booking_shards()
+        )
+    if stage == 'detach':
+        return sum(
+            run_batches(lambda: detach_batch(model, cust_id, batch_size, alias), batch_size, pause)
+            for alias in booking_shards()
+            for model in (Booking, ArchivedBooking)
+        )
+    if stage == 'reviews':
+        return run_batches(lambda: detach_batch(Review, cust_id, batch_size), batch_size, pause)
+    remove_account(cust_id)
+    return 1
+
+
+def process_account_deletion(job, batch_size=DELETION_BATCH_SIZE, pause=0):
+    # Runs the job's remaining stages. The stage is saved as it advances, so
+    # an interrupted run picks up where it stopped. Returns rows touched.
+    today = datetime.date.today()
+    stages = [stage for stage, label in AccountDeletion.STAGES]
+    touched = 0
+
+    while job.stage != 'done':
+        touched += run_stage(job.stage, job.cust_id, batch_size, pause, today)
+        job.stage = stages[stages.index(job.stage) + 1]
+        if job.stage == 'done':
+            job.completed_at = timezone.now()
+        job.save(update_fields=['stage', 'completed_at'])
+    return touched
+
+
+def pending_deletions():
+    return AccountDeletion.objects.filter(completed_at__isnull=True).order_by('requested_at')
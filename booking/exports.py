@@ -0,0 +1,146 @@
+import csv
+import datetime
+import itertools
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef, Subquery
+from django.http import StreamingHttpResponse
+
+from .models import Booking, Cancellation, Hotel, Payment, Review
+from .sharding import HOTEL_SHARDED_MODELS, booking_shards
+
+# How many rows the database cursor fetches at a time while streaming
+EXPORT_CHUNK_SIZE = 2000
+
+
+# --- Streaming CSV helpers ---
+# csv.writer wants a file object; this one just hands back each line so the
+# response can stream it straight to the client instead of buffering.
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_rows(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_csv(filename, header, rows):
+    response = StreamingHttpResponse(csv_rows(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def export_filename(prefix, extension='csv'):
+    return f'{prefix}-{datetime.date.today().isoformat()}.{extension}'
+
+
+def queryset_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    # mysqlclient buffers a whole result set even with .iterator(), so walk
+    # the table in primary-key order one chunk at a time instead. Each chunk
+    # is a cheap indexed range scan and memory stays flat however many rows
+    # there are.
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk.values_list('pk', *fields)[:chunk_size])
+        for row in rows:
+            yield row[1:]
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
+
+
+# --- Streaming JSON Lines ---
+def jsonl_rows(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def stream_jsonl(filename, header, rows):
+    response = StreamingHttpResponse(jsonl_rows(header, rows), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# --- Staff Report Definitions ---
+# Booking (and everything hanging off it) only stores a plain hotel_id,
+# so the hotel name is pulled in with a correlated subquery.
+def hotel_name_for(hotel_id_field):
+    return Subquery(Hotel.objects.filter(pk=OuterRef(hotel_id_field)).values('name')[:1])
+
+
+def booking_export():
+    return Booking.objects.annotate(hotel_name=hotel_name_for('hotel_id'))
+
+
+def payment_export():
+    return Payment.objects.annotate(hotel_name=hotel_name_for('booking__hotel_id'))
+
+
+def cancellation_export():
+    return Cancellation.objects.annotate(hotel_name=hotel_name_for('booking__hotel_id'))
+
+
+def review_export():
+    return Review.objects.all()
+
+
+# kind -> (queryset factory, exported columns, date column used by ?start=&end=)
+EXPORTS = {
+    'bookings': (
+        booking_export,
+        ('booking_id', 'bookingdate', 'checkin', 'checkout', 'status',
+         'hotel_id', 'hotel_name', 'room_number',
+         'cust_id', 'cust__email', 'cust__first_name', 'cust__last_name'),
+        'checkin',
+    ),
+    'payments': (
+        payment_export,
+        ('payment_id', 'date', 'amount', 'mode', 'status', 'booking_id',
+         'booking__hotel_id', 'hotel_name', 'booking__room_number',
+         'booking__cust_id', 'booking__cust__email'),
+        'date',
+    ),
+    'reviews': (
+        review_export,
+        ('review_id', 'date', 'rating', 'comment',
+         'hotel_id', 'hotel__name', 'hotel__city',
+         'cust_id', 'cust__email'),
+        'date',
+    ),
+    'cancellations': (
+        cancellation_export,
+        ('cancellation_id', 'cancel_date', 'reason', 'booking_id',
+         'booking__hotel_id', 'hotel_name', 'booking__checkin', 'booking__checkout',
+         'booking__cust_id', 'booking__cust__email'),
+        'cancel_date',
+    ),
+}
+
+EXPORT_FORMATS = {
+    'csv': stream_csv,
+    'jsonl': stream_jsonl,
+}
+
+
+def export_response(kind, fmt, start=None, end=None):
+    queryset_factory, fields, date_field = EXPORTS[kind]
+    queryset = queryset_factory()
+    if start:
+        queryset = queryset.filter(**{f'{date_field}__gte': start})
+    if end:
+        queryset = queryset.filter(**{f'{date_field}__lte': end})
+
+    # Booking tables are read shard by shard, one after the other
+    querysets = [queryset]
+    if queryset.model._meta.model_name in HOTEL_SHARDED_MODELS:
+        querysets = [queryset.using(alias) for alias in booking_shards()]
+
+    rows = itertools.chain.from_iterable(queryset_rows(qs, fields) for qs in querysets)
+    return EXPORT_FORMATS[fmt](export_filename(kind, fmt), fields, rows)
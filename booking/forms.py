@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
+from .ledger import booked_nights, booked_rooms, nights_taken, stay_changes
 from .models import Customer, Booking, Review, CustomerPhone, Cancellation
+from .phones import normalize_phone
 import datetime
 
 # --- CustomerCreationForm (no changes) ---
@@ -49,17 +51,26 @@ class BookingForm(forms.ModelForm):
                     "Check-out date must be after the check-in date."
                 )
 
-            if self.room: 
-                # Find conflicting bookings
-                conflicts = Booking.objects.filter(
-                    hotel_id=self.room.hotel_id,
-                    room_number=self.room.room_number, 
-                    checkin__lt=checkout_date,
-                    checkout__gt=checkin_date
-                ).exclude(status='Cancelled')
+            editing = self.instance.pk and self.instance.status != 'Cancelled' and self.instance.checkin and self.instance.checkout
+            if self.room and editing:
+                # Editing a booking: it already holds its current nights, so
+                # only the nights the change adds can clash. Shortening a
+                # stay adds none and needs no lookup at all.
+                added, removed = stay_changes(self.instance.checkin, self.instance.checkout, checkin_date, checkout_date)
+                if added and nights_taken(self.room.hotel_id, self.room.room_number, added).exists():
+                    raise forms.ValidationError(
+                        "This room is already booked for the selected dates."
+                    )
 
-                if self.instance and self.instance.pk:
-                    conflicts = conflicts.exclude(pk=self.instance.pk)
+            elif self.room: 
+                # Find nights already taken in the room-night ledger
+                conflicts = booked_nights(
+                    self.room.hotel_id,
+                    self.room.room_number,
+                    checkin_date,
+                    checkout_date,
+                    exclude_booking=self.instance.pk if self.instance else None
+                )
 
                 if conflicts.exists():
                     raise forms.ValidationError(
@@ -69,6 +80,52 @@ class BookingForm(forms.ModelForm):
         return cleaned_data
 
 
+# --- GroupBookingForm ---
+# Several rooms of one hotel for the same dates
+class GroupBookingForm(forms.Form):
+    checkin = forms.DateField(widget=DateInput(), label='Check-in')
+    checkout = forms.DateField(widget=DateInput(), label='Check-out')
+    rooms = forms.MultipleChoiceField(widget=forms.CheckboxSelectMultiple, label='Rooms')
+
+    def __init__(self, *args, **kwargs):
+        # The view passes the hotel's bookable rooms
+        self.hotel_rooms = kwargs.pop('rooms', [])
+        super().__init__(*args, **kwargs)
+        self.fields['rooms'].choices = [
+            (room.room_number, f'Room {room.room_number} ({room.roomtype}, sleeps {room.capacity}) - ${room.price} per night')
+            for room in self.hotel_rooms
+        ]
+
+    def clean_checkin(self):
+        checkin_date = self.cleaned_data.get('checkin')
+        if checkin_date and checkin_date < datetime.date.today():
+            raise forms.ValidationError("Check-in date cannot be in the past.")
+        return checkin_date
+
+    def clean(self):
+        cleaned_data = super().clean()
+        checkin_date = cleaned_data.get('checkin')
+        checkout_date = cleaned_data.get('checkout')
+        room_numbers = cleaned_data.get('rooms')
+
+        if checkin_date and checkout_date:
+            if checkout_date <= checkin_date:
+                raise forms.ValidationError(
+                    "Check-out date must be after the check-in date."
+                )
+
+            if room_numbers and self.hotel_rooms:
+                # One query checks every selected room
+                taken = booked_rooms(self.hotel_rooms[0].hotel_id, room_numbers, checkin_date, checkout_date)
+                if taken:
+                    raise forms.ValidationError(
+                        "These rooms are already booked for the selected dates: %s."
+                        % ', '.join(sorted(taken))
+                    )
+
+        return cleaned_data
+
+
 # Review Form
 RATING_CHOICES = [
     (5, '5 Stars - Excellent'),
@@ -100,6 +157,10 @@ class CustomerPhoneForm(forms.ModelForm):
         # We only need the user to provide these two fields
         fields = ['phone_number', 'is_primary']
 
+    # Stored in E.164 form, so every number is written (and found) one way
+    def clean_phone_number(self):
+        return normalize_phone(self.cleaned_data['phone_number'])
+
 
 # Customer Update Form
 class CustomerUpdateForm(forms.ModelForm):
@@ -0,0 +1,65 @@
+from django.db.models import OuterRef, Subquery
+
+from .models import Booking, CustomerPhone, RoomNight
+from .sharding import shard_for_hotel
+
+# Rows per page on the front-desk dashboard
+FRONT_DESK_PAGE_SIZE = 50
+
+FRONT_DESK_LISTS = {
+    'arrivals': 'Arrivals',
+    'departures': 'Departures',
+    'in_house': 'Staying Over',
+}
+
+FRONT_DESK_EXPORT_FIELDS = [
+    ('Room', 'room_number'),
+    ('Booking ID', 'booking_id'),
+    ('First Name', 'cust__first_name'),
+    ('Last Name', 'cust__last_name'),
+    ('Email', 'cust__email'),
+    ('Phone', 'primary_phone'),
+    ('Check-in', 'checkin'),
+    ('Check-out', 'checkout'),
+    ('Status', 'status'),
+]
+
+
+def primary_phone():
+    return Subquery(
+        CustomerPhone.objects.filter(cust_id=OuterRef('cust_id'), is_primary=True).values('phone_number')[:1]
+    )
+
+
+# --- The Three Lists ---
+# Each list is one query on an index: arrivals and departures use
+# (Hotel_ID, CheckIn) / (Hotel_ID, CheckOut) on booking, and guests staying
+# over are the ledger's (hotel, night) rows for bookings that started earlier.
+def front_desk_filter(bookings, hotel_id, day, kind):
+    if kind == 'arrivals':
+        return bookings.filter(checkin=day)
+    if kind == 'departures':
+        return bookings.filter(checkout=day)
+    staying = RoomNight.objects.using(bookings.db).filter(hotel_id=hotel_id, night=day).values('booking_id')
+    return bookings.filter(pk__in=staying, checkin__lt=day)
+
+
+def hotel_bookings(hotel_id):
+    # Read from the hotel's shard; the guest name and phone joins there use
+    # its copies of the customer tables (see "Booking Shards" in the README)
+    return Booking.objects.using(shard_for_hotel(hotel_id)).filter(hotel_id=hotel_id).exclude(status='Cancelled')
+
+
+def front_desk_bookings(hotel_id, day, kind):
+    bookings = hotel_bookings(hotel_id)
+    return (
+        front_desk_filter(bookings, hotel_id, day, kind)
+        .select_related('cust')
+        .annotate(primary_phone=primary_phone())
+        .order_by('room_number', 'pk')
+    )
+
+
+def front_desk_counts(hotel_id, day):
+    bookings = hotel_bookings(hotel_id)
+    return {kind: front_desk_filter(bookings, hotel_id, day, kind).count() for kind in FRONT_DESK_LISTS}
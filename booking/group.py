@@ -0,0 +1,83 @@
+from django.db import transaction
+
+from .ledger import insert_nights, ledger_rows, nights_between
+from .live import booking_event, publish_after_commit
+from .models import Booking, Payment
+from .outbox import record_events
+from .sharding import check_hotel_writable, shard_for_hotel
+from .summaries import schedule_summary_refresh
+
+
+# --- Group Booking ---
+def create_group_booking(customer, hotel_id, room_amounts, checkin, checkout, today):
+    # room_amounts maps room number -> amount charged for that room.
+    # Every Booking, Payment and ledger row goes in with bulk inserts in one
+    # transaction; if any room's nights are taken (RoomNotAvailable), nothing is saved.
+    room_numbers = sorted(room_amounts)
+
+    # bulk_create skips Booking.save(), so check and place the hotel here
+    check_hotel_writable(hotel_id)
+    shard = shard_for_hotel(hotel_id)
+
+    with transaction.atomic(using=shard):
+        bookings = Booking.objects.using(shard).bulk_create([
+            Booking(
+                cust=customer,
+                hotel_id=hotel_id,
+                room_number=room_number,
+                bookingdate=today,
+                checkin=checkin,
+                checkout=checkout,
+                status='Confirmed'
+            )
+            for room_number in room_numbers
+        ])
+
+        # MySQL doesn't return ids from a bulk insert. A confirmed booking's
+        # (hotel, room, check-in) can't repeat, so read the new ids back by that.
+        if any(booking.pk is None for booking in bookings):
+            ids = dict(
+                Booking.objects.using(shard).filter(
+                    cust=customer,
+                    hotel_id=hotel_id,
+                    room_number__in=room_numbers,
+                    checkin=checkin,
+                    checkout=checkout,
+                    bookingdate=today,
+                    status='Confirmed'
+                ).order_by('pk').values_list('room_number', 'pk')
+            )
+            for booking in bookings:
+                booking.pk = ids[booking.room_number]
+
+        # bulk_create skips Booking.save(), so write the ledger nights here
+        nights = nights_between(checkin, checkout)
+        insert_nights(
+            [
+                row
+                for booking in bookings
+                for row in ledger_rows(booking.pk, {(hotel_id, booking.room_number, night) for night in nights})
+            ],
+            using=shard
+        )
+
+        payments = Payment.objects.using(shard).bulk_create([
+            Payment(
+                booking=booking,
+                amount=room_amounts[booking.room_number],
+                mode='Card',
+                date=today,
+                status='Completed'
+            )
+            for booking in bookings
+        ])
+
+        # bulk_create skips OutboxMixin.save() and the live availability signal as well
+        record_events(bookings, 'saved', using=shard)
+        record_events(payments, 'saved', using=shard)
+        for booking in bookings:
+            publish_after_commit(booking_event(booking), shard)
+
+    # bulk_create sends no post_save signals either
+    schedule_summary_refresh(customer.pk)
+    return bookings
@@ -0,0 +1,107 @@
+import secrets
+import time
+
+from django.core.cache import cache
+
+# How long a claim on a token is held in the cache
+IDEMPOTENCY_TOKEN_SECONDS = 60 * 60
+
+# Confirmation pages a session can have open at once; older tokens are dropped
+IDEMPOTENCY_MAX_TOKENS = 10
+
+# How long a duplicate submit waits for the first one to finish
+IDEMPOTENCY_WAIT_SECONDS = 5
+IDEMPOTENCY_POLL_SECONDS = 0.1
+
+SESSION_TOKENS_KEY = 'confirmation_tokens'
+
+# claim_token() result when the first submit is still running after the wait
+PENDING = 'pending'
+
+
+class InvalidToken(Exception):
+    # Never issued to this session, dropped, or issued for a different stay
+    pass
+
+
+def claim_key(session, token):
+    return f'idempotency:{session.session_key}:{token}'
+
+
+# --- Single-Use Confirmation Tokens ---
+# The confirmation page carries a token; the first submit that claims it
+# does the work and records its outcome (message level, message, redirect
+# URL) under the token. Double clicks and network retries of the same page
+# get that outcome back instead of booking and charging again.
+#
+# Tokens and outcomes live in the session, which is stored in the database,
+# so a retry answered by any worker finds them. Only the claim, which has to
+# be atomic, goes through cache.add(); a double submit that two workers
+# receive at the same moment is only caught with a shared cache (REDIS_URL).
+def issue_token(session, scope, quote=None):
+    # quote: what the page asks the guest to agree to (e.g. the total)
+    token = secrets.token_urlsafe(16)
+    tokens = session.get(SESSION_TOKENS_KEY, {})
+    tokens[token] = {'scope': scope, 'quote': quote}
+    session[SESSION_TOKENS_KEY] = dict(list(tokens.items())[-IDEMPOTENCY_MAX_TOKENS:])
+    return token
+
+
+def stored_outcome(entry):
+    outcome = entry.get('outcome')
+    return tuple(outcome) if outcome is not None else None
+
+
+def token_outcome(session, token):
+    # The recorded outcome of an earlier submit of this page, or None when
+    # it hasn't been used. No scope check: the first submit has already
+    # cleared the stay from the session.
+    entry = session.get(SESSION_TOKENS_KEY, {}).get(token or '')
+    if entry is None:
+        raise InvalidToken()
+    return stored_outcome(entry)
+
+
+def issued_quote(session, token):
+    return session.get(SESSION_TOKENS_KEY, {}).get(token or '', {}).get('quote')
+
+
+def fresh_entry(session, token):
+    # The token as saved by other requests, not this request's copy
+    saved = type(session)(session.session_key)
+    return saved.get(SESSION_TOKENS_KEY, {}).get(token) or {}
+
+
+def claim_token(session, token, scope, wait=IDEMPOTENCY_WAIT_SECONDS):
+    # None means this request owns the token and should go ahead. Otherwise
+    # returns the outcome another submit recorded, or PENDING.
+    entry = session.get(SESSION_TOKENS_KEY, {}).get(token or '')
+    if entry is None:
+        raise InvalidToken()
+    if stored_outcome(entry) is not None:
+        return stored_outcome(entry)
+    if entry.get('scope') != scope:
+        raise InvalidToken()
+    if cache.add(claim_key(session, token), True, IDEMPOTENCY_TOKEN_SECONDS):
+        return None
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(IDEMPOTENCY_POLL_SECONDS)
+        outcome = stored_outcome(fresh_entry(session, token))
+        if outcome is not None:
+            return outcome
+    return PENDING
+
+
+def record_outcome(session, token, outcome):
+    # Saved right away so a submit waiting in claim_token() sees it
+    tokens = session.get(SESSION_TOKENS_KEY, {})
+    tokens[token] = {**tokens.get(token, {}), 'outcome': list(outcome)}
+    session[SESSION_TOKENS_KEY] = tokens
+    session.save()
+
+
+def release_token(session, token):
+    # For failures worth retrying with the same page
+    cache.delete(claim_key(session, token))
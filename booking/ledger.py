@@ -0,0 +1,166 @@
+import datetime
+
+from django.db import IntegrityError, transaction
+
+from .models import Booking, RoomNight
+from .sharding import shard_for_hotel
+
+
+class RoomNotAvailable(Exception):
+    pass
+
+
+# --- Which Nights a Booking Holds ---
+def nights_between(checkin, checkout):
+    return [checkin + datetime.timedelta(days=i) for i in range((checkout - checkin).days)]
+
+
+def stay_changes(previous_checkin, previous_checkout, checkin, checkout):
+    # (added, removed): the nights a change of dates adds and gives up
+    # (missing dates hold no nights)
+    before = set(nights_between(previous_checkin, previous_checkout)) if previous_checkin and previous_checkout else set()
+    after = set(nights_between(checkin, checkout)) if checkin and checkout else set()
+    return sorted(after - before), sorted(before - after)
+
+
+def booking_nights(booking):
+    # Cancelled bookings (and half-filled ones) hold no nights
+    if booking.status == 'Cancelled' or not (booking.checkin and booking.checkout):
+        return set()
+    if booking.hotel_id is None or not booking.room_number:
+        return set()
+    return {
+        (booking.hotel_id, booking.room_number, night)
+        for night in nights_between(booking.checkin, booking.checkout)
+    }
+
+
+def ledger_rows(booking_id, nights):
+    return [
+        RoomNight(hotel_id=hotel_id, room_number=room_number, night=night, booking_id=booking_id)
+        for hotel_id, room_number, night in sorted(nights)
+    ]
+
+
+def insert_nights(rows, using):
+    # A savepoint keeps the caller's transaction usable if the insert clashes
+    try:
+        with transaction.atomic(using=using):
+            RoomNight.objects.using(using).bulk_create(rows)
+    except IntegrityError:
+        raise RoomNotAvailable("This room is already booked for the selected dates.")
+
+
+# --- Keeping the Ledger in Step ---
+def sync_booking_nights(booking):
+    # Only the difference is written: nights the booking no longer holds are
+    # deleted and newly added nights are inserted. Shortening a stay never inserts.
+    using = booking._state.db or 'default'
+    ledger = RoomNight.objects.using(using)
+
+    current = {
+        (row.hotel_id, row.room_number, row.night): row.pk
+        for row in ledger.filter(booking_id=booking.pk)
+    }
+    wanted = booking_nights(booking)
+
+    removed = [pk for key, pk in current.items() if key not in wanted]
+    added = wanted - current.keys()
+
+    if removed:
+        ledger.filter(pk__in=removed).delete()
+    if added:
+        insert_nights(ledger_rows(booking.pk, added), using)
+
+
+def release_booking_nights(booking_id, using='default'):
+    RoomNight.objects.using(using).filter(booking_id=booking_id).delete()
+
+
+def booked_nights(hotel_id, room_number, checkin, checkout, exclude_booking=None, using=None):
+    # Indexed lookup on the unique (hotel, room, night) key, not a range scan of bookings
+    nights = RoomNight.objects.using(using or shard_for_hotel(hotel_id)).filter(
+        hotel_id=hotel_id,
+        room_number=room_number,
+        night__gte=checkin,
+        night__lt=checkout,
+    )
+    if exclude_booking is not None:
+        nights = nights.exclude(booking_id=exclude_booking)
+    return nights
+
+
+def nights_taken(hotel_id, room_number, nights, using=None):
+    # The same index, for exactly these nights (e.g. the ones an edit adds)
+    return RoomNight.objects.using(using or shard_for_hotel(hotel_id)).filter(
+        hotel_id=hotel_id,
+        room_number=room_number,
+        night__in=nights,
+    )
+
+
+def booked_rooms(hotel_id, room_numbers, checkin, checkout, using=None):
+    # Which of these rooms have any night taken in the range: one query for all of them
+    return set(
+        RoomNight.objects.using(using or shard_for_hotel(hotel_id)).filter(
+            hotel_id=hotel_id,
+            room_number__in=room_numbers,
+            night__gte=checkin,
+            night__lt=checkout,
+        ).values_list('room_number', flat=True).distinct()
+    )
+
+
+# --- Backfill & Verification ---
+def reconcile_ledger(batch_size=500, fix=False, using='default'):
+    # Walk every booking in primary-key batches and compare the nights it
+    # should hold with what the ledger has. With fix=True, missing rows are
+    # inserted and stale ones deleted. Returns counts for the report.
+    stats = {'bookings': 0, 'missing': 0, 'stale': 0, 'conflicts': [], 'orphans': 0}
+    ledger = RoomNight.objects.using(using)
+    bookings = Booking.objects.using(using).order_by('pk')
+
+    last_pk = 0
+    while True:
+        batch = list(bookings.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        stats['bookings'] += len(batch)
+
+        current = {}
+        for row in ledger.filter(booking_id__in=[b.pk for b in batch]):
+            current.setdefault(row.booking_id, {})[(row.hotel_id, row.room_number, row.night)] = row.pk
+
+        stale, missing = [], {}
+        for booking in batch:
+            have = current.get(booking.pk, {})
+            wanted = booking_nights(booking)
+            stale.extend(pk for key, pk in have.items() if key not in wanted)
+            if wanted - have.keys():
+                missing[booking.pk] = wanted - have.keys()
+
+        stats['stale'] += len(stale)
+        stats['missing'] += sum(len(nights) for nights in missing.values())
+        if not fix:
+            continue
+
+        with transaction.atomic(using=using):
+            if stale:
+                ledger.filter(pk__in=stale).delete()
+            rows = [row for booking_id, nights in missing.items() for row in ledger_rows(booking_id, nights)]
+            try:
+                insert_nights(rows, using)
+            except RoomNotAvailable:
+                # Some existing bookings already overlap; insert them one by
+                # one so the clean ones still land and the clashes get reported
+                for booking_id, nights in missing.items():
+                    try:
+                        insert_nights(ledger_rows(booking_id, nights), using)
+                    except RoomNotAvailable:
+                        stats['conflicts'].append(booking_id)
+
+    stats['orphans'] = ledger.exclude(booking_id__in=Booking.objects.using(using).values('pk')).count()
+    if fix and stats['orphans']:
+        ledger.exclude(booking_id__in=Booking.objects.using(using).values('pk')).delete()
+    return stats
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+# Events a slow client may fall behind by before it is dropped; the browser
+# reconnects on its own and starts fresh
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Idle streams get a comment line this often so proxies don't close them
+KEEPALIVE_SECONDS = 15
+
+# How long the browser waits before reconnecting a dropped stream
+RECONNECT_MS = 5000
+
+# Redis channel that carries events between processes (see RedisRelay)
+AVAILABILITY_CHANNEL = 'live:availability'
+
+# How long the relay waits before resubscribing after losing Redis
+RELAY_RETRY_SECONDS = 5
+
+
+# --- In-Process Broker ---
+# hotel_id -> set of subscribers, each an asyncio queue on the event loop of
+# the connection that owns it. Publishing is thread-safe, so sync views and
+# signal handlers can publish into async streams. An idle subscriber is just
+# a queue: no thread, no database connection. Events reach it from this
+# process directly, or from every process through RedisRelay.
+class AvailabilityBroker:
+    def __init__(self):
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, hotel_id):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+        with self.lock:
+            self.subscribers.setdefault(hotel_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, hotel_id, subscriber):
+        with self.lock:
+            subscribers = self.subscribers.get(hotel_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.subscribers[hotel_id]
+
+    def publish(self, hotel_id, event):
+        with self.lock:
+            subscribers = list(self.subscribers.get(hotel_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(deliver, queue, event)
+            except RuntimeError:
+                pass  # That connection's loop has already closed
+
+    def subscriber_count(self, hotel_id=None):
+        with self.lock:
+            if hotel_id is not None:
+                return len(self.subscribers.get(hotel_id, ()))
+            return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+
+def deliver(queue, event):
+    if queue.full():
+        # Too far behind: tell the stream to close so the browser reconnects
+        queue.get_nowait()
+        event = None
+    queue.put_nowait(event)
+
+
+broker = AvailabilityBroker()
+
+
+# --- Sharing Events Between Processes ---
+# With REDIS_URL set, every event is published on a Redis channel, and each
+# process serving streams runs one listener thread that hands what it hears
+# to its own broker. Bookings made by any worker, the outbox consumer or a
+# management command then reach every open stream. Without Redis, only
+# streams served by the process that made the change see it.
+class RedisRelay:
+    def __init__(self, url, broker):
+        self.url = url
+        self.broker = broker
+        self.client = None
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def connection(self):
+        if self.client is None:
+            import redis
+            self.client = redis.Redis.from_url(self.url)
+        return self.client
+
+    def publish(self, hotel_id, event):
+        try:
+            self.connection().publish(AVAILABILITY_CHANNEL, json.dumps(event, cls=DjangoJSONEncoder))
+        except Exception:
+            # Redis is down: this process's streams still hear about it
+            self.broker.publish(hotel_id, event)
+
+    def start(self):
+        # Started by the first stream this process serves
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen, name='availability-relay', daemon=True)
+                self.listener.start()
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = self.connection().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(AVAILABILITY_CHANNEL)
+                for message in pubsub.listen():
+                    event = json.loads(message['data'])
+                    self.broker.publish(event['hotel_id'], event)
+            except Exception:
+                time.sleep(RELAY_RETRY_SECONDS)
+
+
+relay = RedisRelay(settings.LIVE_AVAILABILITY_REDIS_URL, broker) if settings.LIVE_AVAILABILITY_REDIS_URL else None
+
+
+def publish(hotel_id, event):
+    if relay is not None:
+        relay.publish(hotel_id, event)
+    else:
+        broker.publish(hotel_id, event)
+
+
+# --- Publishing Changes ---
+def room_event(hotel_id, room_number, checkin=None, checkout=None, available=True, reason='booking'):
+    return {
+        'hotel_id': hotel_id,
+        'room_number': room_number,
+        'checkin': checkin,
+        'checkout': checkout,
+        'available': available,
+        'reason': reason,
+    }
+
+
+def booking_event(booking, deleted=False):
+    # A confirmed booking takes its dates; a cancelled or deleted one frees them
+    taken = not deleted and booking.status != 'Cancelled'
+    return room_event(booking.hotel_id, booking.room_number, booking.checkin, booking.checkout, available=not taken)
+
+
+def publish_after_commit(event, using='default'):
+    # Only tell browsers about changes that actually committed, on the
+    # database they were written to (a booking's shard)
+    if event['hotel_id'] is not None:
+        transaction.on_commit(lambda: publish(event['hotel_id'], event), using=using)
+
+
+# --- Server-Sent Events ---
+def sse_message(event, name='availability'):
+    return f'event: {name}\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n'
+
+
+async def availability_events(hotel_id):
+    if relay is not None:
+        relay.start()
+    subscriber = broker.subscribe(hotel_id)
+    loop, queue = subscriber
+    try:
+        yield f'retry: {RECONNECT_MS}\n\n'
+        yield sse_message({'hotel_id': hotel_id}, name='ready')
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if event is None:
+                return
+            yield sse_message(event)
+    finally:
+        broker.unsubscribe(hotel_id, subscriber)
@@ -0,0 +1,42 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from booking.archive import ARCHIVE_AFTER_MONTHS, ARCHIVE_BATCH_SIZE, archive_bookings, partition_sql
+
+
+class Command(BaseCommand):
+    help = (
+        'Move bookings that checked out more than --months months ago, with their '
+        'payments and cancellations, into the archive tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=ARCHIVE_AFTER_MONTHS)
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Only count the bookings that would move.')
+        parser.add_argument(
+            '--partition-sql', action='store_true',
+            help='Print MySQL statements that range-partition booking_archive by CheckIn, then exit.'
+        )
+
+    def handle(self, *args, **options):
+        if options['partition_sql']:
+            this_year = datetime.date.today().year
+            self.stdout.write(partition_sql(this_year - 10, this_year))
+            return
+
+        stats = archive_bookings(
+            months=options['months'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"{stats['bookings']} bookings checked out before {stats['cutoff']} and would be archived.")
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {stats['bookings']} bookings, {stats['payments']} payments and "
+            f"{stats['cancellations']} cancellations (checked out before {stats['cutoff']})."
+        ))
@@ -0,0 +1,69 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulate gunicorn worker threads serving requests and report per-request '
+        'database overhead and how many connections were opened.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help='Concurrent worker threads.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per thread.')
+        parser.add_argument('--query', default='SELECT 1', help='Query run once per request.')
+
+    def handle(self, *args, **options):
+        opened = []
+        lock = threading.Lock()
+
+        def count_connection(sender, connection, **kwargs):
+            with lock:
+                opened.append(connection.alias)
+
+        connection_created.connect(count_connection)
+
+        def worker(num_requests):
+            timings = []
+            for _ in range(num_requests):
+                start = time.perf_counter()
+                # Same signals Django's handler sends, so CONN_MAX_AGE,
+                # health checks and pooling behave exactly as under gunicorn
+                request_started.send(sender=self.__class__)
+                with connection.cursor() as cursor:
+                    cursor.execute(options['query'])
+                    cursor.fetchall()
+                request_finished.send(sender=self.__class__)
+                timings.append((time.perf_counter() - start) * 1000)
+            connections.close_all()
+            return timings
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+            results = pool.map(worker, [options['requests']] * options['threads'])
+            timings = sorted(t for thread_timings in results for t in thread_timings)
+        elapsed = time.perf_counter() - started
+        connection_created.disconnect(count_connection)
+
+        settings_dict = connection.settings_dict
+        self.stdout.write(f"Engine:             {settings_dict['ENGINE']}")
+        self.stdout.write(f"CONN_MAX_AGE:       {settings_dict['CONN_MAX_AGE']}")
+        self.stdout.write(f"CONN_HEALTH_CHECKS: {settings_dict['CONN_HEALTH_CHECKS']}")
+        self.stdout.write(f"Pool:               {settings_dict.get('OPTIONS', {}).get('pool', 'none')}")
+        self.stdout.write(f'Requests:           {len(timings)} in {elapsed:.2f}s ({len(timings) / elapsed:.0f}/s)')
+        self.stdout.write(f'Connections opened: {len(opened)}')
+        self.stdout.write(
+            'Latency ms:         mean {:.2f}  p50 {:.2f}  p95 {:.2f}  p99 {:.2f}'.format(
+                statistics.mean(timings),
+                timings[len(timings) // 2],
+                timings[int(len(timings) * 0.95)],
+                timings[int(len(timings) * 0.99)],
+            )
+        )
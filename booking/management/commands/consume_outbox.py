@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from booking.outbox import CONSUMERS, OUTBOX_BATCH_SIZE, OUTBOX_SETTLE_SECONDS, consume, prune_events
+from booking.sharding import booking_shards
+
+
+class Command(BaseCommand):
+    help = (
+        'Feed new outbox events to the registered consumers in batches, saving each '
+        "consumer's position as it goes. Use --follow to keep tailing the outbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--consumer', action='append', help='Only run this consumer (repeatable).')
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument('--settle-seconds', type=int, default=OUTBOX_SETTLE_SECONDS)
+        parser.add_argument('--follow', action='store_true', help='Keep running, polling for new events.')
+        parser.add_argument('--poll-interval', type=float, default=2.0)
+        parser.add_argument('--prune-days', type=int, default=None,
+                            help='Afterwards, delete events older than this that every consumer has read.')
+
+    def handle(self, *args, **options):
+        names = options['consumer'] or list(CONSUMERS)
+        unknown = [name for name in names if name not in CONSUMERS]
+        if unknown:
+            raise CommandError(f"Unknown consumer(s): {', '.join(unknown)}. Known: {', '.join(CONSUMERS)}")
+
+        while True:
+            handled = {name: self.drain(name, options) for name in names}
+            for name, count in handled.items():
+                if count:
+                    self.stdout.write(f'{name}: {count} events.')
+
+            if not options['follow']:
+                break
+            if not any(handled.values()):
+                time.sleep(options['poll_interval'])
+
+        if options['prune_days'] is not None:
+            deleted = sum(prune_events(options['prune_days'], using=alias) for alias in booking_shards())
+            self.stdout.write(f'Pruned {deleted} events.')
+        self.stdout.write(self.style.SUCCESS('Outbox consumers are up to date.'))
+
+    def drain(self, name, options):
+        # Every booking shard has its own outbox
+        total = 0
+        for alias in booking_shards():
+            while True:
+                count = consume(
+                    name, batch_size=options['batch_size'], settle_seconds=options['settle_seconds'], using=alias
+                )
+                total += count
+                if count < options['batch_size']:
+                    break
+        return total
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from booking.phones import backfill_phones
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite customer_phone numbers in E.164 form and rebuild the phone index '
+        'that the staff phone lookup reads. Numbers that cannot be normalized are listed and left as they are.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Customers per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would change.')
+
+    def handle(self, *args, **options):
+        stats = backfill_phones(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        for cust_id, number in stats['invalid']:
+            self.stdout.write(self.style.WARNING(f'  customer {cust_id}: cannot normalize {number!r}'))
+        if options['dry_run']:
+            self.stdout.write(f"{stats['normalized']} numbers would be rewritten.")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Rewrote {stats['normalized']} numbers ({stats['merged']} duplicates merged) "
+            f"and indexed {stats['indexed']}; {len(stats['invalid'])} left as they were."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from booking.deletion import DELETION_BATCH_SIZE, pending_deletions, process_account_deletion
+
+
+class Command(BaseCommand):
+    help = (
+        'Finish deleting accounts that customers have closed: cancel their upcoming '
+        'bookings, detach their history and reviews, and remove the account, in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETION_BATCH_SIZE)
+        parser.add_argument('--limit', type=int, default=None, help='Process at most this many accounts.')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        jobs = pending_deletions()
+        if options['limit']:
+            jobs = jobs[:options['limit']]
+
+        processed = 0
+        for job in jobs:
+            touched = process_account_deletion(job, batch_size=options['batch_size'], pause=options['pause'])
+            self.stdout.write(f'Account {job.cust_id}: {touched} rows updated.')
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} account deletions.'))
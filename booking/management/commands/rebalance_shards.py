@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from booking.rebalance import (
+    REBALANCE_BATCH_SIZE, REBALANCE_SETTLE_SECONDS, ShardMoveError, move_hotel, plan_moves, shard_loads
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Show how bookings are spread over the booking shards and suggest hotel moves, '
+        'or move one hotel (--hotel ID --to SHARD) with its bookings, payments, '
+        'cancellations, archive rows and room nights.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotel', type=int, help='Hotel to move.')
+        parser.add_argument('--to', help='Shard (database alias) to move it to.')
+        parser.add_argument('--batch-size', type=int, default=REBALANCE_BATCH_SIZE)
+        parser.add_argument('--settle-seconds', type=float, default=REBALANCE_SETTLE_SECONDS,
+                            help='How long to wait for workers to see a placement change.')
+        parser.add_argument('--tolerance', type=float, default=0.1,
+                            help='Suggest moves until shards are within this fraction of each other.')
+
+    def handle(self, *args, **options):
+        if options['hotel'] is None and options['to'] is None:
+            self.report(options['tolerance'])
+            return
+        if options['hotel'] is None or not options['to']:
+            raise CommandError('--hotel and --to go together.')
+
+        try:
+            stats = move_hotel(
+                options['hotel'],
+                options['to'],
+                batch_size=options['batch_size'],
+                settle_seconds=options['settle_seconds'],
+                log=self.stdout.write,
+            )
+        except ShardMoveError as e:
+            raise CommandError(str(e))
+
+        if stats is None:
+            self.stdout.write(f"Hotel {options['hotel']} is already on {options['to']}.")
+            return
+        for table, counts in stats['final_pass'].items():
+            first = stats['first_pass'].get(table, {})
+            self.stdout.write(
+                f"  {table}: {first.get('copied', 0) + counts.get('copied', 0)} copied, "
+                f"{counts.get('updated', 0)} updated and {counts.get('removed', 0)} removed in the final pass"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Moved hotel {options['hotel']} from {stats['source']} to {stats['target']} "
+            f"and deleted {stats['deleted']} rows there."
+        ))
+
+    def report(self, tolerance):
+        loads = shard_loads()
+        for alias, hotels in loads.items():
+            self.stdout.write(f'{alias}: {sum(hotels.values())} bookings across {len(hotels)} hotels')
+            for hotel_id, count in sorted(hotels.items(), key=lambda item: -item[1])[:5]:
+                self.stdout.write(f'    hotel {hotel_id}: {count}')
+
+        moves = plan_moves(loads, tolerance)
+        if not moves:
+            self.stdout.write(self.style.SUCCESS('Shards are balanced; nothing to move.'))
+            return
+        self.stdout.write('Suggested moves:')
+        for hotel_id, source, target, count in moves:
+            self.stdout.write(f'    manage.py rebalance_shards --hotel {hotel_id} --to {target}  # {count} bookings from {source}')
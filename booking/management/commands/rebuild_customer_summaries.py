@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from booking.summaries import REBUILD_BATCH_SIZE, rebuild_customer_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the customer_summary table from the booking and payment tables and their archives.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        written = rebuild_customer_summaries(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} customer summaries.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from booking.cards import REBUILD_BATCH_SIZE, rebuild_hotel_cards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the hotel_card table from the room, room_image and review tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        written = rebuild_hotel_cards(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} hotel cards.'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from booking.models import Hotel
+from booking.pricing import PRICING_HORIZON_DAYS, refresh_occupancy
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount the occupancy matrix (occupancy_night) that dynamic pricing reads, '
+        'from the room-night ledger, for the next --days days.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotel', type=int, action='append', help='Only this hotel (repeatable).')
+        parser.add_argument('--days', type=int, default=PRICING_HORIZON_DAYS)
+
+    def handle(self, *args, **options):
+        hotel_ids = options['hotel'] or list(Hotel.objects.order_by('pk').values_list('pk', flat=True))
+        cells = 0
+        for hotel_id in hotel_ids:
+            cells += refresh_occupancy(hotel_id, days=options['days'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed occupancy for {len(hotel_ids)} hotels ({cells} booked room-type nights)."
+        ))
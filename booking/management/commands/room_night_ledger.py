@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from booking.ledger import reconcile_ledger
+
+
+class Command(BaseCommand):
+    help = (
+        'Check the room_night ledger against the booking table. '
+        'Use --backfill to insert missing nights and remove stale ones.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backfill', action='store_true', help='Fix the ledger instead of only reporting.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        stats = reconcile_ledger(
+            batch_size=options['batch_size'],
+            fix=options['backfill'],
+            using=options['database'],
+        )
+
+        verb = 'Fixed' if options['backfill'] else 'Found'
+        self.stdout.write(f"Checked {stats['bookings']} bookings.")
+        self.stdout.write(f"{verb} {stats['missing']} missing nights, {stats['stale']} stale nights "
+                          f"and {stats['orphans']} nights of deleted bookings.")
+
+        if stats['conflicts']:
+            self.stdout.write(self.style.ERROR(
+                'These bookings overlap an existing booking and were not added to the ledger: '
+                + ', '.join(str(pk) for pk in stats['conflicts'])
+            ))
+        elif options['backfill'] or not (stats['missing'] or stats['stale'] or stats['orphans']):
+            self.stdout.write(self.style.SUCCESS('The ledger matches the booking table.'))
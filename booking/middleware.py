@@ -0,0 +1,182 @@
+import cProfile
+import math
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponse
+
+from .profiling import QueryTimer, save_profile
+from .sharding import HotelMoving
+
+THROTTLE_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+# --- Rate Limiting ---
+def parse_rate(rate):
+    # '30/m' -> (30 requests, 60 seconds)
+    num, period = rate.split('/')
+    return int(num), THROTTLE_PERIODS[period.strip()[0].lower()]
+
+
+def parse_rule(rule):
+    # A rule is either '30/m' or {'rate': '30/m', 'methods': ['POST']}
+    if isinstance(rule, str):
+        rule = {'rate': rule}
+    capacity, period = parse_rate(rule['rate'])
+    methods = {m.upper() for m in rule.get('methods', [])}
+    return capacity, period, methods
+
+
+def client_ident(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    ip = request.META.get('REMOTE_ADDR', '')
+    if getattr(settings, 'THROTTLE_TRUST_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            ip = forwarded.split(',')[0].strip()
+    return f'ip:{ip}'
+
+
+# Sliding-window counter per (URL name, user or IP), stored in the Django cache.
+# Routes and limits come from settings.THROTTLE_RATES; URL names that are not
+# listed are never throttled. A request counts in its own fixed window, and
+# the previous window's count is weighted by how much of it still falls in
+# the last `period` seconds, so unlike a plain fixed window there is no
+# double burst where two windows meet. This stands in for a token bucket:
+# the cache has no compare-and-set, but add(), incr() and decr() are atomic,
+# so concurrent requests can't both take the last slot. The counts are only
+# as shared as the cache: with the default per-process cache each worker
+# enforces the limits on its own.
+class ThrottleMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = {
+            name: parse_rule(rule)
+            for name, rule in getattr(settings, 'THROTTLE_RATES', {}).items()
+        }
+        self.cache = caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        rule = self.rules.get(match.url_name) if match else None
+        if rule is None:
+            return None
+
+        capacity, period, methods = rule
+        if methods and request.method not in methods:
+            return None
+
+        key = f'throttle:{match.url_name}:{client_ident(request)}'
+        allowed, retry_after = self.count_request(key, capacity, period)
+        if allowed:
+            return None
+
+        response = HttpResponse('Too many requests. Please slow down and try again shortly.', status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
+
+    def count_request(self, key, capacity, period):
+        # Wall-clock time, since the cache may be shared between processes
+        now = time.time()
+        window = int(now // period)
+        remaining = (window + 1) * period - now
+
+        # A window's counter is read as the previous one during the next window
+        current_key = f'{key}:{window}'
+        self.cache.add(current_key, 0, 2 * period + 1)
+        try:
+            count = self.cache.incr(current_key)
+        except ValueError:
+            # Expired between the two calls: the window is long over
+            return True, 0
+        previous = self.cache.get(f'{key}:{window - 1}', 0)
+
+        if previous * remaining / period + count <= capacity:
+            return True, 0
+
+        # Turned away requests don't count against the client
+        self.cache.decr(current_key)
+        if count > capacity or not previous:
+            retry_after = remaining
+        else:
+            # Until enough of the previous window has slid out
+            retry_after = remaining - (capacity - count) * period / previous
+        return False, max(1, math.ceil(retry_after))
+
+
+# --- Request Profiling ---
+# Runs cProfile around a request and saves the result for the staff
+# listing at /staff/profiles/. Off unless settings.PROFILING_ENABLED. Then a
+# request is profiled when a staff user asks for it (?profile=1 or an
+# "X-Profile: 1" header), or at random for settings.PROFILE_SAMPLE_RATE of
+# all requests. Only one request per process is profiled at a time.
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PROFILING_ENABLED', False)
+        self.sample_rate = getattr(settings, 'PROFILE_SAMPLE_RATE', 0)
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if not (self.enabled and self.wants_profile(request)):
+            return self.get_response(request)
+
+        # cProfile can't run twice at once; a busy profiler means skip this one
+        if not self.lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            queries = QueryTimer()
+            start = time.perf_counter()
+            with connection.execute_wrapper(queries):
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+            elapsed = time.perf_counter() - start
+
+            profile_id = save_profile(profiler, request, response, elapsed, queries)
+        finally:
+            self.lock.release()
+
+        if request.user.is_staff:
+            response['X-Profile-Id'] = profile_id
+        return response
+
+    def wants_profile(self, request):
+        if request.user.is_staff and (
+            request.GET.get('profile') == '1' or request.headers.get('X-Profile') == '1'
+        ):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+# --- Hotels Being Moved Between Shards ---
+# While rebalance_shards copies a hotel's bookings, writes to them raise
+# HotelMoving. The move takes seconds, so answer like a busy server.
+HOTEL_MOVING_RETRY_AFTER = 30
+
+
+class HotelMovingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, HotelMoving):
+            return None
+        response = HttpResponse(str(exception), status=503)
+        response['Retry-After'] = str(HOTEL_MOVING_RETRY_AFTER)
+        return response
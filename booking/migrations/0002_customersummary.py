@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CustomerSummary",
+            fields=[
+                ("cust_id", models.IntegerField(db_column="Cust_ID", primary_key=True, serialize=False)),
+                ("total_bookings", models.IntegerField(db_column="Total_Bookings", default=0)),
+                ("cancelled_bookings", models.IntegerField(db_column="Cancelled_Bookings", default=0)),
+                ("total_nights", models.IntegerField(db_column="Total_Nights", default=0)),
+                (
+                    "total_spend",
+                    models.DecimalField(db_column="Total_Spend", decimal_places=2, default=0, max_digits=12),
+                ),
+                ("last_stay", models.DateField(blank=True, db_column="Last_Stay", null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_column="Updated_At")),
+            ],
+            options={
+                "db_table": "customer_summary",
+                "indexes": [models.Index(fields=["-total_spend"], name="customer_summary_spend_idx")],
+            },
+        ),
+    ]
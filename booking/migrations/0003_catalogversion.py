@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0002_customersummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("version", models.BigIntegerField(db_column="Version", default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_column="Updated_At")),
+            ],
+            options={
+                "db_table": "catalog_version",
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0003_catalogversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HotelCard",
+            fields=[
+                (
+                    "hotel",
+                    models.OneToOneField(
+                        db_column="Hotel_ID",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="card",
+                        serialize=False,
+                        to="booking.hotel",
+                    ),
+                ),
+                ("min_price", models.DecimalField(blank=True, db_column="Min_Price", decimal_places=2, max_digits=10, null=True)),
+                ("max_price", models.DecimalField(blank=True, db_column="Max_Price", decimal_places=2, max_digits=10, null=True)),
+                ("max_capacity", models.IntegerField(blank=True, db_column="Max_Capacity", null=True)),
+                ("room_count", models.IntegerField(db_column="Room_Count", default=0)),
+                ("cover_image", models.CharField(blank=True, db_column="Cover_Image", max_length=255, null=True)),
+                ("review_count", models.IntegerField(db_column="Review_Count", default=0)),
+                (
+                    "review_average",
+                    models.DecimalField(blank=True, db_column="Review_Average", decimal_places=2, max_digits=3, null=True),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True, db_column="Updated_At")),
+            ],
+            options={
+                "db_table": "hotel_card",
+                "indexes": [
+                    models.Index(fields=["min_price"], name="hotel_card_min_price_idx"),
+                    models.Index(fields=["max_capacity"], name="hotel_card_capacity_idx"),
+                ],
+            },
+        ),
+    ]
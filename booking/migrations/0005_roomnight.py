@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0004_hotelcard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomNight",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("hotel_id", models.IntegerField(db_column="Hotel_ID")),
+                ("room_number", models.CharField(db_column="Room_Number", max_length=10)),
+                ("night", models.DateField(db_column="Night")),
+                ("booking_id", models.IntegerField(db_column="Booking_ID", db_index=True)),
+            ],
+            options={
+                "db_table": "room_night",
+                "constraints": [
+                    models.UniqueConstraint(fields=("hotel_id", "room_number", "night"), name="room_night_unique"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0005_roomnight"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedBooking",
+            fields=[
+                ("booking_id", models.IntegerField(db_column="Booking_ID", primary_key=True, serialize=False)),
+                ("cust_id", models.IntegerField(blank=True, db_column="Cust_ID", db_index=True, null=True)),
+                ("hotel_id", models.IntegerField(blank=True, db_column="Hotel_ID", null=True)),
+                ("room_number", models.CharField(blank=True, db_column="Room_Number", max_length=10, null=True)),
+                ("bookingdate", models.DateField(blank=True, db_column="BookingDate", null=True)),
+                ("checkin", models.DateField(blank=True, db_column="CheckIn", null=True)),
+                ("checkout", models.DateField(blank=True, db_column="CheckOut", null=True)),
+                ("status", models.CharField(blank=True, db_column="Status", max_length=20, null=True)),
+                ("archived_at", models.DateTimeField(auto_now_add=True, db_column="Archived_At")),
+            ],
+            options={
+                "db_table": "booking_archive",
+                "indexes": [models.Index(fields=["checkin"], name="booking_archive_checkin_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedPayment",
+            fields=[
+                ("payment_id", models.IntegerField(db_column="Payment_ID", primary_key=True, serialize=False)),
+                ("amount", models.DecimalField(blank=True, db_column="Amount", decimal_places=2, max_digits=10, null=True)),
+                ("mode", models.CharField(blank=True, db_column="Mode", max_length=20, null=True)),
+                ("date", models.DateField(blank=True, db_column="Date", null=True)),
+                ("status", models.CharField(blank=True, db_column="Status", max_length=20, null=True)),
+                ("booking", models.ForeignKey(blank=True, db_column="Booking_ID", db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name="payments", to="booking.archivedbooking")),
+            ],
+            options={
+                "db_table": "payment_archive",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedCancellation",
+            fields=[
+                ("cancellation_id", models.IntegerField(db_column="Cancellation_ID", primary_key=True, serialize=False)),
+                ("cancel_date", models.DateField(blank=True, db_column="Cancel_Date", null=True)),
+                ("reason", models.CharField(blank=True, db_column="Reason", max_length=255, null=True)),
+                ("booking", models.ForeignKey(blank=True, db_column="Booking_ID", db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name="cancellations", to="booking.archivedbooking")),
+            ],
+            options={
+                "db_table": "cancellation_archive",
+            },
+        ),
+    ]
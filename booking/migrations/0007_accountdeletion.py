@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0006_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccountDeletion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("cust_id", models.IntegerField(db_column="Cust_ID", unique=True)),
+                ("stage", models.CharField(choices=[("cancel", "Cancelling upcoming bookings"), ("detach", "Detaching booking history"), ("reviews", "Detaching reviews"), ("finish", "Removing the account"), ("done", "Done")], db_column="Stage", default="cancel", max_length=20)),
+                ("requested_at", models.DateTimeField(auto_now_add=True, db_column="Requested_At")),
+                ("completed_at", models.DateTimeField(blank=True, db_column="Completed_At", db_index=True, null=True)),
+            ],
+            options={
+                "db_table": "account_deletion",
+            },
+        ),
+    ]
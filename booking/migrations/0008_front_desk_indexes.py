@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+# booking is a legacy table that Django doesn't manage, so its indexes are
+# created by hand. Skipped if the table isn't there yet (it is loaded from
+# the SQL dump, not by migrate).
+BOOKING_INDEXES = [
+    ("booking_hotel_checkin_idx", "Hotel_ID, CheckIn"),
+    ("booking_hotel_checkout_idx", "Hotel_ID, CheckOut"),
+]
+
+
+def add_booking_indexes(apps, schema_editor):
+    if "booking" not in schema_editor.connection.introspection.table_names():
+        return
+    for name, columns in BOOKING_INDEXES:
+        schema_editor.execute(f"CREATE INDEX {name} ON booking ({columns})")
+
+
+def drop_booking_indexes(apps, schema_editor):
+    if "booking" not in schema_editor.connection.introspection.table_names():
+        return
+    for name, columns in BOOKING_INDEXES:
+        if schema_editor.connection.vendor == "mysql":
+            schema_editor.execute(f"DROP INDEX {name} ON booking")
+        else:
+            schema_editor.execute(f"DROP INDEX {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0007_accountdeletion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="roomnight",
+            index=models.Index(fields=["hotel_id", "night"], name="room_night_hotel_night_idx"),
+        ),
+        migrations.RunPython(add_booking_indexes, drop_booking_indexes),
+    ]
@@ -0,0 +1,37 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0008_front_desk_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("model", models.CharField(db_column="Model", max_length=30)),
+                ("action", models.CharField(db_column="Action", max_length=10)),
+                ("object_id", models.CharField(blank=True, db_column="Object_ID", max_length=64, null=True)),
+                ("payload", models.JSONField(db_column="Payload", encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_column="Created_At")),
+            ],
+            options={
+                "db_table": "outbox_event",
+            },
+        ),
+        migrations.CreateModel(
+            name="OutboxCheckpoint",
+            fields=[
+                ("consumer", models.CharField(db_column="Consumer", max_length=50, primary_key=True, serialize=False)),
+                ("last_event_id", models.BigIntegerField(db_column="Last_Event_ID", default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_column="Updated_At")),
+            ],
+            options={
+                "db_table": "outbox_checkpoint",
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0009_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HotelShard",
+            fields=[
+                ("hotel_id", models.IntegerField(db_column="Hotel_ID", primary_key=True, serialize=False)),
+                ("shard", models.CharField(db_column="Shard", max_length=50)),
+                ("moving", models.BooleanField(db_column="Moving", default=False)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_column="Updated_At")),
+            ],
+            options={
+                "db_table": "hotel_shard",
+            },
+        ),
+    ]
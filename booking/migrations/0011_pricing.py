@@ -0,0 +1,55 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0010_hotelshard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PricingRule",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("roomtype", models.CharField(blank=True, db_column="RoomType", max_length=50, null=True)),
+                ("min_occupancy", models.PositiveSmallIntegerField(blank=True, db_column="Min_Occupancy", null=True)),
+                ("max_occupancy", models.PositiveSmallIntegerField(blank=True, db_column="Max_Occupancy", null=True)),
+                ("min_lead_days", models.PositiveIntegerField(blank=True, db_column="Min_Lead_Days", null=True)),
+                ("max_lead_days", models.PositiveIntegerField(blank=True, db_column="Max_Lead_Days", null=True)),
+                ("adjustment", models.DecimalField(db_column="Adjustment", decimal_places=2, max_digits=5)),
+                ("active", models.BooleanField(db_column="Active", default=True)),
+                (
+                    "hotel",
+                    models.ForeignKey(
+                        db_column="Hotel_ID",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pricing_rules",
+                        to="booking.hotel",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "pricing_rule",
+            },
+        ),
+        migrations.CreateModel(
+            name="OccupancyNight",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("hotel_id", models.IntegerField(db_column="Hotel_ID")),
+                ("roomtype", models.CharField(db_column="RoomType", max_length=50)),
+                ("night", models.DateField(db_column="Night")),
+                ("booked", models.IntegerField(db_column="Booked", default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_column="Updated_At")),
+            ],
+            options={
+                "db_table": "occupancy_night",
+                "constraints": [
+                    models.UniqueConstraint(fields=("hotel_id", "roomtype", "night"), name="occupancy_night_unique"),
+                ],
+            },
+        ),
+    ]
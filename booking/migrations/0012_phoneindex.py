@@ -0,0 +1,43 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0011_pricing"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PhoneIndex",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("phone", models.CharField(db_column="Phone", max_length=16)),
+                ("reversed_digits", models.CharField(db_column="Reversed_Digits", max_length=15)),
+                ("is_primary", models.BooleanField(db_column="Is_Primary", default=False)),
+                (
+                    "cust",
+                    models.ForeignKey(
+                        db_column="Cust_ID",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "phone_index",
+                "indexes": [
+                    models.Index(fields=["phone"], name="phone_index_phone_idx"),
+                    models.Index(fields=["reversed_digits"], name="phone_index_reversed_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("cust", "phone"), name="phone_index_cust_phone_unique"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("booking", "0012_phoneindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PaymentAdjustment",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("amount", models.DecimalField(db_column="Amount", decimal_places=2, max_digits=10)),
+                ("reason", models.CharField(db_column="Reason", max_length=100)),
+                ("previous_checkin", models.DateField(blank=True, db_column="Previous_CheckIn", null=True)),
+                ("previous_checkout", models.DateField(blank=True, db_column="Previous_CheckOut", null=True)),
+                ("checkin", models.DateField(blank=True, db_column="CheckIn", null=True)),
+                ("checkout", models.DateField(blank=True, db_column="CheckOut", null=True)),
+                ("date", models.DateField(db_column="Date")),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_column="Created_At")),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        db_column="Booking_ID",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payment_adjustments",
+                        to="booking.booking",
+                    ),
+                ),
+                (
+                    "payment",
+                    models.ForeignKey(
+                        db_column="Payment_ID",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="adjustments",
+                        to="booking.payment",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "payment_adjustment",
+            },
+        ),
+    ]
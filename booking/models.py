@@ -1,8 +1,24 @@
-from django.db import models
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, router, transaction
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
+# ---------------------------------- Outbox Mixin ----------------------------------
+# Models that other parts of the system react to. Every save also appends an
+# event to the outbox table in the same transaction (deletes are recorded by
+# booking/signals.py), so consumers see exactly the changes that committed.
+class OutboxMixin:
+    def save(self, *args, **kwargs):
+        from .outbox import record_event
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            record_event(self, 'saved', using)
+
+
 # ---------------------------------- Booking Model ----------------------------------
-class Booking(models.Model):
+class Booking(OutboxMixin, models.Model):
     booking_id = models.AutoField(db_column='Booking_ID', primary_key=True)  # Field name made lowercase.
     cust = models.ForeignKey('Customer', models.CASCADE, db_column='Cust_ID', blank=True, null=True)  # Field name made lowercase.
     hotel_id = models.IntegerField(db_column='Hotel_ID', blank=True, null=True)
@@ -16,6 +32,17 @@ class Booking(models.Model):
         managed = False
         db_table = 'booking'
 
+    def save(self, *args, **kwargs):
+        # Every write also updates the room-night ledger in the same transaction,
+        # so an overlapping booking fails here whoever saves it (views, admin, scripts).
+        from .ledger import sync_booking_nights
+        from .sharding import check_hotel_writable
+        check_hotel_writable(self.hotel_id)
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            sync_booking_nights(self)
+
 
 # ---------------------------------- Customer Model ----------------------------------
 class CustomerManager(BaseUserManager):
@@ -41,7 +68,7 @@ class CustomerManager(BaseUserManager):
 
 
 # ---------------------------------- Cancellation Model ----------------------------------
-class Cancellation(models.Model):
+class Cancellation(OutboxMixin, models.Model):
     cancellation_id = models.AutoField(db_column='Cancellation_ID', primary_key=True)  # Field name made lowercase.
     booking = models.ForeignKey(Booking, models.CASCADE, db_column='Booking_ID', blank=True, null=True)  # Field name made lowercase.
     cancel_date = models.DateField(db_column='Cancel_Date', blank=True, null=True)  # Field name made lowercase.
@@ -122,7 +149,7 @@ class Hotel(models.Model):
 
 
 # ---------------------------------- Offer Model ----------------------------------
-class Offer(models.Model):
+class Offer(OutboxMixin, models.Model):
     offer_id = models.AutoField(db_column='Offer_ID', primary_key=True)  # Field name made lowercase.
     hotel = models.ForeignKey(Hotel, models.CASCADE, db_column='Hotel_ID', blank=True, null=True)  # Field name made lowercase.
     description = models.CharField(db_column='Description', max_length=100, blank=True, null=True)  # Field name made lowercase.
@@ -136,7 +163,7 @@ class Offer(models.Model):
 
 
 # ---------------------------------- Payment Model ----------------------------------
-class Payment(models.Model):
+class Payment(OutboxMixin, models.Model):
     payment_id = models.AutoField(db_column='Payment_ID', primary_key=True)  # Field name made lowercase.
     booking = models.ForeignKey(Booking, models.CASCADE, db_column='Booking_ID', blank=True, null=True)  # Field name made lowercase.
     amount = models.DecimalField(db_column='Amount', max_digits=10, decimal_places=2, blank=True, null=True)  # Field name made lowercase.
@@ -149,8 +176,35 @@ class Payment(models.Model):
         db_table = 'payment'
 
 
+    @property
+    def total_amount(self):
+        # What was charged, after any later adjustments (prefetch 'adjustments' when listing)
+        return (self.amount or 0) + sum(adjustment.amount for adjustment in self.adjustments.all())
+
+
+# ---------------------------------- Payment Adjustment Model ----------------------------------
+# A change to what a booking costs after it was paid, e.g. when its dates are
+# edited (booking/amendments.py). The payment row keeps the amount first
+# charged; each adjustment records the difference (negative for a refund)
+# and the dates before and after, so the history of the booking survives.
+class PaymentAdjustment(models.Model):
+    booking = models.ForeignKey(Booking, models.CASCADE, db_column='Booking_ID', related_name='payment_adjustments', db_constraint=False)
+    payment = models.ForeignKey(Payment, models.CASCADE, db_column='Payment_ID', related_name='adjustments', db_constraint=False)
+    amount = models.DecimalField(db_column='Amount', max_digits=10, decimal_places=2)
+    reason = models.CharField(db_column='Reason', max_length=100)
+    previous_checkin = models.DateField(db_column='Previous_CheckIn', blank=True, null=True)
+    previous_checkout = models.DateField(db_column='Previous_CheckOut', blank=True, null=True)
+    checkin = models.DateField(db_column='CheckIn', blank=True, null=True)
+    checkout = models.DateField(db_column='CheckOut', blank=True, null=True)
+    date = models.DateField(db_column='Date')
+    created_at = models.DateTimeField(db_column='Created_At', auto_now_add=True)
+
+    class Meta:
+        db_table = 'payment_adjustment'
+
+
 # ---------------------------------- Review Model ----------------------------------
-class Review(models.Model):
+class Review(OutboxMixin, models.Model):
     review_id = models.AutoField(db_column='Review_ID', primary_key=True)  # Field name made lowercase.
     cust = models.ForeignKey(Customer, models.CASCADE, db_column='Cust_ID', blank=True, null=True)  # Field name made lowercase.
     hotel = models.ForeignKey(Hotel, models.CASCADE, db_column='Hotel_ID', blank=True, null=True)  # Field name made lowercase.
@@ -164,7 +218,7 @@ class Review(models.Model):
 
 
 # ---------------------------------- Room Model ----------------------------------
-class Room(models.Model):
+class Room(OutboxMixin, models.Model):
     pk = models.CompositePrimaryKey('hotel', 'room_number')
     hotel = models.ForeignKey(Hotel, models.CASCADE, db_column='Hotel_ID')  # Field name made lowercase.
     room_number = models.CharField(db_column='Room_Number', max_length=10)  # Field name made lowercase.
@@ -189,4 +243,262 @@ class RoomImage(models.Model):
 
     class Meta:
         managed = False
-        db_table = 'room_image'
\ No newline at end of file
+        db_table = 'room_image'
+
+# ---------------------------------- Customer Summary Model ----------------------------------
+# Materialized per-customer stats. Kept up to date by booking/signals.py and
+# rebuilt from scratch with `manage.py rebuild_customer_summaries`.
+class CustomerSummary(models.Model):
+    cust_id = models.IntegerField(db_column='Cust_ID', primary_key=True)
+    total_bookings = models.IntegerField(db_column='Total_Bookings', default=0)
+    cancelled_bookings = models.IntegerField(db_column='Cancelled_Bookings', default=0)
+    total_nights = models.IntegerField(db_column='Total_Nights', default=0)
+    total_spend = models.DecimalField(db_column='Total_Spend', max_digits=12, decimal_places=2, default=0)
+    last_stay = models.DateField(db_column='Last_Stay', blank=True, null=True)
+    updated_at = models.DateTimeField(db_column='Updated_At', auto_now=True)
+
+    class Meta:
+        db_table = 'customer_summary'
+        indexes = [
+            models.Index(fields=['-total_spend'], name='customer_summary_spend_idx'),
+        ]
+
+    @property
+    def cancellation_rate(self):
+        if not self.total_bookings:
+            return 0
+        return self.cancelled_bookings / self.total_bookings
+
+    @property
+    def past_stay(self):
+        # last_stay is the latest checkout, which may still be ahead
+        if self.last_stay and self.last_stay <= datetime.date.today():
+            return self.last_stay
+        return None
+
+
+# ---------------------------------- Catalog Version Model ----------------------------------
+# A single-row counter bumped whenever hotels, rooms, images, facilities or
+# offers change. In-process indexes and caches compare against it to know
+# when they are stale (see booking/catalog.py).
+class CatalogVersion(models.Model):
+    version = models.BigIntegerField(db_column='Version', default=0)
+    updated_at = models.DateTimeField(db_column='Updated_At', auto_now=True)
+
+    class Meta:
+        db_table = 'catalog_version'
+
+
+# ---------------------------------- Hotel Card Model ----------------------------------
+# Denormalized per-hotel listing data (room prices and sizes, cover image,
+# review stats) so the hotel list can sort and filter without aggregating
+# the room table. Kept up to date by booking/signals.py and rebuilt with
+# `manage.py rebuild_hotel_cards`.
+class HotelCard(models.Model):
+    hotel = models.OneToOneField(Hotel, models.CASCADE, db_column='Hotel_ID', primary_key=True, related_name='card', db_constraint=False)
+    min_price = models.DecimalField(db_column='Min_Price', max_digits=10, decimal_places=2, blank=True, null=True)
+    max_price = models.DecimalField(db_column='Max_Price', max_digits=10, decimal_places=2, blank=True, null=True)
+    max_capacity = models.IntegerField(db_column='Max_Capacity', blank=True, null=True)
+    room_count = models.IntegerField(db_column='Room_Count', default=0)
+    cover_image = models.CharField(db_column='Cover_Image', max_length=255, blank=True, null=True)
+    review_count = models.IntegerField(db_column='Review_Count', default=0)
+    review_average = models.DecimalField(db_column='Review_Average', max_digits=3, decimal_places=2, blank=True, null=True)
+    updated_at = models.DateTimeField(db_column='Updated_At', auto_now=True)
+
+    class Meta:
+        db_table = 'hotel_card'
+        indexes = [
+            models.Index(fields=['min_price'], name='hotel_card_min_price_idx'),
+            models.Index(fields=['max_capacity'], name='hotel_card_capacity_idx'),
+        ]
+
+
+# ---------------------------------- Room Night Model ----------------------------------
+# The room-night ledger: one row per booked night of a room. The unique key
+# makes the database itself reject a double booking. Written by
+# Booking.save() (see booking/ledger.py) and backfilled with
+# `manage.py room_night_ledger --backfill`.
+class RoomNight(models.Model):
+    hotel_id = models.IntegerField(db_column='Hotel_ID')
+    room_number = models.CharField(db_column='Room_Number', max_length=10)
+    night = models.DateField(db_column='Night')
+    booking_id = models.IntegerField(db_column='Booking_ID', db_index=True)
+
+    class Meta:
+        db_table = 'room_night'
+        constraints = [
+            models.UniqueConstraint(fields=['hotel_id', 'room_number', 'night'], name='room_night_unique'),
+        ]
+        indexes = [
+            # Everyone staying at a hotel on a given night (front desk)
+            models.Index(fields=['hotel_id', 'night'], name='room_night_hotel_night_idx'),
+        ]
+
+
+# ---------------------------------- Archive Models ----------------------------------
+# Finished stays are moved out of booking/payment/cancellation into these
+# tables by `manage.py archive_bookings`, keeping their original ids, so the
+# hot tables only hold current and recent bookings. "My Bookings" reads
+# them back as the customer's history.
+class ArchivedBooking(models.Model):
+    booking_id = models.IntegerField(db_column='Booking_ID', primary_key=True)
+    cust_id = models.IntegerField(db_column='Cust_ID', blank=True, null=True, db_index=True)
+    hotel_id = models.IntegerField(db_column='Hotel_ID', blank=True, null=True)
+    room_number = models.CharField(db_column='Room_Number', max_length=10, blank=True, null=True)
+    bookingdate = models.DateField(db_column='BookingDate', blank=True, null=True)
+    checkin = models.DateField(db_column='CheckIn', blank=True, null=True)
+    checkout = models.DateField(db_column='CheckOut', blank=True, null=True)
+    status = models.CharField(db_column='Status', max_length=20, blank=True, null=True)
+    archived_at = models.DateTimeField(db_column='Archived_At', auto_now_add=True)
+
+    class Meta:
+        db_table = 'booking_archive'
+        indexes = [
+            models.Index(fields=['checkin'], name='booking_archive_checkin_idx'),
+        ]
+
+
+class ArchivedPayment(models.Model):
+    payment_id = models.IntegerField(db_column='Payment_ID', primary_key=True)
+    booking = models.ForeignKey(ArchivedBooking, models.DO_NOTHING, db_column='Booking_ID', blank=True, null=True, related_name='payments', db_constraint=False)
+    amount = models.DecimalField(db_column='Amount', max_digits=10, decimal_places=2, blank=True, null=True)
+    mode = models.CharField(db_column='Mode', max_length=20, blank=True, null=True)
+    date = models.DateField(db_column='Date', blank=True, null=True)
+    status = models.CharField(db_column='Status', max_length=20, blank=True, null=True)
+
+    class Meta:
+        db_table = 'payment_archive'
+
+
+class ArchivedCancellation(models.Model):
+    cancellation_id = models.IntegerField(db_column='Cancellation_ID', primary_key=True)
+    booking = models.ForeignKey(ArchivedBooking, models.DO_NOTHING, db_column='Booking_ID', blank=True, null=True, related_name='cancellations', db_constraint=False)
+    cancel_date = models.DateField(db_column='Cancel_Date', blank=True, null=True)
+    reason = models.CharField(db_column='Reason', max_length=255, blank=True, null=True)
+
+    class Meta:
+        db_table = 'cancellation_archive'
+
+
+# ---------------------------------- Account Deletion Model ----------------------------------
+# One row per deleted account. The request only deactivates and anonymizes
+# the customer row; `manage.py process_account_deletions` then works through
+# the related rows in small batches (see booking/deletion.py).
+class AccountDeletion(models.Model):
+    STAGES = [
+        ('cancel', 'Cancelling upcoming bookings'),
+        ('detach', 'Detaching booking history'),
+        ('reviews', 'Detaching reviews'),
+        ('finish', 'Removing the account'),
+        ('done', 'Done'),
+    ]
+
+    cust_id = models.IntegerField(db_column='Cust_ID', unique=True)
+    stage = models.CharField(db_column='Stage', max_length=20, choices=STAGES, default='cancel')
+    requested_at = models.DateTimeField(db_column='Requested_At', auto_now_add=True)
+    completed_at = models.DateTimeField(db_column='Completed_At', blank=True, null=True, db_index=True)
+
+    class Meta:
+        db_table = 'account_deletion'
+
+
+# ---------------------------------- Outbox Models ----------------------------------
+# An append-only log of changes to bookings, payments, cancellations, reviews,
+# offers and rooms, written in the same transaction as the change itself.
+# `manage.py consume_outbox` feeds it to the consumers in booking/outbox.py,
+# each of which remembers how far it has read in OutboxCheckpoint.
+class OutboxEvent(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(db_column='Model', max_length=30)
+    action = models.CharField(db_column='Action', max_length=10)
+    object_id = models.CharField(db_column='Object_ID', max_length=64, blank=True, null=True)
+    payload = models.JSONField(db_column='Payload', encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(db_column='Created_At', auto_now_add=True)
+
+    class Meta:
+        db_table = 'outbox_event'
+
+
+class OutboxCheckpoint(models.Model):
+    consumer = models.CharField(db_column='Consumer', max_length=50, primary_key=True)
+    last_event_id = models.BigIntegerField(db_column='Last_Event_ID', default=0)
+    updated_at = models.DateTimeField(db_column='Updated_At', auto_now=True)
+
+    class Meta:
+        db_table = 'outbox_checkpoint'
+
+
+# ---------------------------------- Hotel Shard Model ----------------------------------
+# Which booking database holds a hotel's bookings, payments, cancellations
+# and room nights. Hotels without a row live on the first entry of
+# settings.BOOKING_SHARDS. Written only by `manage.py rebalance_shards`
+# (see booking/sharding.py and booking/rebalance.py).
+class HotelShard(models.Model):
+    hotel_id = models.IntegerField(db_column='Hotel_ID', primary_key=True)
+    shard = models.CharField(db_column='Shard', max_length=50)
+    moving = models.BooleanField(db_column='Moving', default=False)
+    updated_at = models.DateTimeField(db_column='Updated_At', auto_now=True)
+
+    class Meta:
+        db_table = 'hotel_shard'
+
+
+# ---------------------------------- Pricing Models ----------------------------------
+# Per-hotel rules that move a room's nightly rate with how full its room
+# type is and how far ahead the guest books (see booking/pricing.py). A rule
+# applies to a night when every bound it sets holds; the adjustments of all
+# rules that apply are added up.
+class PricingRule(models.Model):
+    hotel = models.ForeignKey(Hotel, models.CASCADE, db_column='Hotel_ID', related_name='pricing_rules', db_constraint=False)
+    roomtype = models.CharField(db_column='RoomType', max_length=50, blank=True, null=True)  # Empty: every room type
+    min_occupancy = models.PositiveSmallIntegerField(db_column='Min_Occupancy', blank=True, null=True)  # Percent
+    max_occupancy = models.PositiveSmallIntegerField(db_column='Max_Occupancy', blank=True, null=True)
+    min_lead_days = models.PositiveIntegerField(db_column='Min_Lead_Days', blank=True, null=True)
+    max_lead_days = models.PositiveIntegerField(db_column='Max_Lead_Days', blank=True, null=True)
+    adjustment = models.DecimalField(db_column='Adjustment', max_digits=5, decimal_places=2)  # Percent; negative is a discount
+    active = models.BooleanField(db_column='Active', default=True)
+
+    class Meta:
+        db_table = 'pricing_rule'
+
+    def __str__(self):
+        return f'{self.adjustment:+}% ({self.roomtype or "all rooms"})'
+
+
+# The occupancy matrix: booked rooms per (hotel, room type, night), counted
+# from the room-night ledger by `manage.py refresh_occupancy` and the
+# 'occupancy' outbox consumer. Nights with nothing booked have no row.
+class OccupancyNight(models.Model):
+    hotel_id = models.IntegerField(db_column='Hotel_ID')
+    roomtype = models.CharField(db_column='RoomType', max_length=50)
+    night = models.DateField(db_column='Night')
+    booked = models.IntegerField(db_column='Booked', default=0)
+    updated_at = models.DateTimeField(db_column='Updated_At', auto_now=True)
+
+    class Meta:
+        db_table = 'occupancy_night'
+        constraints = [
+            models.UniqueConstraint(fields=['hotel_id', 'roomtype', 'night'], name='occupancy_night_unique'),
+        ]
+
+
+# ---------------------------------- Phone Index Model ----------------------------------
+# Every customer_phone number in E.164 form (+<country code><number>), kept
+# in step with that table (see booking/phones.py) so staff can find a guest
+# by phone. The digits are also stored back to front: "ends with 4567"
+# becomes a prefix search on '7654', which the index can answer.
+class PhoneIndex(models.Model):
+    cust = models.ForeignKey(Customer, models.CASCADE, db_column='Cust_ID', related_name='+', db_constraint=False)
+    phone = models.CharField(db_column='Phone', max_length=16)
+    reversed_digits = models.CharField(db_column='Reversed_Digits', max_length=15)
+    is_primary = models.BooleanField(db_column='Is_Primary', default=False)
+
+    class Meta:
+        db_table = 'phone_index'
+        constraints = [
+            models.UniqueConstraint(fields=['cust', 'phone'], name='phone_index_cust_phone_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['phone'], name='phone_index_phone_idx'),
+            models.Index(fields=['reversed_digits'], name='phone_index_reversed_idx'),
+        ]
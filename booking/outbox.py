@@ -0,0 +1,137 @@
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cards import refresh_hotel_card
+from .models import Booking, OutboxCheckpoint, OutboxEvent
+from .pricing import refresh_occupancy
+from .summaries import refresh_customer_summary
+
+# How many events a consumer handles per transaction
+OUTBOX_BATCH_SIZE = 500
+
+# Events younger than this are left for the next pass. Ids are handed out at
+# INSERT time but rows become visible at COMMIT, so a slow transaction can
+# commit a lower id after a higher one; waiting a few seconds before reading
+# makes it very unlikely that a consumer's checkpoint has already passed it.
+OUTBOX_SETTLE_SECONDS = 5
+
+
+# --- Writing Events ---
+def object_id(instance):
+    pk = instance.pk
+    if isinstance(pk, tuple):
+        # Composite keys (Room) are stored as "hotel_id:room_number"
+        return ':'.join(str(part) for part in pk)
+    return None if pk is None else str(pk)
+
+
+def event_payload(instance):
+    return {field.attname: field.value_from_object(instance) for field in instance._meta.concrete_fields}
+
+
+def build_event(instance, action):
+    return OutboxEvent(
+        model=instance._meta.model_name,
+        action=action,
+        object_id=object_id(instance),
+        payload=event_payload(instance),
+    )
+
+
+def record_event(instance, action, using='default'):
+    build_event(instance, action).save(using=using)
+
+
+def record_events(instances, action, using='default'):
+    # For bulk_create()/update() paths, which skip save() and signals
+    OutboxEvent.objects.using(using).bulk_create([build_event(instance, action) for instance in instances])
+
+
+# --- Consumer Registry ---
+# A consumer is a function that takes a list of events (only those for the
+# models it asked for) and brings something derived up to date. It may be
+# given the same events twice if a run dies before its checkpoint is saved,
+# so it must be safe to repeat.
+CONSUMERS = {}
+
+
+def outbox_consumer(name, models):
+    def register(handler):
+        CONSUMERS[name] = (set(models), handler)
+        return handler
+    return register
+
+
+def consume(name, batch_size=OUTBOX_BATCH_SIZE, settle_seconds=OUTBOX_SETTLE_SECONDS, using='default'):
+    # Handles one batch for one consumer from one shard's outbox (each shard
+    # keeps its own log and checkpoints); returns how many events were read
+    models, handler = CONSUMERS[name]
+    settled = timezone.now() - datetime.timedelta(seconds=settle_seconds)
+
+    # The handlers write to 'default' (summaries, cards, occupancy) while the
+    # events and checkpoint live on the shard, so both are in a transaction:
+    # the handlers' writes commit first, then the checkpoint. A crash between
+    # the two commits only means the batch is handled again, which consumers
+    # must allow for anyway. On 'default' itself it is one transaction.
+    with transaction.atomic(using=using), transaction.atomic(using='default', savepoint=False):
+        checkpoint, created = OutboxCheckpoint.objects.using(using).select_for_update().get_or_create(consumer=name)
+        events = list(
+            OutboxEvent.objects.using(using).filter(id__gt=checkpoint.last_event_id, created_at__lte=settled)
+            .order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        wanted = [event for event in events if event.model in models]
+        if wanted:
+            handler(wanted)
+        checkpoint.last_event_id = events[-1].id
+        checkpoint.save()
+    return len(events)
+
+
+def prune_events(older_than_days, using='default'):
+    # Drop events every consumer has already read
+    cutoff = timezone.now() - datetime.timedelta(days=older_than_days)
+    positions = [
+        OutboxCheckpoint.objects.using(using).filter(consumer=name).values_list('last_event_id', flat=True).first() or 0
+        for name in CONSUMERS
+    ]
+    read_by_all = min(positions, default=0)
+    deleted, _ = OutboxEvent.objects.using(using).filter(id__lte=read_by_all, created_at__lt=cutoff).delete()
+    return deleted
+
+
+# --- Built-in Consumers ---
+# The signals keep these tables current as each request commits, through
+# on_commit callbacks. Those callbacks are lost if a worker dies right after
+# its commit, and bulk writes never send them. These consumers rebuild only
+# the rows the events touch, so running them catches anything missed.
+@outbox_consumer('customer-summaries', models=['booking', 'payment', 'cancellation'])
+def update_customer_summaries(events):
+    cust_ids = {event.payload.get('cust_id') for event in events if event.model == 'booking'}
+    booking_ids = {event.payload.get('booking_id') for event in events if event.model != 'booking'}
+    if booking_ids:
+        # The bookings are on the same shard as the events
+        bookings = Booking.objects.using(events[0]._state.db)
+        cust_ids.update(bookings.filter(pk__in=booking_ids).values_list('cust_id', flat=True))
+
+    # Each customer once per batch, however many of their rows changed
+    for cust_id in cust_ids - {None}:
+        refresh_customer_summary(cust_id)
+
+
+@outbox_consumer('hotel-cards', models=['room', 'review'])
+def update_hotel_cards(events):
+    for hotel_id in {event.payload.get('hotel_id') for event in events} - {None}:
+        refresh_hotel_card(hotel_id)
+
+
+@outbox_consumer('occupancy', models=['booking', 'room'])
+def update_occupancy(events):
+    # A booking's earlier dates aren't in its event, so each hotel's whole
+    # window is recounted: one pass over its ledger per batch
+    for hotel_id in {event.payload.get('hotel_id') for event in events} - {None}:
+        refresh_occupancy(hotel_id)
@@ -0,0 +1,209 @@
+import datetime
+import re
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Booking, CustomerPhone, PhoneIndex
+from .sharding import fan_out, merge_by_checkin
+from .snapshot import catalog_snapshot
+
+# E.164 numbers are at most 15 digits, country code included
+MIN_PHONE_DIGITS = 8
+MAX_PHONE_DIGITS = 15
+
+# The shortest tail of a number staff can search by; fewer digits match
+# too many guests to be useful
+MIN_SUFFIX_DIGITS = 4
+
+# Most customers one lookup returns
+PHONE_LOOKUP_LIMIT = 20
+
+PHONE_CHARACTERS = re.compile(r'^\+?[\d\s().\-/]+$')
+NON_DIGITS = re.compile(r'\D')
+
+
+# --- Normalizing ---
+def normalize_phone(raw, country_code=None):
+    # '+44 20 7946 0958' -> '+442079460958', '(555) 123-4567' -> '+15551234567'.
+    # '00' is read as the international prefix. Numbers without a country
+    # code get PHONE_DEFAULT_COUNTRY_CODE, minus a leading trunk '0'.
+    country_code = country_code or settings.PHONE_DEFAULT_COUNTRY_CODE
+    raw = (raw or '').strip()
+    if not PHONE_CHARACTERS.match(raw):
+        raise ValidationError('Enter a phone number using digits, spaces, dashes or brackets, optionally starting with +.')
+
+    digits = NON_DIGITS.sub('', raw)
+    if raw.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = country_code + digits[1:]
+    elif not (digits.startswith(country_code) and len(digits) > 10):
+        # Longer than a national number and already starting with the
+        # country code means it was typed without the '+'
+        digits = country_code + digits
+
+    if not MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        raise ValidationError('Enter a complete phone number, including the area code.')
+    return '+' + digits
+
+
+def reversed_digits(phone):
+    return phone.lstrip('+')[::-1]
+
+
+# --- Phone Index Maintenance ---
+def index_rows(phones):
+    # (cust_id, number, is_primary) rows -> PhoneIndex objects, one per
+    # customer and number. Numbers that don't normalize stay out.
+    entries = {}
+    for cust_id, number, is_primary in phones:
+        try:
+            phone = normalize_phone(number)
+        except ValidationError:
+            continue
+        entries[(cust_id, phone)] = entries.get((cust_id, phone), False) or bool(is_primary)
+    return [
+        PhoneIndex(cust_id=cust_id, phone=phone, reversed_digits=reversed_digits(phone), is_primary=is_primary)
+        for (cust_id, phone), is_primary in entries.items()
+    ]
+
+
+def index_customers(cust_ids):
+    # Rewrites the customers' index rows from customer_phone. A customer has
+    # a handful of numbers, so this is simpler than tracking single changes,
+    # and it copes with customer_phone's odd primary key (Cust_ID alone).
+    phones = CustomerPhone.objects.filter(cust_id__in=cust_ids).values_list('cust_id', 'phone_number', 'is_primary')
+    with transaction.atomic():
+        PhoneIndex.objects.filter(cust_id__in=cust_ids).delete()
+        return len(PhoneIndex.objects.bulk_create(index_rows(phones)))
+
+
+def index_customer_phones(cust_id):
+    return index_customers([cust_id])
+
+
+# --- Backfill ---
+def customer_id_batches(batch_size):
+    last_id = None
+    while True:
+        rows = CustomerPhone.objects.order_by('cust_id')
+        if last_id is not None:
+            rows = rows.filter(cust_id__gt=last_id)
+        cust_ids = list(rows.values_list('cust_id', flat=True).distinct()[:batch_size])
+        if not cust_ids:
+            return
+        yield cust_ids
+        last_id = cust_ids[-1]
+
+
+def normalize_customer_phones(cust_ids, stats, dry_run=False):
+    # Rewrites each number in E.164 form. Rows are addressed by (customer,
+    # number) with plain UPDATE/DELETE statements: the model's primary key is
+    # Cust_ID alone, so saving or deleting an instance would touch all of the
+    # customer's numbers. A number that turns out to be another way of
+    # writing one the customer already has is dropped, keeping its primary flag.
+    rows = CustomerPhone.objects.filter(cust_id__in=cust_ids).values_list('cust_id', 'phone_number', 'is_primary')
+    kept = {}
+    for cust_id, number, is_primary in rows.order_by('cust_id', '-is_primary', 'phone_number'):
+        try:
+            phone = normalize_phone(number)
+        except ValidationError:
+            stats['invalid'].append((cust_id, number))
+            continue
+        if phone == number and (cust_id, phone) not in kept:
+            kept[(cust_id, phone)] = number
+            continue
+
+        stats['normalized'] += 1
+        if dry_run:
+            continue
+        row = CustomerPhone.objects.filter(cust_id=cust_id, phone_number=number)
+        if (cust_id, phone) in kept or CustomerPhone.objects.filter(cust_id=cust_id, phone_number=phone).exists():
+            if is_primary:
+                CustomerPhone.objects.filter(cust_id=cust_id, phone_number=phone).update(is_primary=True)
+            row._raw_delete(row.db)
+            stats['merged'] += 1
+        else:
+            row.update(phone_number=phone)
+        kept[(cust_id, phone)] = phone
+
+
+def backfill_phones(batch_size=500, dry_run=False):
+    stats = {'normalized': 0, 'merged': 0, 'indexed': 0, 'invalid': []}
+    for cust_ids in customer_id_batches(batch_size):
+        with transaction.atomic():
+            normalize_customer_phones(cust_ids, stats, dry_run=dry_run)
+            if not dry_run:
+                stats['indexed'] += index_customers(cust_ids)
+    return stats
+
+
+# --- Lookup ---
+def phone_matches(query, limit=PHONE_LOOKUP_LIMIT):
+    # One query: the whole number (in any format) or its last digits, each
+    # answered by its own index, joined to the customer
+    digits = NON_DIGITS.sub('', query or '')
+    if len(digits) < MIN_SUFFIX_DIGITS:
+        return []
+
+    condition = Q(reversed_digits__startswith=digits[::-1])
+    try:
+        condition |= Q(phone=normalize_phone(query))
+    except ValidationError:
+        pass
+
+    matches = PhoneIndex.objects.filter(condition).select_related('cust').order_by('-is_primary', 'cust_id', 'phone')
+    customers = {}
+    for match in matches[:limit * 2]:
+        customers.setdefault(match.cust_id, (match.cust, []))[1].append(match.phone)
+    return list(customers.values())[:limit]
+
+
+def upcoming_bookings(cust_ids, today=None):
+    # One query per shard, for everyone found at once
+    today = today or datetime.date.today()
+
+    def query(alias):
+        return list(
+            Booking.objects.using(alias)
+            .filter(cust_id__in=cust_ids, checkout__gte=today)
+            .exclude(status='Cancelled')
+            .order_by('checkin', 'pk')
+        )
+    return merge_by_checkin(fan_out(query), newest_first=False)
+
+
+def lookup_by_phone(query, today=None):
+    matches = phone_matches(query)
+    bookings = upcoming_bookings([customer.pk for customer, phones in matches], today) if matches else []
+    snapshot = catalog_snapshot()
+
+    by_customer = {}
+    for booking in bookings:
+        hotel = snapshot.hotel(booking.hotel_id)
+        by_customer.setdefault(booking.cust_id, []).append({
+            'booking_id': booking.pk,
+            'hotel_id': booking.hotel_id,
+            'hotel_name': hotel.name if hotel else None,
+            'room_number': booking.room_number,
+            'checkin': booking.checkin,
+            'checkout': booking.checkout,
+            'status': booking.status,
+        })
+
+    return [
+        {
+            'cust_id': customer.pk,
+            'first_name': customer.first_name,
+            'last_name': customer.last_name,
+            'email': customer.email,
+            'phones': phones,
+            'upcoming_bookings': by_customer.get(customer.pk, []),
+        }
+        for customer, phones in matches
+    ]
@@ -0,0 +1,166 @@
+import datetime
+from collections import Counter
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import router, transaction
+
+from .ledger import nights_between
+from .models import OccupancyNight, PricingRule, RoomNight
+from .sharding import shard_for_hotel
+from .snapshot import catalog_snapshot
+
+# How far ahead the occupancy matrix is kept
+PRICING_HORIZON_DAYS = 365
+
+# How long a worker trusts a cached occupancy cell or rule list. A refresh
+# rewrites the cells in the cache directly, so with a shared cache (Redis)
+# quotes follow it at once; with per-process caches, within this many seconds.
+PRICING_CACHE_SECONDS = 300
+
+# However many rules apply, a night never drops below half or goes above
+# twice the room's list price
+MIN_MULTIPLIER = Decimal('0.5')
+MAX_MULTIPLIER = Decimal('2')
+
+CENTS = Decimal('0.01')
+
+
+def occupancy_key(hotel_id, roomtype, night):
+    return f'pricing:occupancy:{hotel_id}:{roomtype}:{night.isoformat()}'
+
+
+def rules_key(hotel_id):
+    return f'pricing:rules:{hotel_id}'
+
+
+def room_type_totals(hotel_id):
+    # roomtype -> rooms that can be sold, and room number -> roomtype
+    rooms = catalog_snapshot().rooms_for(hotel_id)
+    totals = Counter(room.roomtype for room in rooms if room.availability and room.roomtype)
+    types = {room.room_number: room.roomtype for room in rooms if room.roomtype}
+    return totals, types
+
+
+# --- Occupancy Matrix (batch) ---
+def count_occupancy(hotel_id, start, end):
+    # {(roomtype, night): booked rooms}, from one pass over the hotel's ledger
+    totals, types = room_type_totals(hotel_id)
+    nights = (
+        RoomNight.objects.using(shard_for_hotel(hotel_id))
+        .filter(hotel_id=hotel_id, night__gte=start, night__lt=end)
+        .values_list('room_number', 'night')
+    )
+    booked = Counter()
+    for room_number, night in nights.iterator():
+        roomtype = types.get(room_number)
+        if roomtype is not None:
+            booked[(roomtype, night)] += 1
+    return totals, booked
+
+
+def refresh_occupancy(hotel_id, start=None, days=PRICING_HORIZON_DAYS):
+    # Rebuilds the hotel's rows for the window and writes every cell of it,
+    # empty ones included, straight into the cache
+    start = start or datetime.date.today()
+    end = start + datetime.timedelta(days=days)
+    totals, booked = count_occupancy(hotel_id, start, end)
+
+    # The counts are read from the booking shards but written to the
+    # matrix's own database; the cache follows once that commits
+    using = router.db_for_write(OccupancyNight)
+    with transaction.atomic(using=using):
+        OccupancyNight.objects.using(using).filter(hotel_id=hotel_id, night__gte=start, night__lt=end).delete()
+        OccupancyNight.objects.using(using).bulk_create([
+            OccupancyNight(hotel_id=hotel_id, roomtype=roomtype, night=night, booked=count)
+            for (roomtype, night), count in booked.items()
+        ])
+
+    cells = {
+        occupancy_key(hotel_id, roomtype, night): booked[(roomtype, night)]
+        for roomtype in totals
+        for night in nights_between(start, end)
+    }
+    transaction.on_commit(lambda: cache.set_many(cells, PRICING_CACHE_SECONDS), using=using)
+    return len(booked)
+
+
+# --- Reading the Matrix (per quote) ---
+def booked_rooms_by_night(hotel_id, roomtype, nights):
+    # One cache round trip for the whole stay; only missing cells hit the table
+    keys = {occupancy_key(hotel_id, roomtype, night): night for night in nights}
+    found = cache.get_many(keys)
+
+    missing = [night for key, night in keys.items() if key not in found]
+    if missing:
+        rows = dict(
+            OccupancyNight.objects.filter(hotel_id=hotel_id, roomtype=roomtype, night__in=missing)
+            .values_list('night', 'booked')
+        )
+        fresh = {occupancy_key(hotel_id, roomtype, night): rows.get(night, 0) for night in missing}
+        cache.set_many(fresh, PRICING_CACHE_SECONDS)
+        found.update(fresh)
+
+    return {night: found[key] for key, night in keys.items()}
+
+
+def hotel_rules(hotel_id):
+    rules = cache.get(rules_key(hotel_id))
+    if rules is None:
+        rules = list(PricingRule.objects.filter(hotel_id=hotel_id, active=True).order_by('pk'))
+        cache.set(rules_key(hotel_id), rules, PRICING_CACHE_SECONDS)
+    return rules
+
+
+def forget_hotel_rules(hotel_id):
+    cache.delete(rules_key(hotel_id))
+
+
+# --- Rates ---
+def rule_applies(rule, roomtype, occupancy, lead_days):
+    if rule.roomtype and rule.roomtype != roomtype:
+        return False
+    if rule.min_occupancy is not None and occupancy < rule.min_occupancy:
+        return False
+    if rule.max_occupancy is not None and occupancy > rule.max_occupancy:
+        return False
+    if rule.min_lead_days is not None and lead_days < rule.min_lead_days:
+        return False
+    if rule.max_lead_days is not None and lead_days > rule.max_lead_days:
+        return False
+    return True
+
+
+def night_multiplier(rules, roomtype, occupancy, lead_days):
+    adjustment = sum((rule.adjustment for rule in rules if rule_applies(rule, roomtype, occupancy, lead_days)), Decimal('0'))
+    return min(max(1 + adjustment / 100, MIN_MULTIPLIER), MAX_MULTIPLIER)
+
+
+def quote_stay(room, checkin, checkout, today=None):
+    # Nightly rates for a stay: the room's list price moved by whichever of
+    # the hotel's rules apply to each night. Hotels without rules cost
+    # nothing extra to quote.
+    today = today or datetime.date.today()
+    nights = nights_between(checkin, checkout)
+    price = room.price or Decimal('0')
+    rules = hotel_rules(room.hotel_id)
+
+    if not rules or not nights:
+        rates = [(night, price) for night in nights]
+    else:
+        totals, types = room_type_totals(room.hotel_id)
+        total = totals.get(room.roomtype) or 1
+        booked = booked_rooms_by_night(room.hotel_id, room.roomtype, nights)
+        rates = []
+        for night in nights:
+            occupancy = booked[night] * 100 / total
+            multiplier = night_multiplier(rules, room.roomtype, occupancy, (night - today).days)
+            rates.append((night, (price * multiplier).quantize(CENTS)))
+
+    distinct = {rate for night, rate in rates}
+    return {
+        'rates': rates,
+        'subtotal': sum((rate for night, rate in rates), Decimal('0')),
+        # The one nightly rate when every night costs the same
+        'nightly_rate': distinct.pop() if len(distinct) == 1 else None,
+    }
@@ -0,0 +1,130 @@
+import io
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+# Profile ids look like 20250101-071502-1a2b3c4d
+PROFILE_ID_RE = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{8}$')
+
+
+def profile_dir():
+    return Path(settings.PROFILE_DIR)
+
+
+# --- SQL Timing ---
+# Installed with connection.execute_wrapper() around a profiled request, so
+# each capture says how much of the time was spent waiting on the database.
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+# --- Storing Captures ---
+# Each capture is a cProfile dump (<id>.prof, readable with pstats or
+# snakeviz) plus a small <id>.json with what the listing page shows.
+def save_profile(profiler, request, response, elapsed, queries):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    match = request.resolver_match
+    meta = {
+        'id': profile_id,
+        'url_name': match.url_name if match else None,
+        'path': request.path,
+        'method': request.method,
+        'status': response.status_code,
+        'elapsed_ms': round(elapsed * 1000, 1),
+        'sql_ms': round(queries.seconds * 1000, 1),
+        'sql_count': queries.count,
+        'created': time.time(),
+    }
+
+    profiler.dump_stats(directory / f'{profile_id}.prof')
+    (directory / f'{profile_id}.json').write_text(json.dumps(meta))
+    prune_profiles(directory, settings.PROFILE_MAX_FILES)
+    return profile_id
+
+
+def modified_time(path):
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0  # Another worker pruned it already
+
+
+def prune_profiles(directory, keep):
+    # Oldest captures go first
+    captures = sorted(directory.glob('*.json'), key=modified_time)
+    for old in captures[:max(len(captures) - keep, 0)]:
+        for path in (old, old.with_suffix('.prof')):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+# --- Reading Captures ---
+def load_profiles():
+    profiles = []
+    for path in profile_dir().glob('*.json'):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # Half-written or removed while we were reading
+    return profiles
+
+
+def slowest_profiles(url_name=None, limit=50):
+    profiles = load_profiles()
+    if url_name:
+        profiles = [p for p in profiles if p['url_name'] == url_name]
+    return sorted(profiles, key=lambda p: p['elapsed_ms'], reverse=True)[:limit]
+
+
+def profile_summary():
+    # Per URL name: captures, slowest and average time, average share in SQL
+    by_name = {}
+    for p in load_profiles():
+        by_name.setdefault(p['url_name'] or '(unnamed)', []).append(p)
+
+    summary = []
+    for url_name, captures in by_name.items():
+        total = sum(p['elapsed_ms'] for p in captures)
+        summary.append({
+            'url_name': url_name,
+            'count': len(captures),
+            'max_ms': max(p['elapsed_ms'] for p in captures),
+            'avg_ms': round(total / len(captures), 1),
+            'sql_share': sum(p['sql_ms'] for p in captures) / total if total else 0,
+        })
+    return sorted(summary, key=lambda s: s['max_ms'], reverse=True)
+
+
+def profile_report(profile_id, sort='cumulative', limit=40):
+    # The pstats text report, or None if there's no such capture
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    path = profile_dir() / f'{profile_id}.prof'
+    if not path.exists():
+        return None
+
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,219 @@
+import time
+
+from django.db import transaction
+from django.db.models import Count
+
+from .archive import BOOKING_FIELDS, CANCELLATION_FIELDS, PAYMENT_FIELDS
+from .catalog import CATALOG_VERSION_TTL, bump_catalog_version
+from .models import (
+    ArchivedBooking, ArchivedCancellation, ArchivedPayment, Booking, Cancellation, HotelShard, Payment,
+    PaymentAdjustment, RoomNight
+)
+from .sharding import booking_shards, fan_out
+
+# How many rows of each table are copied or deleted per transaction
+REBALANCE_BATCH_SIZE = 500
+
+# How long to wait after changing a hotel's placement before relying on it.
+# Workers re-read the placement within CATALOG_VERSION_TTL seconds; the
+# extra margin covers requests that were already running.
+REBALANCE_SETTLE_SECONDS = CATALOG_VERSION_TTL + 5
+
+ADJUSTMENT_FIELDS = (
+    'id', 'booking_id', 'payment_id', 'amount', 'reason', 'previous_checkin', 'previous_checkout',
+    'checkin', 'checkout', 'date', 'created_at',
+)
+
+# Each table holding a hotel's rows: (model, copied fields, lookup for the
+# hotel). Parents come before children so copies never point at a missing
+# booking; deletes run in the reverse order.
+HOTEL_TABLES = [
+    (Booking, BOOKING_FIELDS, 'hotel_id'),
+    (Payment, PAYMENT_FIELDS, 'booking__hotel_id'),
+    (PaymentAdjustment, ADJUSTMENT_FIELDS, 'booking__hotel_id'),
+    (Cancellation, CANCELLATION_FIELDS, 'booking__hotel_id'),
+    (ArchivedBooking, BOOKING_FIELDS, 'hotel_id'),
+    (ArchivedPayment, PAYMENT_FIELDS, 'booking__hotel_id'),
+    (ArchivedCancellation, CANCELLATION_FIELDS, 'booking__hotel_id'),
+]
+
+LEDGER_FIELDS = ('hotel_id', 'room_number', 'night', 'booking_id')
+
+
+class ShardMoveError(Exception):
+    pass
+
+
+def hotel_rows(model, lookup, hotel_id, using):
+    return model.objects.using(using).filter(**{lookup: hotel_id}).order_by('pk')
+
+
+def hotel_ids(model, lookup, hotel_id, using, batch_size):
+    # The hotel's primary keys, one batch at a time, walked by primary key
+    last_pk = None
+    while True:
+        rows = hotel_rows(model, lookup, hotel_id, using)
+        if last_pk is not None:
+            rows = rows.filter(pk__gt=last_pk)
+        ids = list(rows.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids
+        last_pk = ids[-1]
+
+
+# --- Copying a Hotel ---
+def copy_table(model, fields, lookup, hotel_id, source, target, batch_size):
+    # Rows missing on the target are inserted with their ids; rows already
+    # there are rewritten only if they differ. The first pass copies
+    # everything, the second (with writes frozen) only what changed since.
+    pk_name = model._meta.pk.attname
+    stats = {'copied': 0, 'updated': 0}
+
+    for ids in hotel_ids(model, lookup, hotel_id, source, batch_size):
+        rows = list(model.objects.using(source).filter(pk__in=ids).values(*fields))
+        on_target = model.objects.using(target).filter(pk__in=ids)
+        ours = {row[pk_name]: row for row in on_target.filter(**{lookup: hotel_id}).values(*fields)}
+
+        # Ids must be unique across shards; anything else means they aren't
+        clashes = set(on_target.values_list('pk', flat=True)) - ours.keys()
+        if clashes:
+            raise ShardMoveError(
+                f'{model._meta.db_table} ids {sorted(clashes)[:10]} already belong to other rows on {target}.'
+            )
+
+        new = [model(**row) for row in rows if row[pk_name] not in ours]
+        changed = [model(**row) for row in rows if row[pk_name] in ours and ours[row[pk_name]] != row]
+        with transaction.atomic(using=target):
+            model.objects.using(target).bulk_create(new)
+            if changed:
+                model.objects.using(target).bulk_update(changed, [field for field in fields if field != pk_name])
+        stats['copied'] += len(new)
+        stats['updated'] += len(changed)
+    return stats
+
+
+def remove_stale(model, lookup, hotel_id, source, target, batch_size):
+    # Rows copied earlier whose original has since been deleted
+    removed = 0
+    for ids in hotel_ids(model, lookup, hotel_id, target, batch_size):
+        stale = set(ids) - set(model.objects.using(source).filter(pk__in=ids).values_list('pk', flat=True))
+        if stale:
+            stale_rows = model.objects.using(target).filter(pk__in=stale)
+            removed += stale_rows._raw_delete(target)
+    return removed
+
+
+def copy_ledger(hotel_id, source, target, batch_size):
+    # The ledger's own ids are never referenced, so the target numbers its
+    # copies itself. Runs with writes frozen, replacing whatever was there.
+    with transaction.atomic(using=target):
+        RoomNight.objects.using(target).filter(hotel_id=hotel_id).delete()
+        copied = 0
+        for ids in hotel_ids(RoomNight, 'hotel_id', hotel_id, source, batch_size):
+            rows = RoomNight.objects.using(source).filter(pk__in=ids).values(*LEDGER_FIELDS)
+            copied += len(RoomNight.objects.using(target).bulk_create([RoomNight(**row) for row in rows]))
+    return copied
+
+
+def copy_hotel(hotel_id, source, target, batch_size, final=False):
+    stats = {}
+    for model, fields, lookup in HOTEL_TABLES:
+        stats[model._meta.db_table] = copy_table(model, fields, lookup, hotel_id, source, target, batch_size)
+    if final:
+        for model, fields, lookup in reversed(HOTEL_TABLES):
+            stats[model._meta.db_table]['removed'] = remove_stale(model, lookup, hotel_id, source, target, batch_size)
+        stats['room_night'] = {'copied': copy_ledger(hotel_id, source, target, batch_size)}
+    return stats
+
+
+def delete_hotel(hotel_id, using, batch_size):
+    # Raw deletes, children first: the rows live on in the new shard, so no
+    # signals (ledger release, outbox, summaries) should fire for them
+    deleted = 0
+    for model, fields, lookup in reversed(HOTEL_TABLES):
+        for ids in hotel_ids(model, lookup, hotel_id, using, batch_size):
+            deleted += model.objects.using(using).filter(pk__in=ids)._raw_delete(using)
+    for ids in hotel_ids(RoomNight, 'hotel_id', hotel_id, using, batch_size):
+        deleted += RoomNight.objects.using(using).filter(pk__in=ids)._raw_delete(using)
+    return deleted
+
+
+# --- Moving a Hotel Between Shards ---
+def current_shard(hotel_id):
+    # Read the directory itself, not a worker's cached copy of it
+    placement = HotelShard.objects.filter(hotel_id=hotel_id).values_list('shard', flat=True).first()
+    return placement or booking_shards()[0]
+
+
+def set_placement(hotel_id, shard, moving):
+    HotelShard.objects.update_or_create(hotel_id=hotel_id, defaults={'shard': shard, 'moving': moving})
+    bump_catalog_version()
+
+
+def move_hotel(hotel_id, target, batch_size=REBALANCE_BATCH_SIZE, settle_seconds=REBALANCE_SETTLE_SECONDS, log=None):
+    # 1. Copy while the hotel keeps taking bookings.
+    # 2. Freeze its booking writes and wait until every worker has noticed.
+    # 3. Copy what changed in the meantime, drop what was deleted, copy the ledger.
+    # 4. Point the hotel at the new shard, wait again, then delete the old rows.
+    # Guests only see the freeze in step 3, which is short because step 1
+    # already copied almost everything.
+    log = log or (lambda message: None)
+    if target not in booking_shards():
+        raise ShardMoveError(f'{target} is not a booking shard. Known: {", ".join(booking_shards())}')
+    source = current_shard(hotel_id)
+    if source == target:
+        return None
+
+    log(f'Copying hotel {hotel_id} from {source} to {target}...')
+    stats = {'source': source, 'target': target, 'first_pass': copy_hotel(hotel_id, source, target, batch_size)}
+
+    log('Freezing booking writes for the hotel...')
+    set_placement(hotel_id, source, moving=True)
+    try:
+        time.sleep(settle_seconds)
+        stats['final_pass'] = copy_hotel(hotel_id, source, target, batch_size, final=True)
+        set_placement(hotel_id, target, moving=False)
+    except BaseException:
+        # Leave the hotel where it was, taking bookings again
+        set_placement(hotel_id, source, moving=False)
+        raise
+
+    log(f'Hotel {hotel_id} now lives on {target}; removing the old copy...')
+    time.sleep(settle_seconds)
+    stats['deleted'] = delete_hotel(hotel_id, source, batch_size)
+    return stats
+
+
+# --- Planning ---
+def shard_loads():
+    # shard -> {hotel_id: live bookings}, counted on every shard at once
+    def count(alias):
+        return dict(
+            Booking.objects.using(alias).filter(hotel_id__isnull=False)
+            .values_list('hotel_id').annotate(bookings=Count('pk')).order_by()
+        )
+    return dict(zip(booking_shards(), fan_out(count)))
+
+
+def plan_moves(loads, tolerance=0.1):
+    # Greedy: keep moving the biggest hotel that narrows the gap between the
+    # busiest and the quietest shard, until they are within `tolerance`.
+    hotels = {alias: dict(counts) for alias, counts in loads.items()}
+    totals = {alias: sum(counts.values()) for alias, counts in hotels.items()}
+    moves = []
+    while len(totals) > 1:
+        busiest = max(totals, key=totals.get)
+        quietest = min(totals, key=totals.get)
+        gap = totals[busiest] - totals[quietest]
+        if gap <= tolerance * totals[busiest]:
+            break
+        candidates = [(count, hotel_id) for hotel_id, count in hotels[busiest].items() if count < gap]
+        if not candidates:
+            break
+        count, hotel_id = max(candidates)
+        moves.append((hotel_id, busiest, quietest, count))
+        hotels[quietest][hotel_id] = hotels[busiest].pop(hotel_id)
+        totals[busiest] -= count
+        totals[quietest] += count
+    return moves
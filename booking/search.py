@@ -0,0 +1,296 @@
+import datetime
+import hashlib
+import json
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, F, Q
+
+from .amenities import AMENITY_BITS, AMENITY_LABELS, amenity_index, amenity_mask
+from .catalog import REVIEW_STATS, catalog_version
+from .models import Hotel, Offer
+from .snapshot import catalog_snapshot
+
+# Rating facet: label -> minimum rating. A hotel counts in every band it clears.
+RATING_BANDS = [
+    ('4.5', '4.5+ stars'),
+    ('4', '4+ stars'),
+    ('3', '3+ stars'),
+]
+
+# Only show the most common values for the long facets
+FACET_LIMIT = 15
+
+# ?sort= options; prices and sizes come from the precomputed hotel_card table
+SORT_OPTIONS = {
+    'name': ('Name', ('name', 'hotel_id')),
+    'price_asc': ('Price: low to high', (F('card__min_price').asc(nulls_last=True), 'name', 'hotel_id')),
+    'price_desc': ('Price: high to low', (F('card__max_price').desc(nulls_last=True), 'name', 'hotel_id')),
+    'rating': ('Rating', (F('rating').desc(nulls_last=True), 'name', 'hotel_id')),
+    'reviews': ('Most reviewed', (F('card__review_count').desc(nulls_last=True), 'name', 'hotel_id')),
+}
+
+# Search result cache: results are served fresh for SEARCH_CACHE_TTL seconds,
+# then served stale for up to SEARCH_CACHE_GRACE more while a background
+# thread started by one request recomputes them.
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_GRACE = 60
+SEARCH_LOCK_TIMEOUT = 10   # Longest a recompute may hold the lock
+SEARCH_LOCK_WAIT = 2       # Longest a request waits for someone else's recompute
+
+# Multi-valued URL parameters (e.g. ?city=Mumbai&city=Pune)
+LIST_PARAMS = ('city', 'state', 'amenity')
+
+
+# --- Reading the Search from the URL ---
+def search_params(query_dict):
+    # Normalise so the same search always produces the same params
+    params = {
+        'q': query_dict.get('q', '').strip(),
+        'filter_offers': query_dict.get('filter_offers') == 'on',
+        'rating': query_dict.get('rating', ''),
+    }
+    for name in LIST_PARAMS:
+        params[name] = sorted({v.strip() for v in query_dict.getlist(name) if v.strip()})
+
+    if params['rating'] not in dict(RATING_BANDS):
+        params['rating'] = ''
+
+    params['sort'] = query_dict.get('sort', '') if query_dict.get('sort') in SORT_OPTIONS else 'name'
+    params['min_price'] = parse_number(query_dict.get('min_price'), Decimal)
+    params['max_price'] = parse_number(query_dict.get('max_price'), Decimal)
+    params['guests'] = parse_number(query_dict.get('guests'), int)
+
+    # Amenities must come from the fixed vocabulary; 'all' unless ?amenity_mode=any
+    params['amenity'] = [key for key in params['amenity'] if key in AMENITY_BITS]
+    params['amenity_mode'] = 'any' if query_dict.get('amenity_mode') == 'any' else 'all'
+    return params
+
+
+def parse_number(value, number_type):
+    # Blank, malformed or negative values are ignored rather than rejected
+    try:
+        number = number_type(value)
+    except (TypeError, ValueError, InvalidOperation):
+        return None
+    return number if number >= 0 else None
+
+
+# --- Filtering ---
+def filter_hotels(params):
+    hotels = Hotel.objects.all()
+
+    if params['q']:
+        query = params['q']
+        hotels = hotels.filter(
+            Q(name__icontains=query) |
+            Q(city__icontains=query) |
+            Q(state__icontains=query)
+        )
+
+    # Values in one facet are OR'd together; different facets are AND'd
+    if params['city']:
+        hotels = hotels.filter(city__in=params['city'])
+    if params['state']:
+        hotels = hotels.filter(state__in=params['state'])
+    if params['rating']:
+        hotels = hotels.filter(rating__gte=params['rating'])
+    if params['amenity']:
+        # Evaluated with bitwise ops over the in-memory index, not per-amenity joins
+        hotel_ids = amenity_index().matching(
+            amenity_mask(params['amenity']),
+            match_all=(params['amenity_mode'] == 'all')
+        )
+        hotels = hotels.filter(pk__in=hotel_ids)
+
+    if params['filter_offers']:
+        today = datetime.date.today()
+        # A semi-join instead of JOIN + DISTINCT over the offer table
+        hotels = hotels.filter(pk__in=Offer.objects.filter(
+            start_date__lte=today,
+            end_date__gte=today
+        ).values('hotel_id'))
+
+    # Price range and party size are answered from the hotel card, not the room table.
+    # A hotel matches the price range if any of its room prices can fall inside it.
+    if params['min_price'] is not None:
+        hotels = hotels.filter(card__max_price__gte=params['min_price'])
+    if params['max_price'] is not None:
+        hotels = hotels.filter(card__min_price__lte=params['max_price'])
+    if params['guests']:
+        hotels = hotels.filter(card__max_capacity__gte=params['guests'])
+
+    return hotels.order_by(*SORT_OPTIONS[params['sort']][1])
+
+
+# --- Facet Counts ---
+# What each facet's values mean when nothing is picked in it
+UNSELECTED = {'city': [], 'state': [], 'rating': '', 'amenity': []}
+
+
+def facet_counts(params):
+    # Each facet is counted over the hotels matching every *other* facet, so
+    # after picking a city the other cities still show what OR-ing them in
+    # would add. Amenities in 'all' mode narrow the results instead, so they
+    # are counted over the hotels that have everything picked so far.
+    def hotels_without(name):
+        if name == 'amenity' and params['amenity_mode'] == 'all':
+            return filter_hotels(params).order_by()
+        return filter_hotels(dict(params, **{name: UNSELECTED[name]})).order_by()
+
+    cities = (
+        hotels_without('city').exclude(city__isnull=True).values_list('city')
+        .annotate(count=Count('pk')).order_by('-count', 'city')[:FACET_LIMIT]
+    )
+    states = (
+        hotels_without('state').exclude(state__isnull=True).values_list('state')
+        .annotate(count=Count('pk')).order_by('-count', 'state')[:FACET_LIMIT]
+    )
+    ratings = hotels_without('rating').aggregate(**{
+        f'band_{i}': Count('pk', filter=Q(rating__gte=band)) for i, (band, label) in enumerate(RATING_BANDS)
+    })
+    amenities = amenity_index().counts(hotels_without('amenity').values_list('pk', flat=True))
+
+    return {
+        'city': list(cities),
+        'state': list(states),
+        'rating': [(band, ratings[f'band_{i}']) for i, (band, label) in enumerate(RATING_BANDS)],
+        'amenity': sorted(amenities, key=lambda item: -item[1]),
+    }
+
+
+# --- Search Result Cache ---
+def search_cache_key(params):
+    # params are already normalised (trimmed, lists sorted), so equal searches
+    # give equal keys. The catalog version in the key means a catalog change
+    # makes every cached search miss at once.
+    normalized = dict(params, q=params['q'].lower())
+    if params['filter_offers']:
+        # Active offers depend on the date
+        normalized['today'] = datetime.date.today().isoformat()
+    version = catalog_version()
+    if params['sort'] == 'reviews':
+        # Ordered by the cards' review counts, which move without the catalog
+        version = f'{version}.{catalog_version(REVIEW_STATS)}'
+    digest = hashlib.md5(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+    return f'search:{version}:{digest}'
+
+
+def run_search(params):
+    return {
+        'ids': list(filter_hotels(params).values_list('pk', flat=True)),
+        'facets': facet_counts(params),
+    }
+
+
+def store_search(key, result):
+    cache.set(key, (time.time() + SEARCH_CACHE_TTL, result), SEARCH_CACHE_TTL + SEARCH_CACHE_GRACE)
+
+
+def refresh_search(key, lock_key, params):
+    try:
+        store_search(key, run_search(params))
+    finally:
+        cache.delete(lock_key)
+        # Connections are per thread; this one is about to go away
+        connections.close_all()
+
+
+def cached_search(params):
+    # Returns {'ids': ordered hotel ids, 'facets': facet counts}
+    key = search_cache_key(params)
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+
+    if entry is not None:
+        fresh_until, result = entry
+        # Past its TTL: the first request to grab the lock starts a refresh
+        # and, like everyone else, gets the stale copy meanwhile
+        if time.time() > fresh_until and cache.add(lock_key, 1, SEARCH_LOCK_TIMEOUT):
+            threading.Thread(
+                target=refresh_search, args=(key, lock_key, params), name='search-refresh', daemon=True
+            ).start()
+        return result
+
+    # Nothing cached: only one request per key runs the query (single flight)
+    if cache.add(lock_key, 1, SEARCH_LOCK_TIMEOUT):
+        try:
+            result = run_search(params)
+            store_search(key, result)
+        finally:
+            cache.delete(lock_key)
+        return result
+
+    deadline = time.monotonic() + SEARCH_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+
+    # The other request is taking too long; answer this one directly
+    return run_search(params)
+
+
+def hotels_in_order(hotel_ids):
+    # Read from the in-process catalog snapshot, already in search order
+    return catalog_snapshot().hotels_in_order(hotel_ids)
+
+
+# --- Facet Links for the Template ---
+def toggle_url(query_dict, param, value, single=False):
+    # The current URL with one facet value switched on or off
+    query = query_dict.copy()
+    query.pop('page', None)
+    values = query.getlist(param)
+    if value in values:
+        values.remove(value)
+    elif single:
+        values = [value]
+    else:
+        values.append(value)
+    query.setlist(param, values)
+    return '?' + query.urlencode()
+
+
+def facet_options(query_dict, params, counts):
+    rating_labels = dict(RATING_BANDS)
+    facets = [
+        ('City', 'city', counts['city'], lambda value: value),
+        ('State', 'state', counts['state'], lambda value: value),
+        ('Rating', 'rating', counts['rating'], rating_labels.get),
+        ('Amenities', 'amenity', counts['amenity'], AMENITY_LABELS.get),
+    ]
+
+    result = []
+    for title, param, values, label in facets:
+        selected = params[param] if isinstance(params[param], list) else [params[param]]
+        # Picked values stay listed, even at 0 (the counts leave those out),
+        # so they can be unpicked
+        counted = {value for value, count in values}
+        values = list(values) + [(value, 0) for value in selected if value and value not in counted]
+        options = [
+            {
+                'label': label(value),
+                'count': count,
+                'selected': value in selected,
+                'url': toggle_url(query_dict, param, value, single=(param == 'rating')),
+            }
+            for value, count in values if count or value in selected
+        ]
+        if options:
+            result.append({'title': title, 'options': options})
+
+        # With two or more amenities picked, offer to switch between AND and OR
+        if param == 'amenity' and options and len(params['amenity']) > 1:
+            switch_to = 'any' if params['amenity_mode'] == 'all' else 'all'
+            query = query_dict.copy()
+            query['amenity_mode'] = switch_to
+            result[-1]['mode_link'] = {
+                'label': 'Match any selected' if switch_to == 'any' else 'Match all selected',
+                'url': '?' + query.urlencode(),
+            }
+    return result
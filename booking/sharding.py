@@ -0,0 +1,150 @@
+import datetime
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404
+
+from .catalog import catalog_index
+from .models import Booking, HotelShard
+
+# Tables placed by hotel: a hotel's rows all live on the same shard, so a
+# booking, its payment, its cancellation and its ledger nights always commit
+# in one transaction on one database.
+HOTEL_SHARDED_MODELS = {
+    'booking', 'payment', 'paymentadjustment', 'cancellation', 'roomnight',
+    'archivedbooking', 'archivedpayment', 'archivedcancellation',
+}
+
+# Tables every shard has its own copy of. Outbox events are written in the
+# same transaction as the row they describe, so each shard keeps its own log.
+SHARD_LOCAL_MODELS = HOTEL_SHARDED_MODELS | {'outboxevent', 'outboxcheckpoint'}
+
+
+class HotelMoving(Exception):
+    # Raised when a booking write targets a hotel that rebalance_shards is moving
+    pass
+
+
+# --- Placement ---
+def booking_shards():
+    # Database aliases holding booking data; the first one is 'default'
+    return settings.BOOKING_SHARDS
+
+
+def build_shard_map():
+    return {
+        hotel_id: (shard, moving)
+        for hotel_id, shard, moving in HotelShard.objects.values_list('hotel_id', 'shard', 'moving')
+    }
+
+
+def shard_map():
+    # hotel_id -> (shard alias, moving), reloaded when the catalog version moves
+    return catalog_index('shard-map', build_shard_map)
+
+
+def shard_for_hotel(hotel_id):
+    shards = booking_shards()
+    if len(shards) == 1:
+        return shards[0]
+    return shard_map().get(hotel_id, (shards[0], False))[0]
+
+
+def hotel_is_moving(hotel_id):
+    if len(booking_shards()) == 1:
+        return False
+    return shard_map().get(hotel_id, (None, False))[1]
+
+
+def check_hotel_writable(hotel_id):
+    # Called by Booking.save() and the bulk booking paths
+    if hotel_is_moving(hotel_id):
+        raise HotelMoving(f'Bookings for hotel {hotel_id} are being moved. Please try again in a minute.')
+
+
+# --- Database Router ---
+# Customers, hotels, rooms and everything else stay on 'default'. Booking
+# rows go where their hotel lives; payments and cancellations follow the
+# booking they belong to (Django copies the booking's database onto them
+# when they are assigned). Querysets that don't start from an instance,
+# like Booking.objects.filter(...), have no hotel to go by and read
+# 'default': pass .using(shard_for_hotel(...)) or use fan_out() for those.
+class HotelShardRouter:
+    def db_for_read(self, model, **hints):
+        return self.route(model, hints.get('instance'))
+
+    def db_for_write(self, model, **hints):
+        return self.route(model, hints.get('instance'))
+
+    def route(self, model, instance):
+        if model._meta.model_name not in SHARD_LOCAL_MODELS:
+            return 'default'
+        if instance is None:
+            return None
+        if instance._state.db:
+            return instance._state.db
+        hotel_id = getattr(instance, 'hotel_id', None)
+        if instance._meta.model_name in HOTEL_SHARDED_MODELS and hotel_id is not None:
+            return shard_for_hotel(hotel_id)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # A booking on any shard may point at a customer on 'default'
+        if obj1._meta.model_name not in SHARD_LOCAL_MODELS or obj2._meta.model_name not in SHARD_LOCAL_MODELS:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == 'default':
+            return None
+        if app_label != 'booking':
+            return False
+        if model_name is None:
+            return None  # RunPython/RunSQL steps (the booking indexes) run everywhere
+        return model_name in SHARD_LOCAL_MODELS
+
+
+# --- Cross-Shard Reads ---
+def run_on_shard(query, alias):
+    try:
+        return query(alias)
+    finally:
+        # Connections are per thread; this pool thread is about to go away
+        connections.close_all()
+
+
+def fan_out(query, shards=None):
+    # Runs query(alias) on every shard, in parallel when there is more than
+    # one, and returns the results in shard order. query must return fully
+    # evaluated results (a list, not a queryset).
+    shards = list(shards or booking_shards())
+    if len(shards) == 1:
+        return [query(shards[0])]
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        return list(pool.map(lambda alias: run_on_shard(query, alias), shards))
+
+
+def merge_by_checkin(results, newest_first=True):
+    # Each shard's list is already ordered by check-in; merge without re-sorting
+    return list(heapq.merge(
+        *results,
+        key=lambda booking: booking.checkin or datetime.date.min,
+        reverse=newest_first,
+    ))
+
+
+def find_booking(booking_id):
+    # Booking ids are unique across shards (see README), so at most one matches
+    for booking in fan_out(lambda alias: Booking.objects.using(alias).filter(pk=booking_id).first()):
+        if booking is not None:
+            return booking
+    return None
+
+
+def get_booking_or_404(booking_id):
+    booking = find_booking(booking_id)
+    if booking is None:
+        raise Http404('No booking matches the given query.')
+    return booking
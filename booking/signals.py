@@ -0,0 +1,130 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .backends import forget_customer
+from .cards import schedule_card_refresh
+from .catalog import schedule_catalog_bump
+from .ledger import release_booking_nights
+from .live import booking_event, publish_after_commit, room_event
+from .outbox import record_event
+from .phones import index_customer_phones, normalize_phone
+from .models import (
+    Booking, Cancellation, Customer, CustomerPhone, Facility, Hotel, Offer, Payment, PaymentAdjustment, PricingRule,
+    Review, Room, RoomImage
+)
+from .pricing import forget_hotel_rules
+from .summaries import schedule_summary_refresh
+
+
+# --- Room-Night Ledger ---
+# Booking.save() keeps the ledger in step; deletes (including cascades from
+# a deleted customer) are handled here, inside the same delete transaction.
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, using, **kwargs):
+    release_booking_nights(instance.pk, using=using)
+
+
+# --- Outbox ---
+# Saves are recorded by OutboxMixin.save(); deletes (including cascades) are
+# recorded here, inside the delete's transaction.
+@receiver(post_delete, sender=Booking)
+@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=Cancellation)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Offer)
+@receiver(post_delete, sender=Room)
+def outbox_deleted(sender, instance, using, **kwargs):
+    record_event(instance, 'deleted', using)
+
+
+# --- Live Availability ---
+# Pushed to open availability streams once the change has committed
+@receiver(post_save, sender=Booking)
+def booking_availability_changed(sender, instance, using, **kwargs):
+    publish_after_commit(booking_event(instance), using)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_availability_released(sender, instance, using, **kwargs):
+    publish_after_commit(booking_event(instance, deleted=True), using)
+
+
+@receiver([post_save, post_delete], sender=Room)
+def room_availability_changed(sender, instance, signal, using, **kwargs):
+    available = signal is post_save and bool(instance.availability)
+    publish_after_commit(room_event(instance.hotel_id, instance.room_number, available=available, reason='room'), using)
+
+
+# --- Customer Summary Maintenance ---
+@receiver([post_save, post_delete], sender=Booking)
+def booking_changed(sender, instance, using, **kwargs):
+    schedule_summary_refresh(instance.cust_id, using)
+
+
+@receiver([post_save, post_delete], sender=Payment)
+@receiver([post_save, post_delete], sender=PaymentAdjustment)
+@receiver([post_save, post_delete], sender=Cancellation)
+def booking_child_changed(sender, instance, using, **kwargs):
+    if instance.booking_id:
+        # The booking may already be gone during a cascade delete
+        cust_id = Booking.objects.using(using).filter(pk=instance.booking_id).values_list('cust_id', flat=True).first()
+        schedule_summary_refresh(cust_id, using)
+
+
+# --- Pricing Rules ---
+@receiver([post_save, post_delete], sender=PricingRule)
+def pricing_rule_changed(sender, instance, using, **kwargs):
+    hotel_id = instance.hotel_id
+    transaction.on_commit(lambda: forget_hotel_rules(hotel_id), using=using)
+
+
+# --- Cached Logins ---
+# Dropped at once so this request sees the change, and again after commit
+# in case another request cached the old row in between
+@receiver([post_save, post_delete], sender=Customer)
+def customer_changed(sender, instance, using, **kwargs):
+    user_id = instance.pk
+    forget_customer(user_id)
+    transaction.on_commit(lambda: forget_customer(user_id), using=using)
+
+
+# --- Phone Index ---
+# Numbers saved outside the forms are normalized too; ones that can't be are
+# kept as typed and left out of the index
+@receiver(pre_save, sender=CustomerPhone)
+def customer_phone_normalize(sender, instance, **kwargs):
+    try:
+        instance.phone_number = normalize_phone(instance.phone_number)
+    except ValidationError:
+        pass
+
+
+@receiver([post_save, post_delete], sender=CustomerPhone)
+def customer_phone_changed(sender, instance, **kwargs):
+    index_customer_phones(instance.cust_id)
+
+
+# --- Catalog Version ---
+# Any change to what the listing shows makes in-process catalog indexes stale
+@receiver([post_save, post_delete], sender=Hotel)
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=RoomImage)
+@receiver([post_save, post_delete], sender=Facility)
+@receiver([post_save, post_delete], sender=Offer)
+def catalog_changed(sender, instance, using, **kwargs):
+    schedule_catalog_bump(using)
+
+
+# --- Hotel Card Maintenance ---
+@receiver([post_save, post_delete], sender=Hotel)
+def hotel_card_hotel_changed(sender, instance, using, **kwargs):
+    schedule_card_refresh(instance.pk, using)
+
+
+@receiver([post_save, post_delete], sender=Room)
+@receiver([post_save, post_delete], sender=RoomImage)
+@receiver([post_save, post_delete], sender=Review)
+def hotel_card_child_changed(sender, instance, using, **kwargs):
+    schedule_card_refresh(instance.hotel_id, using)
@@ -0,0 +1,130 @@
+from .catalog import REVIEW_STATS, catalog_index
+from .models import Facility, Hotel, HotelCard, Offer, Room, RoomImage
+
+
+# --- Read-Only Catalog Records ---
+# Small __slots__ objects filled straight from values_list() tuples, so
+# building the catalog never creates model instances. Templates read them
+# like models (hotel.name, room.images, hotel.card.min_price). They are
+# shared by every request in the worker, so they can't be changed.
+class Record:
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {getattr(self, self.__slots__[0])}>'
+
+
+class HotelRecord(Record):
+    __slots__ = ('hotel_id', 'name', 'city', 'state', 'rating', 'contact', 'description', 'card')
+
+    @property
+    def pk(self):
+        return self.hotel_id
+
+
+class CardRecord(Record):
+    __slots__ = ('min_price', 'max_price', 'max_capacity', 'room_count', 'cover_image')
+
+
+class ReviewStatsRecord(Record):
+    __slots__ = ('review_count', 'review_average')
+
+
+class RoomRecord(Record):
+    __slots__ = ('hotel_id', 'room_number', 'roomtype', 'capacity', 'price', 'availability', 'images')
+
+
+class ImageRecord(Record):
+    __slots__ = ('image_url', 'reference_name', 'description')
+
+
+class FacilityRecord(Record):
+    __slots__ = ('facility_id', 'facility_name')
+
+
+class OfferRecord(Record):
+    __slots__ = ('offer_id', 'description', 'start_date', 'end_date', 'discount')
+
+
+# --- Catalog Snapshot ---
+# Every hotel with its card, rooms (with their images), facilities and
+# offers, indexed by hotel id. Built in six queries and swapped in whole
+# by catalog_index() when the catalog version moves.
+class CatalogSnapshot:
+    __slots__ = ('hotels', 'rooms', 'facilities', 'offers')
+
+    def __init__(self, hotels, cards, rooms, images, facilities, offers):
+        images_by_room = {}
+        for hotel_id, room_number, *image in images:
+            images_by_room.setdefault((hotel_id, room_number), []).append(ImageRecord(*image))
+
+        cards_by_hotel = {hotel_id: CardRecord(*card) for hotel_id, *card in cards}
+        self.hotels = {row[0]: HotelRecord(*row, cards_by_hotel.get(row[0])) for row in hotels}
+
+        self.rooms = group_by_hotel(
+            (row[0], RoomRecord(*row, tuple(images_by_room.get((row[0], row[1]), ())))) for row in rooms
+        )
+        self.facilities = group_by_hotel((hotel_id, FacilityRecord(*row)) for hotel_id, *row in facilities)
+        self.offers = group_by_hotel((hotel_id, OfferRecord(*row)) for hotel_id, *row in offers)
+
+    def hotel(self, hotel_id):
+        return self.hotels.get(hotel_id)
+
+    def hotels_in_order(self, hotel_ids):
+        return [self.hotels[hotel_id] for hotel_id in hotel_ids if hotel_id in self.hotels]
+
+    def rooms_for(self, hotel_id):
+        return self.rooms.get(hotel_id, ())
+
+    def facilities_for(self, hotel_id):
+        return self.facilities.get(hotel_id, ())
+
+    def offers_for(self, hotel_id):
+        return self.offers.get(hotel_id, ())
+
+
+def group_by_hotel(pairs):
+    # (hotel_id, record) pairs -> {hotel_id: (record, ...)}
+    grouped = {}
+    for hotel_id, record in pairs:
+        grouped.setdefault(hotel_id, []).append(record)
+    return {hotel_id: tuple(records) for hotel_id, records in grouped.items()}
+
+
+def build_catalog_snapshot():
+    return CatalogSnapshot(
+        hotels=Hotel.objects.values_list(*HotelRecord.__slots__[:-1]).iterator(),
+        cards=HotelCard.objects.values_list('hotel_id', *CardRecord.__slots__).iterator(),
+        rooms=Room.objects.order_by('hotel_id', 'room_number').values_list(*RoomRecord.__slots__[:-1]).iterator(),
+        images=RoomImage.objects.order_by('hotel_id', 'room_number', 'image_url').values_list(
+            'hotel_id', 'room_number', *ImageRecord.__slots__
+        ).iterator(),
+        facilities=Facility.objects.order_by('pk').values_list('hotel_id', *FacilityRecord.__slots__).iterator(),
+        offers=Offer.objects.order_by('start_date', 'pk').values_list('hotel_id', *OfferRecord.__slots__).iterator(),
+    )
+
+
+def catalog_snapshot():
+    # One snapshot per worker, rebuilt when the catalog version moves
+    return catalog_index('snapshot', build_catalog_snapshot)
+
+
+# --- Review Stats ---
+# The cards' review columns, kept out of the snapshot: they change with
+# every review and are rebuilt on their own version (catalog.REVIEW_STATS).
+def build_review_stats():
+    return {
+        hotel_id: ReviewStatsRecord(*row)
+        for hotel_id, *row in HotelCard.objects.values_list('hotel_id', *ReviewStatsRecord.__slots__).iterator()
+    }
+
+
+def review_stats():
+    return catalog_index('review-stats', build_review_stats, stamp=REVIEW_STATS)
@@ -0,0 +1,141 @@
+import heapq
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import ArchivedBooking, ArchivedPayment, Booking, CustomerSummary, Payment, PaymentAdjustment
+from .sharding import booking_shards
+
+# How many summary rows the rebuild writes per INSERT
+REBUILD_BATCH_SIZE = 1000
+
+
+# --- Building a Summary from Booking Rows ---
+def add_booking(summary, checkin, checkout, status):
+    summary.total_bookings += 1
+    if status == 'Cancelled':
+        summary.cancelled_bookings += 1
+        return
+
+    if checkin and checkout:
+        summary.total_nights += (checkout - checkin).days
+
+    # The latest checkout, upcoming stays included: the row isn't refreshed
+    # when a date passes, so CustomerSummary.past_stay compares it with today
+    if checkout and (summary.last_stay is None or checkout > summary.last_stay):
+        summary.last_stay = checkout
+
+
+def empty_summary(cust_id):
+    return CustomerSummary(
+        cust_id=cust_id,
+        total_bookings=0,
+        cancelled_bookings=0,
+        total_nights=0,
+        total_spend=Decimal('0'),
+        last_stay=None,
+    )
+
+
+def completed_payments():
+    return Payment.objects.exclude(status='Cancelled')
+
+
+def archived_completed_payments():
+    return ArchivedPayment.objects.exclude(status='Cancelled')
+
+
+def completed_adjustments():
+    # Changes to what was charged after booking (edited dates); the archive
+    # already holds the adjusted amounts
+    return PaymentAdjustment.objects.exclude(payment__status='Cancelled')
+
+
+# --- Incremental Refresh (one customer) ---
+def refresh_customer_summary(cust_id):
+    # Only touches this customer's rows, which are found through the Cust_ID index.
+    # The customer may have stayed at hotels on every booking shard.
+    summary = empty_summary(cust_id)
+    spend = Decimal('0')
+
+    for alias in booking_shards():
+        # Archived stays still count towards the customer's history
+        for model in (Booking, ArchivedBooking):
+            bookings = model.objects.using(alias).filter(cust_id=cust_id).values_list('checkin', 'checkout', 'status')
+            for checkin, checkout, status in bookings:
+                add_booking(summary, checkin, checkout, status)
+
+        for payments in (completed_payments(), archived_completed_payments(), completed_adjustments()):
+            total = payments.using(alias).filter(booking__cust_id=cust_id).aggregate(total=Sum('amount'))['total']
+            spend += total or Decimal('0')
+
+    if not summary.total_bookings:
+        CustomerSummary.objects.filter(cust_id=cust_id).delete()
+        return None
+
+    summary.total_spend = spend
+    summary.save()
+    return summary
+
+
+def schedule_summary_refresh(cust_id, using='default'):
+    # Run after the surrounding transaction commits so we read the final rows.
+    # using is the database the change is written to: a booking's shard
+    # commits on its own, and may still roll back after the signal.
+    if cust_id:
+        transaction.on_commit(lambda: refresh_customer_summary(cust_id), using=using)
+
+
+# --- Full Rebuild ---
+def rebuild_customer_summaries(batch_size=REBUILD_BATCH_SIZE):
+    # 1. One grouped query per table and shard for spend per customer
+    spend_by_customer = {}
+    for alias in booking_shards():
+        for payments in (completed_payments(), archived_completed_payments(), completed_adjustments()):
+            totals = (
+                payments.using(alias).filter(booking__cust_id__isnull=False)
+                .values_list('booking__cust_id')
+                .annotate(total=Sum('amount'))
+                .order_by()
+            )
+            for cust_id, total in totals:
+                spend_by_customer[cust_id] = spend_by_customer.get(cust_id, Decimal('0')) + (total or Decimal('0'))
+
+    # 2. Stream bookings (live and archived, on every shard, merged) ordered by customer,
+    # emitting one summary per customer
+    def summaries():
+        current = None
+        rows = heapq.merge(*(
+            model.objects.using(alias).filter(cust_id__isnull=False)
+            .order_by('cust_id')
+            .values_list('cust_id', 'checkin', 'checkout', 'status')
+            .iterator(chunk_size=batch_size)
+            for alias in booking_shards()
+            for model in (Booking, ArchivedBooking)
+        ), key=lambda row: row[0])
+        for cust_id, checkin, checkout, status in rows:
+            if current is None or current.cust_id != cust_id:
+                if current is not None:
+                    yield current
+                current = empty_summary(cust_id)
+                current.total_spend = spend_by_customer.get(cust_id) or Decimal('0')
+            add_booking(current, checkin, checkout, status)
+        if current is not None:
+            yield current
+
+    # 3. Swap the table contents in one transaction
+    written = 0
+    with transaction.atomic():
+        CustomerSummary.objects.all().delete()
+        batch = []
+        for summary in summaries():
+            batch.append(summary)
+            if len(batch) >= batch_size:
+                CustomerSummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            CustomerSummary.objects.bulk_create(batch)
+            written += len(batch)
+    return written
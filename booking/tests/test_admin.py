@@ -0,0 +1,54 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.admin import helpers
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.admin import ESTIMATED_COUNT_THRESHOLD, EstimatedCountPaginator
+from booking.models import Booking, Customer
+
+from .base import BookingTestCase, day
+
+
+# --- Estimated Counts for Big Tables ---
+class EstimatedCountTests(BookingTestCase):
+    def test_unfiltered_changelist_uses_the_estimate(self):
+        estimate = ESTIMATED_COUNT_THRESHOLD + 1
+        with mock.patch('booking.admin.estimated_row_count', return_value=estimate):
+            self.assertEqual(EstimatedCountPaginator(Booking.objects.order_by('pk'), 50).count, estimate)
+
+    def test_filtered_changelist_counts_exactly(self):
+        self.book(day(10), day(12))
+        with mock.patch('booking.admin.estimated_row_count', return_value=ESTIMATED_COUNT_THRESHOLD + 1):
+            self.assertEqual(EstimatedCountPaginator(Booking.objects.filter(status='Confirmed').order_by('pk'), 50).count, 1)
+
+    def test_small_tables_count_exactly(self):
+        self.book(day(10), day(12))
+        with mock.patch('booking.admin.estimated_row_count', return_value=10):
+            self.assertEqual(EstimatedCountPaginator(Booking.objects.order_by('pk'), 50).count, 1)
+
+
+@override_settings(THROTTLE_RATES={})
+class AdminPageTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        staff = Customer.objects.create_superuser('staff@example.com', 'pw12345!x', first_name='S', last_name='T')
+        self.client.force_login(staff)
+
+    def test_big_table_changelists_load(self):
+        self.book(day(10), day(12), amount=Decimal('200.00'))
+        for model in ('booking', 'payment', 'customersummary'):
+            response = self.client.get(reverse(f'admin:booking_{model}_changelist'))
+            self.assertEqual(response.status_code, 200, model)
+
+    def test_export_selected_bookings_as_csv(self):
+        booking = self.book(day(10), day(12))
+        response = self.client.post(reverse('admin:booking_booking_changelist'), {
+            'action': 'export_as_csv',
+            helpers.ACTION_CHECKBOX_NAME: [booking.pk],
+        })
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'booking_id,cust__email,hotel_id,room_number,bookingdate,checkin,checkout,status')
+        self.assertEqual(lines[1].split(',')[:2], [str(booking.pk), 'guest@example.com'])
+        self.assertEqual(len(lines), 2)
@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from booking.amendments import amend_stay
+from booking.ledger import RoomNotAvailable
+from booking.models import PaymentAdjustment, RoomNight
+
+from .base import BookingTestCase, day
+
+
+# --- Changing a Booking's Dates ---
+class AmendmentTests(BookingTestCase):
+    def test_shortening_refunds_average_paid_rate(self):
+        booking = self.book(day(10), day(14), amount=Decimal('360.00'))
+        adjustment = amend_stay(booking, self.room, day(10), day(12))
+
+        self.assertEqual(adjustment.amount, Decimal('-180.00'))
+        self.assertEqual((adjustment.previous_checkin, adjustment.previous_checkout), (day(10), day(14)))
+        self.assertEqual((adjustment.checkin, adjustment.checkout), (day(10), day(12)))
+        self.assertEqual(RoomNight.objects.filter(booking_id=booking.pk).count(), 2)
+
+    def test_extending_charges_added_nights(self):
+        booking = self.book(day(10), day(12), amount=Decimal('200.00'))
+        adjustment = amend_stay(booking, self.room, day(10), day(13))
+
+        self.assertEqual(adjustment.amount, Decimal('100.00'))
+        payment = booking.payment_set.get()
+        self.assertEqual(payment.amount, Decimal('200.00'))
+        self.assertEqual(payment.total_amount, Decimal('300.00'))
+
+    def test_moving_into_a_booked_night_is_rejected(self):
+        booking = self.book(day(10), day(12), amount=Decimal('200.00'))
+        self.book(day(12), day(14))
+        with self.assertRaises(RoomNotAvailable):
+            amend_stay(booking, self.room, day(10), day(13))
+        self.assertFalse(PaymentAdjustment.objects.exists())
+
+    def test_same_dates_write_no_adjustment(self):
+        booking = self.book(day(10), day(12), amount=Decimal('200.00'))
+        self.assertIsNone(amend_stay(booking, self.room, day(10), day(12)))
+
+
+class MyBookingsTests(BookingTestCase):
+    def queries_for_my_bookings(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('my-bookings'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_shows_the_adjusted_total(self):
+        booking = self.book(day(10), day(12), amount=Decimal('200.00'))
+        amend_stay(booking, self.room, day(10), day(13))
+        self.client.force_login(self.customer)
+        self.assertContains(self.client.get(reverse('my-bookings')), '300.00')
+
+    def test_query_count_does_not_grow_with_bookings(self):
+        self.client.force_login(self.customer)
+        self.book(day(10), day(12), amount=Decimal('200.00'))
+        one = self.queries_for_my_bookings()
+        self.book(day(20), day(22), amount=Decimal('200.00'))
+        self.book(day(30), day(32), amount=Decimal('200.00'))
+        self.assertEqual(self.queries_for_my_bookings(), one)
@@ -0,0 +1,63 @@
+from django.http import QueryDict
+
+from booking.amenities import AmenityIndex, amenity_index, amenity_mask, normalize_facility
+from booking.models import Facility, Hotel
+from booking.search import facet_counts, filter_hotels, search_params
+
+from .base import BookingTestCase
+
+
+# --- Amenity Index ---
+class AmenityIndexTests(BookingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.oberoi = Hotel.objects.create(name='Oberoi', city='Mumbai', state='Maharashtra', rating=4.0)
+        cls.leela = Hotel.objects.create(name='Leela', city='Pune', state='Maharashtra', rating=3.2)
+        for hotel, names in (
+            (cls.hotel, ['Swimming Pool', 'Spa & Wellness', 'Free Wi-Fi']),
+            (cls.oberoi, ['Rooftop pool', 'Valet Parking']),
+            (cls.leela, ['Spa', 'Karaoke']),
+        ):
+            for name in names:
+                Facility.objects.create(hotel=hotel, facility_name=name)
+
+    def names(self, query):
+        return list(filter_hotels(search_params(QueryDict(query))).values_list('name', flat=True))
+
+    def test_normalize_facility(self):
+        self.assertEqual(normalize_facility('Free Wi-Fi!'), 'wifi')
+        self.assertEqual(normalize_facility('Rooftop pool'), 'pool')
+        self.assertEqual(normalize_facility('Barbecue'), None)
+        self.assertEqual(normalize_facility(None), None)
+
+    def test_matching_all_and_any(self):
+        index = AmenityIndex([(1, 'Pool'), (1, 'Gym'), (2, 'Pool'), (3, 'Gym'), (None, 'Pool')])
+        mask = amenity_mask(['pool', 'gym'])
+        self.assertEqual(index.matching(mask), [1])
+        self.assertEqual(index.matching(mask, match_all=False), [1, 2, 3])
+
+    def test_counts(self):
+        counts = dict(amenity_index().counts())
+        self.assertEqual((counts['pool'], counts['spa'], counts['wifi'], counts['gym']), (2, 2, 1, 0))
+        counts = dict(amenity_index().counts([self.oberoi.pk]))
+        self.assertEqual((counts['pool'], counts['parking'], counts['spa']), (1, 1, 0))
+
+    def test_search_filter(self):
+        self.assertEqual(self.names('amenity=pool&amenity=spa'), ['Taj Palace'])
+        self.assertEqual(self.names('amenity=pool&amenity=spa&amenity_mode=any'), ['Leela', 'Oberoi', 'Taj Palace'])
+        self.assertEqual(self.names('amenity=unknown'), ['Leela', 'Oberoi', 'Taj Palace'])
+
+    def test_facet_counts_follow_the_match_mode(self):
+        # 'all': each count is what adding that amenity would leave
+        counts = dict(facet_counts(search_params(QueryDict('amenity=pool')))['amenity'])
+        self.assertEqual((counts['pool'], counts['spa'], counts['parking']), (2, 1, 1))
+        # 'any': counted as if no amenity were picked, since each one widens
+        counts = dict(facet_counts(search_params(QueryDict('amenity=pool&amenity_mode=any')))['amenity'])
+        self.assertEqual((counts['pool'], counts['spa'], counts['parking']), (2, 2, 1))
+
+    def test_index_is_rebuilt_when_the_catalog_changes(self):
+        self.assertEqual(dict(amenity_index().counts())['gym'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Facility.objects.create(hotel=self.leela, facility_name='Fitness Centre')
+        self.assertEqual(dict(amenity_index().counts())['gym'], 1)
@@ -0,0 +1,57 @@
+import datetime
+from decimal import Decimal
+
+from django.urls import reverse
+
+from booking.amendments import amend_stay
+from booking.archive import archive_bookings, archive_cutoff
+from booking.models import (
+    ArchivedBooking, ArchivedCancellation, ArchivedPayment, Booking, Cancellation, Payment, PaymentAdjustment, RoomNight
+)
+from booking.summaries import refresh_customer_summary
+
+from .base import BookingTestCase, day
+
+
+# --- Booking Archive ---
+class ArchiveTests(BookingTestCase):
+    def test_archive_cutoff(self):
+        self.assertEqual(archive_cutoff(12, today=datetime.date(2025, 3, 15)), datetime.date(2024, 3, 1))
+        self.assertEqual(archive_cutoff(3, today=datetime.date(2025, 1, 31)), datetime.date(2024, 10, 1))
+
+    def test_moves_old_bookings_with_their_rows(self):
+        old = self.book(day(-500), day(-497), amount=Decimal('300.00'))
+        amend_stay(old, self.room, day(-500), day(-498))
+        cancelled = self.book(day(-400), day(-399))
+        Cancellation.objects.create(booking=cancelled, cancel_date=day(-401), reason='Plans changed')
+        recent = self.book(day(10), day(12), amount=Decimal('200.00'))
+
+        stats = archive_bookings(batch_size=1)
+        self.assertEqual((stats['bookings'], stats['payments'], stats['cancellations']), (2, 1, 1))
+
+        self.assertEqual(list(Booking.objects.values_list('pk', flat=True)), [recent.pk])
+        self.assertEqual(list(Payment.objects.values_list('booking_id', flat=True)), [recent.pk])
+        self.assertFalse(PaymentAdjustment.objects.exists())
+        self.assertFalse(RoomNight.objects.filter(booking_id__in=[old.pk, cancelled.pk]).exists())
+
+        self.assertEqual(sorted(ArchivedBooking.objects.values_list('pk', flat=True)), [old.pk, cancelled.pk])
+        # The archived payment carries the refund for the shortened stay
+        self.assertEqual(ArchivedPayment.objects.get().amount, Decimal('200.00'))
+        self.assertEqual(ArchivedCancellation.objects.get().reason, 'Plans changed')
+
+    def test_dry_run_only_counts(self):
+        self.book(day(-500), day(-497))
+        self.assertEqual(archive_bookings(dry_run=True)['bookings'], 1)
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertFalse(ArchivedBooking.objects.exists())
+
+    def test_archived_stays_still_count_and_show_on_request(self):
+        self.book(day(-500), day(-497), amount=Decimal('300.00'))
+        archive_bookings()
+        summary = refresh_customer_summary(self.customer.pk)
+        self.assertEqual((summary.total_bookings, summary.total_spend), (1, Decimal('300.00')))
+
+        self.client.force_login(self.customer)
+        self.assertIsNone(self.client.get(reverse('my-bookings')).context['archived_bookings'])
+        response = self.client.get(reverse('my-bookings'), {'history': '1'})
+        self.assertEqual(len(response.context['archived_bookings']), 1)
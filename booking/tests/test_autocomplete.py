@@ -0,0 +1,53 @@
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.autocomplete import PrefixIndex, normalize
+
+from .base import BookingTestCase
+
+
+def labels(suggestions):
+    return [(suggestion['type'], suggestion['label']) for suggestion in suggestions]
+
+
+# --- Autocomplete ---
+class PrefixIndexTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.index = PrefixIndex([
+            (1, 'Taj Palace', 'Mumbai', 'Maharashtra'),
+            (2, 'Palace Inn', 'Mumbai', 'Maharashtra'),
+            (3, 'Marine Plaza', 'Mumbai', 'Maharashtra'),
+            (4, 'Hotel Amsterdam', 'Amsterdam', 'North Holland'),
+            (5, 'Amstel Hotel', 'Amsterdam', 'North Holland'),
+        ] + [(10 + i, f'Amstelveen Suites {i}', 'Amstelveen', 'North Holland') for i in range(250)])
+
+    def test_normalize(self):
+        self.assertEqual(normalize('  Taj   Palace, Mumbai! '), 'taj palace mumbai')
+
+    def test_matches_any_word_of_a_name(self):
+        self.assertEqual(labels(self.index.lookup('pala')), [('hotel', 'Palace Inn'), ('hotel', 'Taj Palace')])
+
+    def test_cities_and_states_come_first(self):
+        self.assertEqual(labels(self.index.lookup('m', limit=3)), [
+            ('city', 'Mumbai'), ('state', 'Maharashtra'), ('hotel', 'Marine Plaza'),
+        ])
+
+    def test_every_prefix_match_is_ranked(self):
+        # Every Amstelveen hotel's key sorts before the Amsterdam city's
+        self.assertEqual(labels(self.index.lookup('amst', limit=2)), [('city', 'Amstelveen'), ('city', 'Amsterdam')])
+        self.assertEqual(labels(self.index.lookup('ams', limit=2)), [('city', 'Amstelveen'), ('city', 'Amsterdam')])
+
+    def test_limit_and_blank_queries(self):
+        self.assertEqual(len(self.index.lookup('am', limit=100)), 20)
+        self.assertEqual(self.index.lookup('  '), [])
+        self.assertEqual(self.index.lookup('zzz'), [])
+
+
+@override_settings(THROTTLE_RATES={})
+class AutocompleteViewTests(BookingTestCase):
+    def test_suggests_from_the_catalog(self):
+        response = self.client.get(reverse('hotel-autocomplete'), {'q': 'taj', 'limit': 'x'})
+        suggestion = response.json()['suggestions'][0]
+        self.assertEqual((suggestion['type'], suggestion['label']), ('hotel', 'Taj Palace'))
+        self.assertEqual(suggestion['url'], reverse('hotel-detail', args=[self.hotel.pk]))
@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.backends import CachedCustomerBackend, customer_cache_key, customer_from_snapshot, customer_snapshot
+from booking.models import Customer
+
+from .base import BookingTestCase
+
+BACKEND = 'booking.backends.CachedCustomerBackend'
+
+
+# --- Cached Logins ---
+class CachedCustomerBackendTests(BookingTestCase):
+    def test_snapshot_round_trip(self):
+        customer = customer_from_snapshot(customer_snapshot(self.customer))
+        self.assertEqual((customer.pk, customer.email, customer.password), (
+            self.customer.pk, self.customer.email, self.customer.password
+        ))
+        self.assertFalse(customer._state.adding)
+
+    def test_second_lookup_skips_the_database(self):
+        backend = CachedCustomerBackend()
+        self.assertEqual(backend.get_user(self.customer.pk), self.customer)
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.customer.pk).email, 'guest@example.com')
+
+    def test_saving_the_customer_drops_the_entry(self):
+        CachedCustomerBackend().get_user(self.customer.pk)
+        self.customer.first_name = 'Changed'
+        self.customer.save()
+        self.assertIsNone(cache.get(customer_cache_key(self.customer.pk)))
+        self.assertEqual(CachedCustomerBackend().get_user(self.customer.pk).first_name, 'Changed')
+
+    def test_inactive_cached_customer_is_refused(self):
+        backend = CachedCustomerBackend()
+        backend.get_user(self.customer.pk)
+        snapshot = cache.get(customer_cache_key(self.customer.pk))
+        cache.set(customer_cache_key(self.customer.pk), dict(snapshot, is_active=False))
+        self.assertIsNone(backend.get_user(self.customer.pk))
+
+
+@override_settings(AUTHENTICATION_BACKENDS=[BACKEND], THROTTLE_RATES={})
+class CachedSessionTests(BookingTestCase):
+    def test_password_change_logs_out_other_sessions(self):
+        self.client.force_login(self.customer, backend=BACKEND)
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+
+        customer = Customer.objects.get(pk=self.customer.pk)
+        customer.set_password('new-pw12345!x')
+        customer.save()
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 302)
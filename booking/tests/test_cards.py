@@ -0,0 +1,66 @@
+import datetime
+from decimal import Decimal
+
+from django.http import QueryDict
+
+from booking.cards import rebuild_hotel_cards, refresh_hotel_card
+from booking.catalog import CATALOG, REVIEW_STATS, catalog_version
+from booking.models import Hotel, HotelCard, Review, Room
+from booking.search import filter_hotels, search_params
+
+from .base import BookingTestCase
+
+
+# --- Hotel Cards ---
+class HotelCardTests(BookingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Room.objects.create(
+            hotel=cls.hotel, room_number='102', roomtype='Suite', capacity=4, price=Decimal('250.00'), availability=True
+        )
+        cls.oberoi = Hotel.objects.create(name='Oberoi', city='Mumbai', state='Maharashtra', rating=4.0)
+        Room.objects.create(
+            hotel=cls.oberoi, room_number='1', roomtype='Deluxe', capacity=2, price=Decimal('150.00'), availability=True
+        )
+
+    def setUp(self):
+        super().setUp()
+        rebuild_hotel_cards()
+
+    def names(self, query):
+        return list(filter_hotels(search_params(QueryDict(query))).values_list('name', flat=True))
+
+    def test_rebuild_summarises_rooms(self):
+        card = HotelCard.objects.get(hotel=self.hotel)
+        self.assertEqual((card.min_price, card.max_price), (Decimal('100.00'), Decimal('250.00')))
+        self.assertEqual((card.max_capacity, card.room_count, card.review_count), (4, 2, 0))
+
+    def test_price_and_guest_filters_and_sorts_use_the_cards(self):
+        self.assertEqual(self.names('min_price=200'), ['Taj Palace'])
+        self.assertEqual(self.names('max_price=120'), ['Taj Palace'])
+        self.assertEqual(self.names('guests=3'), ['Taj Palace'])
+        self.assertEqual(self.names('sort=price_asc'), ['Taj Palace', 'Oberoi'])
+        self.assertEqual(self.names('sort=price_desc'), ['Taj Palace', 'Oberoi'])
+
+    def test_room_change_refreshes_the_card_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.filter(hotel=self.oberoi).get().delete()
+        card = HotelCard.objects.get(hotel=self.oberoi)
+        self.assertEqual((card.min_price, card.room_count), (None, 0))
+
+    def test_review_only_moves_the_review_version(self):
+        catalog, reviews = catalog_version(CATALOG), catalog_version(REVIEW_STATS)
+        Review.objects.create(hotel=self.oberoi, cust=self.customer, rating=5, comment='Great', date=datetime.date.today())
+        card = refresh_hotel_card(self.oberoi.pk)
+
+        self.assertEqual((card.review_count, card.review_average), (1, 5))
+        self.assertEqual(catalog_version(CATALOG), catalog)
+        self.assertEqual(catalog_version(REVIEW_STATS), reviews + 1)
+        self.assertEqual(self.names('sort=reviews'), ['Oberoi', 'Taj Palace'])
+
+    def test_deleted_hotel_loses_its_card(self):
+        hotel_id = self.oberoi.pk
+        Hotel.objects.filter(pk=hotel_id).delete()
+        self.assertIsNone(refresh_hotel_card(hotel_id))
+        self.assertFalse(HotelCard.objects.filter(hotel_id=hotel_id).exists())
@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.deletion import pending_deletions, process_account_deletion, request_account_deletion
+from booking.models import AccountDeletion, Booking, Cancellation, Customer, Payment, Review, RoomNight
+
+from .base import BookingTestCase, day
+
+
+# --- Account Deletion ---
+@override_settings(THROTTLE_RATES={})
+class AccountDeletionTests(BookingTestCase):
+    def test_request_closes_the_account_at_once(self):
+        self.client.force_login(self.customer)
+        response = self.client.post(reverse('delete-profile'))
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+
+        customer = Customer.objects.get(pk=self.customer.pk)
+        self.assertFalse(customer.is_active)
+        self.assertFalse(customer.has_usable_password())
+        self.assertEqual(customer.email, f'deleted-{customer.pk}@deleted.invalid')
+        self.assertIsNone(customer.first_name)
+        self.assertEqual(list(pending_deletions().values_list('cust_id', flat=True)), [customer.pk])
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_worker_cancels_detaches_and_removes(self):
+        past = self.book(day(-10), day(-8), amount=Decimal('200.00'))
+        upcoming = self.book(day(10), day(12), amount=Decimal('200.00'))
+        later = self.book(day(20), day(22))
+        review = Review.objects.create(hotel=self.hotel, cust=self.customer, rating=4, comment='Nice', date=day(-8))
+
+        job = request_account_deletion(self.customer)
+        self.assertGreater(process_account_deletion(job, batch_size=1), 0)
+
+        self.assertEqual(job.stage, 'done')
+        self.assertIsNotNone(job.completed_at)
+        self.assertFalse(Customer.objects.filter(pk=self.customer.pk).exists())
+
+        statuses = dict(Booking.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {past.pk: 'Confirmed', upcoming.pk: 'Cancelled', later.pk: 'Cancelled'})
+        self.assertFalse(Booking.objects.filter(cust_id__isnull=False).exists())
+        self.assertEqual(Payment.objects.get(booking=upcoming).status, 'Cancelled')
+        self.assertEqual(Payment.objects.get(booking=past).status, 'Completed')
+        self.assertEqual(Cancellation.objects.count(), 2)
+        self.assertFalse(RoomNight.objects.filter(booking_id__in=[upcoming.pk, later.pk]).exists())
+        self.assertIsNone(Review.objects.get(pk=review.pk).cust_id)
+
+    def test_interrupted_job_resumes_at_its_stage(self):
+        upcoming = self.book(day(10), day(12))
+        job = request_account_deletion(self.customer)
+        AccountDeletion.objects.filter(pk=job.pk).update(stage='detach')
+        job.refresh_from_db()
+
+        process_account_deletion(job)
+        # The cancel stage was already done, so it isn't run again
+        self.assertEqual(Booking.objects.get(pk=upcoming.pk).status, 'Confirmed')
+        self.assertFalse(pending_deletions().exists())
@@ -0,0 +1,61 @@
+import json
+from decimal import Decimal
+
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.exports import queryset_rows
+from booking.models import Booking, Customer
+
+from .base import BookingTestCase, day
+
+
+# --- Staff Exports ---
+class QuerysetRowsTests(BookingTestCase):
+    def test_walks_every_row_in_chunks(self):
+        bookings = [self.book(day(offset), day(offset + 1)) for offset in range(10, 15)]
+        rows = list(queryset_rows(Booking.objects.all(), ('checkin',), chunk_size=2))
+        self.assertEqual(rows, [(booking.checkin,) for booking in bookings])
+
+
+@override_settings(THROTTLE_RATES={})
+class ExportViewTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.staff = Customer.objects.create_user(
+            'staff@example.com', 'pw12345!x', first_name='S', last_name='T', is_staff=True
+        )
+        self.first = self.book(day(10), day(12), amount=Decimal('200.00'))
+        self.second = self.book(day(20), day(22))
+
+    def export(self, kind, fmt, **params):
+        response = self.client.get(reverse('export-data', args=[kind, fmt]), params)
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_bookings_csv_with_hotel_name(self):
+        self.client.force_login(self.staff)
+        lines = self.export('bookings', 'csv')
+        self.assertTrue(lines[0].startswith('booking_id,bookingdate,checkin'))
+        self.assertEqual(len(lines), 3)
+        self.assertIn('Taj Palace', lines[1])
+
+    def test_date_range_filters_on_the_export_date(self):
+        self.client.force_login(self.staff)
+        lines = self.export('bookings', 'jsonl', start=day(15).isoformat())
+        self.assertEqual([json.loads(line)['booking_id'] for line in lines], [self.second.pk])
+
+    def test_payments_jsonl(self):
+        self.client.force_login(self.staff)
+        row = json.loads(self.export('payments', 'jsonl')[0])
+        self.assertEqual((row['booking_id'], row['amount'], row['hotel_name']), (self.first.pk, '200.00', 'Taj Palace'))
+
+    def test_bad_requests(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse('export-data', args=['rooms', 'csv'])).status_code, 404)
+        response = self.client.get(reverse('export-data', args=['bookings', 'csv']), {'start': 'soon'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_staff_only(self):
+        self.client.force_login(self.customer)
+        response = self.client.get(reverse('export-data', args=['bookings', 'csv']))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.frontdesk import front_desk_bookings, front_desk_counts
+from booking.models import Customer, CustomerPhone, Room
+
+from .base import BookingTestCase, day
+
+
+# --- Front Desk ---
+@override_settings(THROTTLE_RATES={})
+class FrontDeskTests(BookingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.rooms = [
+            Room.objects.create(
+                hotel=cls.hotel, room_number=number, roomtype='Deluxe', capacity=2, price=Decimal('100.00'), availability=True
+            )
+            for number in ('102', '103', '104')
+        ]
+        CustomerPhone.objects.create(cust=cls.customer, phone_number='+15551234567', is_primary=True)
+
+    def setUp(self):
+        super().setUp()
+        self.arriving = self.book(day(0), day(2))
+        self.leaving = self.book(day(-2), day(0), room=self.rooms[0])
+        self.staying = self.book(day(-1), day(1), room=self.rooms[1])
+        cancelled = self.book(day(0), day(1), room=self.rooms[2])
+        cancelled.status = 'Cancelled'
+        cancelled.save()
+
+    def test_lists(self):
+        self.assertEqual(front_desk_counts(self.hotel.pk, day(0)), {'arrivals': 1, 'departures': 1, 'in_house': 1})
+        for kind, booking in (('arrivals', self.arriving), ('departures', self.leaving), ('in_house', self.staying)):
+            self.assertEqual([b.pk for b in front_desk_bookings(self.hotel.pk, day(0), kind)], [booking.pk])
+
+    def test_rows_carry_the_guest_and_primary_phone(self):
+        booking = front_desk_bookings(self.hotel.pk, day(0), 'arrivals').get()
+        self.assertEqual((booking.cust.email, booking.primary_phone), ('guest@example.com', '+15551234567'))
+
+    def test_dashboard_and_export(self):
+        staff = Customer.objects.create_user(
+            'staff@example.com', 'pw12345!x', first_name='S', last_name='T', is_staff=True
+        )
+        self.client.force_login(staff)
+        url = reverse('front-desk', args=[self.hotel.pk])
+        response = self.client.get(url, {'list': 'departures'})
+        self.assertEqual(response.context['tabs'], [
+            ('arrivals', 'Arrivals', 1), ('departures', 'Departures', 1), ('in_house', 'Staying Over', 1),
+        ])
+        self.assertEqual([b.pk for b in response.context['page_obj']], [self.leaving.pk])
+        self.assertEqual(self.client.get(url, {'date': 'today'}).status_code, 400)
+
+        response = self.client.get(reverse('front-desk-export', args=[self.hotel.pk]), {'list': 'in_house'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'Room,Booking ID,First Name,Last Name,Email,Phone,Check-in,Check-out,Status')
+        self.assertEqual(lines[1].split(',')[:2], ['103', str(self.staying.pk)])
+        self.assertEqual(len(lines), 2)
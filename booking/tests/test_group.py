@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+from booking.group import create_group_booking
+from booking.ledger import RoomNotAvailable
+from booking.models import Booking, OutboxEvent, Payment, Room, RoomNight
+
+from .base import BookingTestCase, day
+
+
+# --- Group Booking ---
+class GroupBookingTests(BookingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.suite = Room.objects.create(
+            hotel=cls.hotel, room_number='102', roomtype='Suite', capacity=4, price=Decimal('250.00'), availability=True
+        )
+
+    def group(self, checkin, checkout):
+        amounts = {'101': Decimal('200.00'), '102': Decimal('500.00')}
+        return create_group_booking(self.customer, self.hotel.pk, amounts, checkin, checkout, day(0))
+
+    def test_books_every_room_with_its_payment_and_nights(self):
+        bookings = self.group(day(10), day(12))
+        self.assertEqual([booking.room_number for booking in bookings], ['101', '102'])
+        self.assertTrue(all(booking.pk for booking in bookings))
+        amounts = Payment.objects.order_by('booking__room_number').values_list('amount', flat=True)
+        self.assertEqual(list(amounts), [Decimal('200.00'), Decimal('500.00')])
+        self.assertEqual(RoomNight.objects.count(), 4)
+        self.assertEqual(OutboxEvent.objects.filter(model='booking').count(), 2)
+
+    def test_one_taken_room_books_nothing(self):
+        self.book(day(11), day(13), room=self.suite)
+        with self.assertRaises(RoomNotAvailable):
+            self.group(day(10), day(12))
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertFalse(Payment.objects.exists())
@@ -0,0 +1,64 @@
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.idempotency import PENDING, InvalidToken, claim_token, issue_token, record_outcome
+from booking.models import Booking, Payment
+
+from .base import BookingTestCase, day
+
+
+# --- Single-Use Confirmation Tokens ---
+class ConfirmationTokenTests(BookingTestCase):
+    def session(self):
+        session = SessionStore()
+        session.save()
+        return session
+
+    def test_claim_is_single_use(self):
+        session = self.session()
+        token = issue_token(session, 'stay')
+        self.assertIsNone(claim_token(session, token, 'stay'))
+        self.assertEqual(claim_token(session, token, 'stay', wait=0), PENDING)
+
+    def test_claim_returns_recorded_outcome(self):
+        session = self.session()
+        token = issue_token(session, 'stay')
+        claim_token(session, token, 'stay')
+        record_outcome(session, token, (25, 'Booked', '/my-bookings/'))
+        self.assertEqual(claim_token(session, token, 'stay', wait=0), (25, 'Booked', '/my-bookings/'))
+
+    def test_unknown_or_mismatched_token_is_invalid(self):
+        session = self.session()
+        token = issue_token(session, 'stay')
+        with self.assertRaises(InvalidToken):
+            claim_token(session, 'not-issued', 'stay')
+        with self.assertRaises(InvalidToken):
+            claim_token(session, token, 'another stay')
+
+
+@override_settings(THROTTLE_RATES={})
+class ConfirmationReplayTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.customer)
+        session = self.client.session
+        session['booking_checkin'] = day(10).isoformat()
+        session['booking_checkout'] = day(12).isoformat()
+        session.save()
+        self.url = reverse('payment-confirmation', args=[self.hotel.pk, self.room.room_number])
+
+    def test_replayed_confirmation_books_once(self):
+        token = self.client.get(self.url).context['confirmation_token']
+        first = self.client.post(self.url, {'confirmation_token': token})
+        second = self.client.post(self.url, {'confirmation_token': token})
+
+        self.assertRedirects(first, reverse('my-bookings'), fetch_redirect_response=False)
+        self.assertEqual(second.url, first.url)
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(Payment.objects.count(), 1)
+
+    def test_unissued_token_books_nothing(self):
+        response = self.client.post(self.url, {'confirmation_token': 'not-issued'})
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        self.assertFalse(Booking.objects.exists())
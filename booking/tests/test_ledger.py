@@ -0,0 +1,33 @@
+from booking.ledger import RoomNotAvailable, stay_changes
+from booking.models import RoomNight
+
+from .base import BookingTestCase, day
+
+
+# --- Room-Night Ledger ---
+class LedgerTests(BookingTestCase):
+    def test_booking_holds_its_nights(self):
+        booking = self.book(day(10), day(13))
+        nights = RoomNight.objects.filter(booking_id=booking.pk).values_list('night', flat=True)
+        self.assertEqual(sorted(nights), [day(10), day(11), day(12)])
+
+    def test_double_booking_raises_room_not_available(self):
+        self.book(day(10), day(13))
+        with self.assertRaises(RoomNotAvailable):
+            self.book(day(12), day(14))
+
+    def test_back_to_back_stays_are_allowed(self):
+        self.book(day(10), day(13))
+        self.book(day(13), day(15))
+        self.assertEqual(RoomNight.objects.count(), 5)
+
+    def test_cancelling_releases_the_nights(self):
+        booking = self.book(day(10), day(13))
+        booking.status = 'Cancelled'
+        booking.save()
+        self.book(day(10), day(13))
+
+    def test_stay_changes(self):
+        self.assertEqual(stay_changes(day(10), day(13), day(10), day(12)), ([], [day(12)]))
+        self.assertEqual(stay_changes(day(10), day(13), day(11), day(14)), ([day(13)], [day(10)]))
+        self.assertEqual(stay_changes(None, None, day(10), day(11)), ([day(10)], []))
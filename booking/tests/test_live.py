@@ -0,0 +1,98 @@
+import asyncio
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.live import (
+    SUBSCRIBER_QUEUE_SIZE, AvailabilityBroker, availability_events, booking_event, broker, room_event
+)
+
+from .base import BookingTestCase, day
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+# --- Live Availability ---
+class BrokerTests(BookingTestCase):
+    def test_subscribers_get_their_hotels_events(self):
+        broker = AvailabilityBroker()
+
+        async def scenario():
+            loop, queue = subscriber = broker.subscribe(1)
+            other = broker.subscribe(2)
+            broker.publish(1, {'room_number': '101'})
+            event = await queue.get()
+            self.assertTrue(other[1].empty())
+            broker.unsubscribe(1, subscriber)
+            broker.unsubscribe(2, other)
+            return event
+
+        self.assertEqual(run(scenario()), {'room_number': '101'})
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_slow_subscriber_is_told_to_reconnect(self):
+        broker = AvailabilityBroker()
+
+        async def scenario():
+            loop, queue = broker.subscribe(1)
+            for n in range(SUBSCRIBER_QUEUE_SIZE + 1):
+                broker.publish(1, {'n': n})
+            await asyncio.sleep(0)
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        events = run(scenario())
+        self.assertEqual(len(events), SUBSCRIBER_QUEUE_SIZE)
+        self.assertIsNone(events[-1])
+
+    def test_stream_sends_events_until_dropped(self):
+        async def scenario():
+            stream = availability_events(7)
+            messages = [await anext(stream), await anext(stream)]
+            broker.publish(7, room_event(7, '101', available=False))
+            messages.append(await anext(stream))
+            broker.publish(7, None)
+            messages.extend([message async for message in stream])
+            return messages
+
+        messages = run(scenario())
+        self.assertEqual(messages[0], 'retry: 5000\n\n')
+        self.assertTrue(messages[1].startswith('event: ready\n'))
+        self.assertTrue(messages[2].startswith('event: availability\ndata: {"hotel_id": 7, "room_number": "101"'))
+        self.assertEqual(len(messages), 3)
+        self.assertEqual(broker.subscriber_count(7), 0)
+
+
+class PublishingTests(BookingTestCase):
+    def test_booking_event(self):
+        booking = self.book(day(10), day(12))
+        self.assertFalse(booking_event(booking)['available'])
+        self.assertTrue(booking_event(booking, deleted=True)['available'])
+        booking.status = 'Cancelled'
+        self.assertTrue(booking_event(booking)['available'])
+
+    def test_bookings_publish_once_committed(self):
+        with mock.patch('booking.live.publish') as publish:
+            with self.captureOnCommitCallbacks() as callbacks:
+                self.book(day(10), day(12))
+            publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+        event = publish.call_args.args[1]
+        self.assertEqual((event['room_number'], event['checkin'], event['available']), ('101', day(10), False))
+
+
+class StreamViewTests(BookingTestCase):
+    @override_settings(LIVE_AVAILABILITY_ENABLED=False)
+    def test_off_without_asgi(self):
+        response = self.client.get(reverse('availability-stream', args=[self.hotel.pk]))
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(LIVE_AVAILABILITY_ENABLED=True, THROTTLE_RATES={})
+    def test_streams_known_hotels(self):
+        response = self.client.get(reverse('availability-stream', args=[self.hotel.pk]))
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'text/event-stream'))
+        response = self.client.get(reverse('availability-stream', args=[self.hotel.pk + 100]))
+        self.assertEqual(response.status_code, 404)
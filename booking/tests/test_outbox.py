@@ -0,0 +1,62 @@
+import datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+from booking.models import CustomerSummary, HotelCard, OutboxCheckpoint, OutboxEvent, Room
+from booking.outbox import CONSUMERS, consume, prune_events
+
+from .base import BookingTestCase, day
+
+
+# --- Transactional Outbox ---
+class OutboxTests(BookingTestCase):
+    def consume_all(self):
+        return {name: consume(name, settle_seconds=0) for name in CONSUMERS}
+
+    def test_saves_and_deletes_are_recorded(self):
+        booking = self.book(day(10), day(12))
+        event = OutboxEvent.objects.get(model='booking')
+        self.assertEqual((event.action, event.object_id), ('saved', str(booking.pk)))
+        self.assertEqual(event.payload['cust_id'], self.customer.pk)
+
+        booking.delete()
+        self.assertTrue(OutboxEvent.objects.filter(model='booking', action='deleted').exists())
+
+    def test_composite_keys(self):
+        room = Room.objects.create(
+            hotel=self.hotel, room_number='102', roomtype='Suite', capacity=4, price=Decimal('250.00'), availability=True
+        )
+        event = OutboxEvent.objects.filter(model='room').latest('id')
+        self.assertEqual(event.object_id, f'{self.hotel.pk}:{room.room_number}')
+
+    def test_consumers_catch_up_on_missed_callbacks(self):
+        # Nothing runs the on_commit callbacks here, as if the worker had died
+        self.book(day(-10), day(-8), amount=Decimal('200.00'))
+        self.assertFalse(CustomerSummary.objects.exists())
+
+        counts = self.consume_all()
+        self.assertTrue(all(counts.values()))
+        self.assertEqual(CustomerSummary.objects.get().total_spend, Decimal('200.00'))
+        self.assertEqual(HotelCard.objects.get(hotel=self.hotel).room_count, 1)
+
+        last = OutboxEvent.objects.latest('id').id
+        checkpoints = OutboxCheckpoint.objects.values_list('last_event_id', flat=True)
+        self.assertEqual(set(checkpoints), {last})
+        self.assertEqual(set(self.consume_all().values()), {0})
+
+    def test_recent_events_wait_to_settle(self):
+        self.book(day(10), day(12))
+        self.assertEqual(consume('customer-summaries'), 0)
+        self.assertFalse(CustomerSummary.objects.exists())
+
+    def test_prune_keeps_events_a_consumer_has_not_read(self):
+        self.book(day(10), day(12))
+        OutboxEvent.objects.update(created_at=timezone.now() - datetime.timedelta(days=10))
+        consume('customer-summaries', settle_seconds=0)
+        self.assertEqual(prune_events(7), 0)
+
+        self.consume_all()
+        events = OutboxEvent.objects.count()
+        self.assertEqual(prune_events(7), events)
+        self.assertFalse(OutboxEvent.objects.exists())
@@ -0,0 +1,73 @@
+from django.core.exceptions import ValidationError
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.models import Customer, CustomerPhone, PhoneIndex
+from booking.phones import backfill_phones, lookup_by_phone, normalize_phone, phone_matches
+
+from .base import BookingTestCase, day
+
+
+# --- Phone Numbers ---
+@override_settings(PHONE_DEFAULT_COUNTRY_CODE='1')
+class NormalizePhoneTests(BookingTestCase):
+    def test_formats(self):
+        self.assertEqual(normalize_phone('(555) 123-4567'), '+15551234567')
+        self.assertEqual(normalize_phone('1 555 123 4567'), '+15551234567')
+        self.assertEqual(normalize_phone('+44 20 7946 0958'), '+442079460958')
+        self.assertEqual(normalize_phone('0044 20 7946 0958'), '+442079460958')
+        self.assertEqual(normalize_phone('020 7946 0958', country_code='44'), '+442079460958')
+
+    def test_rejects_bad_numbers(self):
+        for raw in ('call me', '555-1234x2', '12345', '+1234567890123456'):
+            with self.assertRaises(ValidationError, msg=raw):
+                normalize_phone(raw)
+
+
+@override_settings(PHONE_DEFAULT_COUNTRY_CODE='1', THROTTLE_RATES={})
+class PhoneLookupTests(BookingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        CustomerPhone.objects.create(cust=cls.customer, phone_number='(555) 123-4567', is_primary=True)
+        cls.other = Customer.objects.create_user('other@example.com', 'pw12345!x', first_name='C', last_name='D')
+        CustomerPhone.objects.create(cust=cls.other, phone_number='+44 20 7946 4567')
+
+    def test_saved_numbers_are_normalized_and_indexed(self):
+        self.assertEqual(CustomerPhone.objects.get(cust=self.customer).phone_number, '+15551234567')
+        entry = PhoneIndex.objects.get(cust=self.customer)
+        self.assertEqual((entry.phone, entry.reversed_digits, entry.is_primary), ('+15551234567', '76543215551', True))
+
+    def test_whole_number_in_any_format(self):
+        matches = phone_matches('555.123.4567')
+        self.assertEqual([(customer.pk, phones) for customer, phones in matches], [(self.customer.pk, ['+15551234567'])])
+
+    def test_last_digits_match_everyone_sharing_them(self):
+        self.assertEqual([customer.pk for customer, phones in phone_matches('4567')], [self.customer.pk, self.other.pk])
+        self.assertEqual(phone_matches('567'), [])
+
+    def test_lookup_lists_upcoming_bookings(self):
+        self.book(day(-10), day(-8))
+        upcoming = self.book(day(10), day(12))
+        customer = lookup_by_phone('5551234567')[0]
+        self.assertEqual(customer['email'], 'guest@example.com')
+        self.assertEqual(
+            [(b['booking_id'], b['hotel_name']) for b in customer['upcoming_bookings']],
+            [(upcoming.pk, 'Taj Palace')]
+        )
+
+    def test_backfill_normalizes_numbers_saved_behind_the_orm(self):
+        CustomerPhone.objects.filter(cust=self.customer).update(phone_number='555 123 4567')
+        PhoneIndex.objects.all().delete()
+        stats = backfill_phones(batch_size=1)
+        self.assertEqual((stats['normalized'], stats['indexed'], stats['invalid']), (1, 2, []))
+        self.assertEqual(CustomerPhone.objects.get(cust=self.customer).phone_number, '+15551234567')
+        self.assertEqual(PhoneIndex.objects.count(), 2)
+
+    def test_staff_lookup_view(self):
+        staff = Customer.objects.create_user(
+            'staff@example.com', 'pw12345!x', first_name='S', last_name='T', is_staff=True
+        )
+        self.client.force_login(staff)
+        response = self.client.get(reverse('phone-lookup'), {'q': '+1 (555) 123-4567'})
+        self.assertEqual([c['cust_id'] for c in response.json()['customers']], [self.customer.pk])
@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.models import Booking, Payment, PricingRule
+from booking.pricing import quote_stay, rule_applies
+
+from .base import BookingTestCase, day
+
+
+# --- Pricing Rules ---
+class PricingTests(BookingTestCase):
+    def test_rule_applies(self):
+        rule = PricingRule(roomtype='Deluxe', min_occupancy=50, max_lead_days=7, adjustment=Decimal('20'))
+        self.assertTrue(rule_applies(rule, 'Deluxe', 60, 3))
+        self.assertFalse(rule_applies(rule, 'Suite', 60, 3))
+        self.assertFalse(rule_applies(rule, 'Deluxe', 40, 3))
+        self.assertFalse(rule_applies(rule, 'Deluxe', 60, 10))
+
+    def test_quote_without_rules_uses_list_price(self):
+        quote = quote_stay(self.room, day(10), day(12))
+        self.assertEqual(quote['subtotal'], Decimal('200.00'))
+        self.assertEqual(quote['nightly_rate'], Decimal('100.00'))
+
+    def test_quote_applies_matching_rules_per_night(self):
+        PricingRule.objects.create(hotel=self.hotel, max_lead_days=10, adjustment=Decimal('20'))
+        quote = quote_stay(self.room, day(10), day(12))
+        self.assertEqual(quote['rates'], [(day(10), Decimal('120.00')), (day(11), Decimal('100.00'))])
+        self.assertEqual(quote['subtotal'], Decimal('220.00'))
+        self.assertIsNone(quote['nightly_rate'])
+
+
+@override_settings(THROTTLE_RATES={})
+class QuotedTotalTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.customer)
+        session = self.client.session
+        session['booking_checkin'] = day(10).isoformat()
+        session['booking_checkout'] = day(12).isoformat()
+        session.save()
+        self.url = reverse('payment-confirmation', args=[self.hotel.pk, self.room.room_number])
+
+    def test_charges_the_total_shown(self):
+        token = self.client.get(self.url).context['confirmation_token']
+        self.client.post(self.url, {'confirmation_token': token})
+        self.assertEqual(Payment.objects.get().amount, Decimal('200.00'))
+
+    def test_changed_price_is_shown_again_before_charging(self):
+        token = self.client.get(self.url).context['confirmation_token']
+        with self.captureOnCommitCallbacks(execute=True):
+            PricingRule.objects.create(hotel=self.hotel, max_lead_days=30, adjustment=Decimal('20'))
+
+        response = self.client.post(self.url, {'confirmation_token': token})
+        self.assertRedirects(response, self.url, fetch_redirect_response=False)
+        self.assertFalse(Booking.objects.exists())
+
+        token = self.client.get(self.url).context['confirmation_token']
+        self.client.post(self.url, {'confirmation_token': token})
+        self.assertEqual(Payment.objects.get().amount, Decimal('240.00'))
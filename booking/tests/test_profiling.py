@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import time
+
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.models import Customer
+from booking.profiling import profile_dir, profile_report, profile_summary, prune_profiles, slowest_profiles
+
+from .base import BookingTestCase
+
+
+# --- Request Profiling ---
+@override_settings(THROTTLE_RATES={}, PROFILING_ENABLED=True, PROFILE_SAMPLE_RATE=0, PROFILE_MAX_FILES=500)
+class ProfilingTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(PROFILE_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.staff = Customer.objects.create_user(
+            'staff@example.com', 'pw12345!x', first_name='S', last_name='T', is_staff=True
+        )
+
+    def write_capture(self, profile_id, url_name, elapsed_ms, sql_ms):
+        meta = {'id': profile_id, 'url_name': url_name, 'elapsed_ms': elapsed_ms, 'sql_ms': sql_ms}
+        (profile_dir() / f'{profile_id}.json').write_text(json.dumps(meta))
+        (profile_dir() / f'{profile_id}.prof').write_text('')
+
+    def test_staff_request_is_profiled_on_request(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('hotel-list'), {'profile': '1'})
+        profile_id = response['X-Profile-Id']
+
+        capture = slowest_profiles()[0]
+        self.assertEqual((capture['id'], capture['url_name'], capture['status']), (profile_id, 'hotel-list', 200))
+        self.assertGreater(capture['sql_count'], 0)
+        self.assertIn('function calls', profile_report(profile_id))
+
+        response = self.client.get(reverse('profile-detail', args=[profile_id]), {'sort': 'tottime'})
+        self.assertContains(response, 'tottime')
+
+    def test_guests_and_plain_requests_are_not_profiled(self):
+        self.client.get(reverse('hotel-list'), {'profile': '1'})
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('hotel-list'))
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(slowest_profiles(), [])
+
+    def test_summary_and_filtering(self):
+        profile_dir().mkdir(parents=True, exist_ok=True)
+        self.write_capture('20250101-000000-00000001', 'hotel-list', 100.0, 50.0)
+        self.write_capture('20250101-000000-00000002', 'hotel-list', 300.0, 50.0)
+        self.write_capture('20250101-000000-00000003', 'profile', 200.0, 0.0)
+
+        self.assertEqual([p['elapsed_ms'] for p in slowest_profiles()], [300.0, 200.0, 100.0])
+        self.assertEqual([p['elapsed_ms'] for p in slowest_profiles(url_name='profile')], [200.0])
+        hotel_list = profile_summary()[0]
+        self.assertEqual((hotel_list['url_name'], hotel_list['count'], hotel_list['avg_ms']), ('hotel-list', 2, 200.0))
+        self.assertEqual(hotel_list['sql_share'], 0.25)
+
+    def test_prune_keeps_the_newest(self):
+        profile_dir().mkdir(parents=True, exist_ok=True)
+        for n in range(3):
+            self.write_capture(f'20250101-000000-0000000{n}', 'hotel-list', 1.0, 0.0)
+            os.utime(profile_dir() / f'20250101-000000-0000000{n}.json', (time.time() + n, time.time() + n))
+        prune_profiles(profile_dir(), 2)
+        self.assertEqual(sorted(path.name for path in profile_dir().iterdir()), [
+            '20250101-000000-00000001.json', '20250101-000000-00000001.prof',
+            '20250101-000000-00000002.json', '20250101-000000-00000002.prof',
+        ])
+
+    def test_report_rejects_bad_ids(self):
+        self.assertIsNone(profile_report('../../etc/passwd'))
+        self.assertIsNone(profile_report('20250101-000000-deadbeef'))
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse('profile-detail', args=['20250101-000000-deadbeef'])).status_code, 404)
@@ -0,0 +1,63 @@
+from django.http import QueryDict
+from django.urls import reverse
+
+from booking.models import Hotel
+from booking.search import facet_counts, facet_options, filter_hotels, search_params, toggle_url
+
+from .base import BookingTestCase
+
+
+def params_for(query):
+    return search_params(QueryDict(query))
+
+
+# --- Faceted Navigation ---
+class FacetTests(BookingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Hotel.objects.create(name='Oberoi', city='Mumbai', state='Maharashtra', rating=4.0)
+        Hotel.objects.create(name='Leela', city='Pune', state='Maharashtra', rating=3.2)
+        Hotel.objects.create(name='Park', city='Panaji', state='Goa', rating=4.6)
+
+    def test_search_params_are_normalised(self):
+        params = params_for('q=+Taj+&city=Pune&city=Mumbai&city=Pune&rating=2&sort=bogus&guests=-1')
+        self.assertEqual(params['q'], 'Taj')
+        self.assertEqual(params['city'], ['Mumbai', 'Pune'])
+        self.assertEqual((params['rating'], params['sort'], params['guests']), ('', 'name', None))
+
+    def test_values_in_a_facet_are_ored_and_facets_anded(self):
+        names = lambda query: list(filter_hotels(params_for(query)).values_list('name', flat=True))
+        self.assertEqual(names('city=Mumbai&city=Panaji'), ['Oberoi', 'Park', 'Taj Palace'])
+        self.assertEqual(names('city=Mumbai&city=Panaji&rating=4.5'), ['Park', 'Taj Palace'])
+
+    def test_picked_facet_still_counts_its_other_values(self):
+        counts = facet_counts(params_for('city=Mumbai'))
+        self.assertEqual(counts['city'], [('Mumbai', 2), ('Panaji', 1), ('Pune', 1)])
+        # Other facets are counted over the Mumbai hotels only
+        self.assertEqual(counts['state'], [('Maharashtra', 2)])
+        self.assertEqual(counts['rating'], [('4.5', 1), ('4', 2), ('3', 2)])
+
+    def test_rating_counts_ignore_the_picked_band(self):
+        counts = facet_counts(params_for('rating=4.5'))
+        self.assertEqual(counts['rating'], [('4.5', 2), ('4', 3), ('3', 4)])
+        self.assertEqual(counts['city'], [('Mumbai', 1), ('Panaji', 1)])
+
+    def test_picked_values_stay_listed_at_zero(self):
+        query = QueryDict('city=Pune&rating=4.5')
+        params = search_params(query)
+        city = facet_options(query, params, facet_counts(params))[0]
+        self.assertEqual(city['title'], 'City')
+        pune = [option for option in city['options'] if option['label'] == 'Pune'][0]
+        self.assertEqual((pune['count'], pune['selected'], pune['url']), (0, True, '?rating=4.5'))
+
+    def test_toggle_url(self):
+        query = QueryDict('city=Pune&rating=4&page=3')
+        self.assertEqual(toggle_url(query, 'city', 'Mumbai'), '?city=Pune&city=Mumbai&rating=4')
+        self.assertEqual(toggle_url(query, 'rating', '4.5', single=True), '?city=Pune&rating=4.5')
+
+    def test_hotel_list_shows_the_facets(self):
+        response = self.client.get(reverse('hotel-list'), {'city': 'Mumbai'})
+        self.assertContains(response, 'Oberoi')
+        self.assertNotContains(response, 'Leela')
+        self.assertContains(response, 'Panaji')
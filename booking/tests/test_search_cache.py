@@ -0,0 +1,71 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import QueryDict
+
+from booking.catalog import REVIEW_STATS, bump_catalog_version
+from booking.models import Hotel
+from booking.search import SEARCH_CACHE_GRACE, cached_search, search_cache_key, search_params
+
+from .base import BookingTestCase
+
+
+def params_for(query):
+    return search_params(QueryDict(query))
+
+
+# --- Search Result Cache ---
+class SearchCacheKeyTests(BookingTestCase):
+    def test_equal_searches_share_a_key(self):
+        self.assertEqual(
+            search_cache_key(params_for('q=Taj&city=Pune&city=Mumbai')),
+            search_cache_key(params_for('q=+taj+&city=Mumbai&city=Pune')),
+        )
+        self.assertNotEqual(search_cache_key(params_for('q=taj')), search_cache_key(params_for('q=oberoi')))
+
+    def test_catalog_change_moves_every_key(self):
+        before = search_cache_key(params_for('q=taj'))
+        bump_catalog_version()
+        self.assertNotEqual(search_cache_key(params_for('q=taj')), before)
+
+    def test_only_review_sorts_follow_review_stats(self):
+        by_name, by_reviews = params_for('q=taj'), params_for('q=taj&sort=reviews')
+        keys = search_cache_key(by_name), search_cache_key(by_reviews)
+        bump_catalog_version(REVIEW_STATS)
+        self.assertEqual(search_cache_key(by_name), keys[0])
+        self.assertNotEqual(search_cache_key(by_reviews), keys[1])
+
+
+class CachedSearchTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.params = params_for('city=Mumbai')
+        self.key = search_cache_key(self.params)
+
+    def test_repeat_search_skips_the_database(self):
+        first = cached_search(self.params)
+        self.assertEqual(first['ids'], [self.hotel.pk])
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_search(self.params), first)
+
+    def test_stale_result_is_served_while_one_refresh_runs(self):
+        stale = {'ids': [], 'facets': {}}
+        cache.set(self.key, (time.time() - 1, stale), SEARCH_CACHE_GRACE)
+
+        with mock.patch('booking.search.threading.Thread') as thread:
+            self.assertEqual(cached_search(self.params), stale)
+            self.assertEqual(cached_search(self.params), stale)
+        self.assertEqual(thread.call_count, 1)
+
+        # What the background thread runs
+        kwargs = thread.call_args.kwargs
+        kwargs['target'](*kwargs['args'])
+        self.assertEqual(cached_search(self.params)['ids'], [self.hotel.pk])
+        self.assertIsNone(cache.get(f'{self.key}:lock'))
+
+    def test_new_hotel_shows_up_after_the_catalog_moves(self):
+        cached_search(self.params)
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Hotel.objects.create(name='Oberoi', city='Mumbai', state='Maharashtra', rating=4.0)
+        self.assertEqual(sorted(cached_search(self.params)['ids']), sorted([self.hotel.pk, other.pk]))
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+from django.test import override_settings
+
+from booking.models import Booking, Customer, Hotel, HotelShard
+from booking.rebalance import plan_moves
+from booking.sharding import (
+    HotelMoving, HotelShardRouter, check_hotel_writable, fan_out, merge_by_checkin, shard_for_hotel
+)
+
+from .base import BookingTestCase, day
+
+
+# --- Sharding ---
+class ShardingTests(BookingTestCase):
+    def test_router_keeps_unsharded_models_on_default(self):
+        router = HotelShardRouter()
+        self.assertEqual(router.db_for_read(Hotel), 'default')
+        self.assertEqual(router.db_for_write(Customer), 'default')
+
+    def test_router_places_bookings_by_hotel(self):
+        booking = Booking(hotel_id=self.hotel.pk)
+        self.assertEqual(HotelShardRouter().db_for_write(Booking, instance=booking), shard_for_hotel(self.hotel.pk))
+
+    def test_fan_out_returns_results_in_shard_order(self):
+        self.assertEqual(fan_out(lambda alias: [alias], shards=['shard1', 'shard2']), [['shard1'], ['shard2']])
+
+    def test_merge_by_checkin(self):
+        shard1 = [SimpleNamespace(pk=1, checkin=day(30)), SimpleNamespace(pk=2, checkin=day(10))]
+        shard2 = [SimpleNamespace(pk=3, checkin=day(20)), SimpleNamespace(pk=4, checkin=None)]
+        merged = merge_by_checkin([shard1, shard2])
+        self.assertEqual([booking.pk for booking in merged], [1, 3, 2, 4])
+        merged = merge_by_checkin([list(reversed(shard1)), [shard2[1], shard2[0]]], newest_first=False)
+        self.assertEqual([booking.pk for booking in merged], [4, 2, 3, 1])
+
+    @override_settings(BOOKING_SHARDS=['default', 'shard1'])
+    def test_placement_comes_from_the_shard_map(self):
+        other = Hotel.objects.create(name='Leela', city='Goa', state='Goa', rating=4.0)
+        HotelShard.objects.create(hotel_id=other.pk, shard='shard1', moving=True)
+        self.assertEqual(shard_for_hotel(other.pk), 'shard1')
+        self.assertEqual(shard_for_hotel(self.hotel.pk), 'default')
+        with self.assertRaises(HotelMoving):
+            check_hotel_writable(other.pk)
+        check_hotel_writable(self.hotel.pk)
+
+
+class PlanMovesTests(BookingTestCase):
+    def test_moves_the_largest_hotel_that_narrows_the_gap(self):
+        loads = {'default': {1: 70, 2: 30}, 'shard1': {3: 40}}
+        self.assertEqual(plan_moves(loads), [(2, 'default', 'shard1', 30)])
+
+    def test_balanced_shards_stay_put(self):
+        self.assertEqual(plan_moves({'default': {1: 50}, 'shard1': {2: 48}}), [])
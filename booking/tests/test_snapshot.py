@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+from django.urls import reverse
+
+from booking.cards import rebuild_hotel_cards
+from booking.catalog import REVIEW_STATS, bump_catalog_version
+from booking.models import Facility, Offer, Room, RoomImage
+from booking.snapshot import catalog_snapshot, review_stats
+
+from .base import BookingTestCase, day
+
+
+# --- Catalog Snapshot ---
+class CatalogSnapshotTests(BookingTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Room.objects.create(
+            hotel=cls.hotel, room_number='102', roomtype='Suite', capacity=4, price=Decimal('250.00'), availability=True
+        )
+        RoomImage.objects.create(hotel_id=cls.hotel.pk, room_number='102', image_url='/suite.jpg', reference_name='Suite')
+        Facility.objects.create(hotel=cls.hotel, facility_name='Spa')
+        Offer.objects.create(hotel=cls.hotel, description='Monsoon', start_date=day(-1), end_date=day(5), discount=10)
+        rebuild_hotel_cards()
+
+    def test_holds_the_hotel_with_its_rooms_facilities_and_offers(self):
+        catalog = catalog_snapshot()
+        hotel = catalog.hotel(self.hotel.pk)
+        self.assertEqual((hotel.pk, hotel.name, hotel.card.min_price), (self.hotel.pk, 'Taj Palace', Decimal('100.00')))
+        rooms = catalog.rooms_for(self.hotel.pk)
+        self.assertEqual([room.room_number for room in rooms], ['101', '102'])
+        self.assertEqual([image.image_url for image in rooms[1].images], ['/suite.jpg'])
+        self.assertEqual([f.facility_name for f in catalog.facilities_for(self.hotel.pk)], ['Spa'])
+        self.assertEqual([o.description for o in catalog.offers_for(self.hotel.pk)], ['Monsoon'])
+        self.assertIsNone(catalog.hotel(0))
+        self.assertEqual(catalog.rooms_for(0), ())
+
+    def test_records_are_read_only(self):
+        with self.assertRaises(AttributeError):
+            catalog_snapshot().hotel(self.hotel.pk).name = 'Changed'
+
+    def test_built_once_per_catalog_version(self):
+        catalog = catalog_snapshot()
+        with self.assertNumQueries(0):
+            self.assertIs(catalog_snapshot(), catalog)
+        bump_catalog_version(REVIEW_STATS)
+        self.assertIs(catalog_snapshot(), catalog)
+        bump_catalog_version()
+        self.assertIsNot(catalog_snapshot(), catalog)
+
+    def test_review_stats_have_their_own_version(self):
+        stats = review_stats()
+        self.assertEqual(stats[self.hotel.pk].review_count, 0)
+        bump_catalog_version(REVIEW_STATS)
+        self.assertIsNot(review_stats(), stats)
+
+    def test_hotel_detail_reads_the_snapshot(self):
+        response = self.client.get(reverse('hotel-detail', args=[self.hotel.pk]))
+        self.assertContains(response, 'Monsoon')
+        self.assertContains(response, '/suite.jpg')
+        self.assertEqual(self.client.get(reverse('hotel-detail', args=[self.hotel.pk + 100])).status_code, 404)
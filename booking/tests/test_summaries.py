@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.urls import reverse
+
+from booking.models import CustomerSummary
+from booking.summaries import rebuild_customer_summaries, refresh_customer_summary
+
+from .base import BookingTestCase, day
+
+
+# --- Customer Summaries ---
+class CustomerSummaryTests(BookingTestCase):
+    def test_booking_refreshes_the_summary_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book(day(-10), day(-8), amount=Decimal('200.00'))
+        summary = CustomerSummary.objects.get(cust_id=self.customer.pk)
+        self.assertEqual((summary.total_bookings, summary.total_nights), (1, 2))
+        self.assertEqual(summary.total_spend, Decimal('200.00'))
+        self.assertEqual(summary.past_stay, day(-8))
+
+    def test_cancelled_stays_count_apart(self):
+        self.book(day(-10), day(-8), amount=Decimal('200.00'))
+        cancelled = self.book(day(-5), day(-3))
+        cancelled.status = 'Cancelled'
+        cancelled.save()
+        summary = refresh_customer_summary(self.customer.pk)
+        self.assertEqual((summary.total_bookings, summary.cancelled_bookings), (2, 1))
+        self.assertEqual(summary.cancellation_rate, 0.5)
+        self.assertEqual((summary.total_nights, summary.last_stay), (2, day(-8)))
+
+    def test_upcoming_stay_is_shown_once_it_is_over(self):
+        self.book(day(-10), day(-8))
+        self.book(day(5), day(7))
+        summary = refresh_customer_summary(self.customer.pk)
+        self.assertEqual(summary.last_stay, day(7))
+        self.assertIsNone(summary.past_stay)
+
+        summary.last_stay = day(0)
+        self.assertEqual(summary.past_stay, day(0))
+
+    def test_rebuild_matches_refresh(self):
+        self.book(day(-10), day(-8), amount=Decimal('200.00'))
+        self.book(day(5), day(7), amount=Decimal('150.00'))
+        refreshed = refresh_customer_summary(self.customer.pk)
+
+        CustomerSummary.objects.all().delete()
+        self.assertEqual(rebuild_customer_summaries(batch_size=1), 1)
+        rebuilt = CustomerSummary.objects.get(cust_id=self.customer.pk)
+        fields = ('total_bookings', 'cancelled_bookings', 'total_nights', 'total_spend', 'last_stay')
+        self.assertEqual([getattr(rebuilt, f) for f in fields], [getattr(refreshed, f) for f in fields])
+
+    def test_no_bookings_removes_the_row(self):
+        booking = self.book(day(-10), day(-8))
+        refresh_customer_summary(self.customer.pk)
+        booking.delete()
+        self.assertIsNone(refresh_customer_summary(self.customer.pk))
+        self.assertFalse(CustomerSummary.objects.exists())
+
+    def test_profile_shows_the_summary(self):
+        self.book(day(-10), day(-8), amount=Decimal('200.00'))
+        refresh_customer_summary(self.customer.pk)
+        self.client.force_login(self.customer)
+        response = self.client.get(reverse('profile'))
+        self.assertContains(response, 'Last Stay:')
+        self.assertContains(response, '$200.00')
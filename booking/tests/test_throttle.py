@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from booking.middleware import ThrottleMiddleware, parse_rule
+
+from .base import BookingTestCase
+
+
+# --- Rate Limiting ---
+class CountRequestTests(BookingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.throttle = ThrottleMiddleware(lambda request: None)
+
+    def count_at(self, now, capacity=2, period=60):
+        with mock.patch('booking.middleware.time.time', return_value=now):
+            return self.throttle.count_request('throttle:test', capacity, period)
+
+    def test_parse_rule(self):
+        self.assertEqual(parse_rule('30/m'), (30, 60, set()))
+        self.assertEqual(parse_rule({'rate': '5/h', 'methods': ['post']}), (5, 3600, {'POST'}))
+
+    def test_capacity_per_window(self):
+        self.assertEqual(self.count_at(600), (True, 0))
+        self.assertEqual(self.count_at(610), (True, 0))
+        self.assertEqual(self.count_at(620), (False, 40))
+
+    def test_previous_window_still_counts_at_the_boundary(self):
+        self.count_at(650)
+        self.count_at(655)
+        # Early in the next window most of the previous one still applies
+        allowed, retry_after = self.count_at(665)
+        self.assertFalse(allowed)
+        self.assertEqual(retry_after, 25)
+        # Once enough of it has slid out the client gets through
+        self.assertEqual(self.count_at(691), (True, 0))
+
+    def test_rejected_requests_are_not_counted(self):
+        self.count_at(600)
+        self.count_at(601)
+        for _ in range(5):
+            self.count_at(602)
+        # Half of the previous window's 2 requests still apply
+        self.assertEqual(self.count_at(690), (True, 0))
+
+
+@override_settings(THROTTLE_RATES={'hotel-list': '2/m', 'payment-confirmation': {'rate': '1/m', 'methods': ['POST']}})
+class ThrottleMiddlewareTests(BookingTestCase):
+    def test_over_the_limit_gets_429_with_retry_after(self):
+        url = reverse('hotel-list')
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_clients_are_counted_apart(self):
+        url = reverse('hotel-list')
+        for _ in range(3):
+            self.client.get(url, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_method_rules_leave_other_methods_alone(self):
+        self.client.force_login(self.customer)
+        url = reverse('payment-confirmation', args=[self.hotel.pk, self.room.room_number])
+        for _ in range(3):
+            self.assertNotEqual(self.client.get(url).status_code, 429)
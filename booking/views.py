@@ -1,16 +1,41 @@
-from collections import defaultdict
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import logout
 from django.contrib import messages
-from django.http import HttpResponseForbidden
-from django.db.models import Q
+from django.core.paginator import Paginator
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from .forms import (
     CustomerCreationForm, BookingForm, ReviewForm, CustomerPhoneForm, 
-    CustomerUpdateForm, CancellationForm
+    CustomerUpdateForm, CancellationForm, GroupBookingForm
 )
+from .autocomplete import MAX_SUGGESTIONS, prefix_index
+from .deletion import request_account_deletion
+from .frontdesk import (
+    FRONT_DESK_EXPORT_FIELDS, FRONT_DESK_LISTS, FRONT_DESK_PAGE_SIZE, front_desk_bookings, front_desk_counts
+)
+from .amendments import amend_stay
+from .group import create_group_booking
+from .idempotency import (
+    PENDING, InvalidToken, claim_token, issue_token, issued_quote, record_outcome, release_token, token_outcome
+)
+from .phones import lookup_by_phone
+from .pricing import quote_stay
+from .profiling import profile_report, profile_summary, slowest_profiles
+from .ledger import RoomNotAvailable
+from .live import availability_events
+from .exports import EXPORTS, EXPORT_FORMATS, export_filename, export_response, queryset_rows, stream_csv
+from .sharding import HotelMoving, fan_out, get_booking_or_404, merge_by_checkin, shard_for_hotel
+from .snapshot import catalog_snapshot, review_stats
+from .search import LIST_PARAMS, SORT_OPTIONS, cached_search, facet_options, hotels_in_order, search_params
 from .models import (
-    Hotel, Room, Booking, Payment, Facility, Review, Offer, RoomImage, CustomerPhone, Offer, Cancellation
+    Hotel, Room, Booking, Payment, Review, Offer, CustomerPhone, Offer, Cancellation,
+    CustomerSummary, ArchivedBooking
 )
 import datetime
 
@@ -38,56 +63,64 @@ def register(request):
 
 # Hotel List View
 def hotel_list(request):
+    # 1. Read the search box, offer toggle and facet selections from the URL
+    params = search_params(request.GET)
 
-    query = request.GET.get('q', '')
-    # 3. Get the new filter from the URL
-    offer_filter = request.GET.get('filter_offers')
-
-    # 4. Start with all hotels
-    hotels = Hotel.objects.all()
-
-    # 5. Apply the search query first
-    if query:
-        hotels = hotels.filter(
-            Q(name__icontains=query) |
-            Q(city__icontains=query) |
-            Q(state__icontains=query)
-        )
-
-    # 6. Apply the offer filter
-    if offer_filter == 'on':
-        today = datetime.date.today()
-        # Filter hotels that have an active offer
-        hotels = hotels.filter(
-            offer__start_date__lte=today,
-            offer__end_date__gte=today
-        ).distinct() # .distinct() prevents duplicates
-
-    # --- (This image logic is the same as before) ---
-    all_room_images_query = RoomImage.objects.all()
-    all_room_images = defaultdict(list)
-    for image in all_room_images_query:
-        all_room_images[image.hotel_id].append(image)
-
-    for hotel in hotels:
-        hotel.images = all_room_images.get(hotel.hotel_id, [])
+    # 2. Get the matching hotel ids and facet counts, shared between
+    #    everyone running the same search
+    result = cached_search(params)
+    facets = facet_options(request.GET, params, result['facets'])
+
+    # 3. Load those hotels; prices and cover image come from the card, review
+    #    stats from their own per-process index
+    reviews = review_stats()
+    hotels = [(hotel, reviews.get(hotel.hotel_id)) for hotel in hotels_in_order(result['ids'])]
 
     context = {
         'hotels': hotels,
-        'search_query': query,
-        'offer_filter': offer_filter, # 7. Pass the filter state to the template
+        'search_query': params['q'],
+        'offer_filter': 'on' if params['filter_offers'] else None, # Pass the filter state to the template
+        'facets': facets,
+        'sort': params['sort'],
+        'sort_options': [(key, label) for key, (label, ordering) in SORT_OPTIONS.items()],
+        'min_price': params['min_price'],
+        'max_price': params['max_price'],
+        'guests': params['guests'],
+        # Keep the facet selections when the search box is resubmitted
+        'hidden_filters': [(name, value) for name in LIST_PARAMS for value in params[name]] + (
+            [('rating', params['rating'])] if params['rating'] else []
+        ) + (
+            [('amenity_mode', 'any')] if params['amenity_mode'] == 'any' else []
+        ),
     }
     return render(request, 'hotel_list.html', context)
 
+# Search Autocomplete View
+def hotel_autocomplete(request):
+    query = request.GET.get('q', '')
+    try:
+        limit = min(max(int(request.GET.get('limit', 8)), 1), MAX_SUGGESTIONS)
+    except ValueError:
+        limit = 8
+
+    # Answered from the in-process prefix index, not the database
+    suggestions = prefix_index().lookup(query, limit=limit)
+    return JsonResponse({'query': query, 'suggestions': suggestions})
+
 # Hotel Detail View (with Review Form)
 def hotel_detail(request, hotel_id):
-    hotel = get_object_or_404(Hotel, pk=hotel_id)
+    # The hotel, its rooms (with images), facilities and offers come from the
+    # in-process catalog snapshot; only the reviews are read per request
+    catalog = catalog_snapshot()
+    hotel = catalog.hotel(hotel_id)
+    if hotel is None:
+        raise Http404("No hotel matches the given query.")
     
     if request.method == 'POST' and request.user.is_authenticated:
         review_form = ReviewForm(request.POST)
         if review_form.is_valid():
             review = review_form.save(commit=False)
-            review.hotel = hotel
+            review.hotel_id = hotel_id
             review.cust = request.user
             review.date = datetime.date.today()
             review.save()
@@ -96,46 +129,70 @@ def hotel_detail(request, hotel_id):
     else:
         review_form = ReviewForm()
 
-    
-    # --- THIS IS THE UPDATED LOGIC ---
-    rooms = Room.objects.filter(hotel=hotel)
-    facilities = Facility.objects.filter(hotel=hotel)
-    reviews = Review.objects.filter(hotel=hotel).order_by('-date')
-    offers = Offer.objects.filter(hotel=hotel)
-    
-    # 1. Get images and group them by room_number
-    room_images_query = RoomImage.objects.filter(hotel_id=hotel_id)
-    room_images_dict = defaultdict(list)
-    for image in room_images_query:
-        room_images_dict[image.room_number].append(image)
-
-    # 2. THIS IS THE NEW PART: Attach images to each room object
-    for room in rooms:
-        room.images = room_images_dict.get(room.room_number, [])
+    reviews = Review.objects.filter(hotel_id=hotel_id).select_related('cust').order_by('-date')
 
     context = {
         'hotel': hotel,
-        'rooms': rooms, # Rooms now have .images attached
-        'facilities': facilities,
+        'rooms': catalog.rooms_for(hotel_id), # Each room carries its .images
+        'facilities': catalog.facilities_for(hotel_id),
         'reviews': reviews,
-        'offers': offers,
+        'offers': catalog.offers_for(hotel_id),
         'review_form': review_form,
-        # We no longer need to pass room_images
+        'live_availability': settings.LIVE_AVAILABILITY_ENABLED,
     }
     return render(request, 'hotel_detail.html', context)
 
+# Live Availability Stream (Server-Sent Events)
+async def availability_stream(request, hotel_id):
+    # Under WSGI the stream would hold a worker thread forever; 204 tells
+    # the browser to stop (and not reconnect)
+    if not settings.LIVE_AVAILABILITY_ENABLED:
+        return HttpResponse(status=204)
+
+    catalog = await sync_to_async(catalog_snapshot)()
+    if catalog.hotel(hotel_id) is None:
+        raise Http404("No hotel matches the given query.")
+
+    # An async generator: an idle connection is a parked coroutine on the
+    # server's event loop, not a worker thread (serve with config.asgi)
+    response = StreamingHttpResponse(availability_events(hotel_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
 # "My Bookings" View
 @login_required
 def my_bookings(request):
-    # 1. Get ALL bookings for the user.
-    # 2. Use prefetch_related('payment_set') to efficiently get the payment.
-    bookings = Booking.objects.filter(
-        cust=request.user
-    ).prefetch_related('payment_set').order_by('-checkin')
+    # 1. Get ALL bookings for the user. They may sit on several booking
+    #    shards, so every shard is asked at once and the lists are merged.
+    # 2. Use prefetch_related('payment_set') to efficiently get the payment
+    #    (and any adjustments from edited dates).
+    payments = Prefetch('payment_set', queryset=Payment.objects.order_by('pk').prefetch_related('adjustments'))
+    bookings = merge_by_checkin(fan_out(lambda alias: list(
+        Booking.objects.using(alias).filter(
+            cust_id=request.user.pk
+        ).prefetch_related(payments).order_by('-checkin')
+    )))
+    for booking in bookings:
+        # The first payment, taken from the prefetched rows (payment_set.first
+        # in the template would query again for every booking)
+        booking.payment = next(iter(booking.payment_set.all()), None)
+
+    # 3. Older stays live in the archive tables; only read them on request.
+    show_history = request.GET.get('history') == '1'
+    archived_bookings = None
+    if show_history:
+        archived_bookings = merge_by_checkin(fan_out(lambda alias: list(
+            ArchivedBooking.objects.using(alias).filter(
+                cust_id=request.user.pk
+            ).prefetch_related('payments').order_by('-checkin')
+        )))
     
-    # 3. Pass the single 'bookings' list to the template.
+    # 4. Pass the lists to the template.
     context = {
-        'bookings': bookings 
+        'bookings': bookings,
+        'show_history': show_history,
+        'archived_bookings': archived_bookings,
     }
     return render(request, 'my_bookings.html', context)
 
@@ -167,12 +224,13 @@ def create_booking(request, hotel_id, room_number):
     context = {
         'form': form,
         'room': room,
+        'live_availability': settings.LIVE_AVAILABILITY_ENABLED,
     }
     return render(request, 'create_booking.html', context)
 # View to Cancel Booking
 @login_required
 def cancel_booking(request, booking_id):
-    booking = get_object_or_404(Booking, pk=booking_id)
+    booking = get_booking_or_404(booking_id)
     
     # Check if the logged-in user is the owner
     if booking.cust != request.user:
@@ -186,23 +244,26 @@ def cancel_booking(request, booking_id):
     if request.method == 'POST':
         form = CancellationForm(request.POST)
         if form.is_valid():
-            # 1. Update Booking status
-            booking.status = 'Cancelled'
-            booking.save()
-            
-            # 2. Update Payment status
-            try:
-                payment = Payment.objects.get(booking=booking)
-                payment.status = 'Cancelled'
-                payment.save()
-            except Payment.DoesNotExist:
-                pass # No payment was found, which is fine
-            
-            # 3. Create the new Cancellation record
-            cancellation = form.save(commit=False)
-            cancellation.booking = booking
-            cancellation.cancel_date = datetime.date.today()
-            cancellation.save()
+            # All three writes (and releasing the room's nights) commit together
+            # on the shard that holds the booking
+            with transaction.atomic(using=booking._state.db):
+                # 1. Update Booking status (this frees its nights in the ledger)
+                booking.status = 'Cancelled'
+                booking.save()
+                
+                # 2. Update Payment status
+                try:
+                    payment = booking.payment_set.get()
+                    payment.status = 'Cancelled'
+                    payment.save()
+                except Payment.DoesNotExist:
+                    pass # No payment was found, which is fine
+                
+                # 3. Create the new Cancellation record
+                cancellation = form.save(commit=False)
+                cancellation.booking = booking
+                cancellation.cancel_date = datetime.date.today()
+                cancellation.save()
             
             messages.success(request, 'Your booking has been successfully cancelled.')
             return redirect('my-bookings')
@@ -219,7 +280,7 @@ def cancel_booking(request, booking_id):
 # Edit Booking View
 @login_required
 def edit_booking(request, booking_id):
-    booking = get_object_or_404(Booking, pk=booking_id)
+    booking = get_booking_or_404(booking_id)
     room = get_object_or_404(Room, hotel_id=booking.hotel_id, room_number=booking.room_number)
 
     if booking.cust != request.user:
@@ -227,28 +288,21 @@ def edit_booking(request, booking_id):
 
     if request.method == 'POST':
         form = BookingForm(request.POST, instance=booking, room=room)
+        # The form keeps the current dates on the booking until it is
+        # valid; read them before it copies the new ones over
+        checkin, checkout = booking.checkin, booking.checkout
         if form.is_valid():
-            # Save the updated booking
-            updated_booking = form.save() 
-            
+            booking.checkin, booking.checkout = checkin, checkout
             try:
-                # Find the related payment
-                payment = Payment.objects.get(booking=updated_booking)
-                
-                # Recalculate the price
-                num_nights = (updated_booking.checkout - updated_booking.checkin).days
-                total_price = room.price * num_nights
-                
-                # Update the payment
-                payment.amount = total_price
-                payment.save()
-                
-            except Payment.DoesNotExist:
-                # If no payment exists, you could create one
-                pass
-
-            messages.success(request, 'Your booking has been successfully updated.')
-            return redirect('my-bookings')
+                # The new dates, the ledger nights they add or give up and the
+                # payment adjustment for the difference commit together
+                amend_stay(booking, room, form.cleaned_data['checkin'], form.cleaned_data['checkout'])
+            except RoomNotAvailable as e:
+                # Someone else booked these nights after the form was checked
+                form.add_error(None, str(e))
+            else:
+                messages.success(request, 'Your booking has been successfully updated.')
+                return redirect('my-bookings')
     else:
         form = BookingForm(instance=booking, room=room)
 
@@ -278,9 +332,13 @@ def profile(request):
         # Show a blank form
         form = CustomerPhoneForm()
 
+    # Booking stats come from the precomputed summary row, not a join over bookings
+    summary = CustomerSummary.objects.filter(cust_id=request.user.pk).first()
+
     context = {
         'phones': phones,
-        'form': form
+        'form': form,
+        'summary': summary
     }
     return render(request, 'profile.html', context)
 
@@ -337,8 +395,10 @@ def delete_profile(request):
     user = request.user
 
     if request.method == 'POST':
-        # This is the confirmation
-        user.delete()
+        # This is the confirmation. The account is closed and anonymized right
+        # away; its bookings and reviews are cleaned up later in batches by
+        # `manage.py process_account_deletions`.
+        request_account_deletion(user)
         logout(request) # Log them out as their account is gone
         messages.success(request, 'Your account has been successfully deleted.')
         return redirect('home') # Send them to the home page
@@ -346,6 +406,24 @@ def delete_profile(request):
     # If it's a GET request, just show the confirmation page
     return render(request, 'delete_profile.html')
 
+# Offer lookup shared by the checkout views
+def active_offer_for(hotel_id, today):
+    return Offer.objects.filter(
+        hotel_id=hotel_id,
+        start_date__lte=today,
+        end_date__gte=today
+    ).first() # Get the first valid offer
+
+# Redirect with the message a checkout ended with; replayed as-is for retries
+def checkout_outcome(request, outcome):
+    level, message, url = outcome
+    messages.add_message(request, level, message)
+    return redirect(url)
+
+def expired_confirmation(request, hotel_id, room_number):
+    messages.error(request, 'This page has expired. Please check your booking details and confirm again.')
+    return redirect('payment-confirmation', hotel_id=hotel_id, room_number=room_number)
+
 # Payment View
 @login_required
 def payment_confirmation(request, hotel_id, room_number):
@@ -354,7 +432,19 @@ def payment_confirmation(request, hotel_id, room_number):
     # Get dates from the session
     checkin_str = request.session.get('booking_checkin')
     checkout_str = request.session.get('booking_checkout')
-    
+    stay = f'{hotel_id}:{room_number}:{checkin_str}:{checkout_str}'
+
+    # A double-clicked or retried confirmation gets the outcome of the first
+    # submit, even though that one has already cleared the dates
+    token = request.POST.get('confirmation_token')
+    if request.method == 'POST':
+        try:
+            outcome = token_outcome(request.session, token)
+        except InvalidToken:
+            return expired_confirmation(request, hotel_id, room_number)
+        if outcome is not None:
+            return checkout_outcome(request, outcome)
+
     # If session data is missing, send them back
     if not checkin_str or not checkout_str:
         messages.error(request, 'Something went wrong. Please select your dates again.')
@@ -363,17 +453,14 @@ def payment_confirmation(request, hotel_id, room_number):
     checkin = datetime.date.fromisoformat(checkin_str)
     checkout = datetime.date.fromisoformat(checkout_str)
     
-    # Calculate price
+    # Calculate price: the nightly rates follow the hotel's pricing rules
     num_nights = (checkout - checkin).days
-    subtotal = room.price * num_nights
+    quote = quote_stay(room, checkin, checkout)
+    subtotal = quote['subtotal']
     
     # Find the best active offer
     today = datetime.date.today()
-    active_offer = Offer.objects.filter(
-        hotel_id=hotel_id,
-        start_date__lte=today,
-        end_date__gte=today
-    ).first() # Get the first valid offer
+    active_offer = active_offer_for(hotel_id, today)
     
     discount = 0
     if active_offer:
@@ -383,34 +470,74 @@ def payment_confirmation(request, hotel_id, room_number):
 
     # This is Step 2: User confirms the payment
     if request.method == 'POST':
+        # Rates follow occupancy, so they may have moved since the page was
+        # shown. Never charge a total the guest didn't see: show the new one.
+        if issued_quote(request.session, token) != str(final_total):
+            messages.warning(request, 'The price for these dates has changed. Please check the new total and confirm again.')
+            return redirect('payment-confirmation', hotel_id=hotel_id, room_number=room_number)
+
+        # Only the submit that claims the token goes on to book
+        try:
+            outcome = claim_token(request.session, token, stay)
+        except InvalidToken:
+            return expired_confirmation(request, hotel_id, room_number)
+        if outcome == PENDING:
+            messages.info(request, 'Your booking is still being confirmed. It will appear here in a moment.')
+            return redirect('my-bookings')
+        if outcome is not None:
+            return checkout_outcome(request, outcome)
+
         # Create the Booking and Payment
         try:
-            booking = Booking.objects.create(
-                cust=request.user,
-                hotel_id=room.hotel_id,
-                room_number=room.room_number,
-                bookingdate=today,
-                checkin=checkin,
-                checkout=checkout,
-                status='Confirmed'
-            )
-            
-            Payment.objects.create(
-                booking=booking,
-                amount=final_total, # Save the FINAL discounted price
-                mode='Card',
-                date=today,
-                status='Completed' # Mark as completed
-            )
+            # The booking, its ledger nights and the payment commit together,
+            # on the shard that holds this hotel's bookings
+            shard = shard_for_hotel(room.hotel_id)
+            with transaction.atomic(using=shard):
+                booking = Booking.objects.using(shard).create(
+                    cust=request.user,
+                    hotel_id=room.hotel_id,
+                    room_number=room.room_number,
+                    bookingdate=today,
+                    checkin=checkin,
+                    checkout=checkout,
+                    status='Confirmed'
+                )
+                
+                Payment.objects.using(shard).create(
+                    booking=booking,
+                    amount=final_total, # Save the FINAL discounted price
+                    mode='Card',
+                    date=today,
+                    status='Completed' # Mark as completed
+                )
             
             # Clear the session data
             del request.session['booking_checkin']
             del request.session['booking_checkout']
             
-            messages.success(request, 'Your booking is confirmed and payment is complete!')
-            return redirect('my-bookings')
+            outcome = (messages.SUCCESS, 'Your booking is confirmed and payment is complete!', reverse('my-bookings'))
+            record_outcome(request.session, token, outcome)
+            return checkout_outcome(request, outcome)
+
+        except RoomNotAvailable:
+            # Someone else booked one of these nights after the dates were checked
+            outcome = (
+                messages.ERROR,
+                'Sorry, this room was just booked for those dates. Please choose other dates.',
+                reverse('create-booking', kwargs={'hotel_id': hotel_id, 'room_number': room_number}),
+            )
+            record_outcome(request.session, token, outcome)
+            return checkout_outcome(request, outcome)
+
+        except HotelMoving as e:
+            # The hotel's bookings are being moved to another shard; the
+            # same page can be submitted again in a minute
+            release_token(request.session, token)
+            messages.error(request, str(e))
+            return redirect('payment-confirmation', hotel_id=hotel_id, room_number=room_number)
             
         except Exception as e:
+            release_token(request.session, token)
             messages.error(request, 'An error occurred while confirming your booking.')
             return redirect('hotel-detail', hotel_id=hotel_id)
 
@@ -420,9 +547,201 @@ def payment_confirmation(request, hotel_id, room_number):
         'checkin': checkin,
         'checkout': checkout,
         'num_nights': num_nights,
+        'quote': quote,
         'subtotal': subtotal,
         'active_offer': active_offer,
         'discount': discount,
-        'final_total': final_total
+        'final_total': final_total,
+        # Makes the confirm button safe to press twice
+        'confirmation_token': issue_token(request.session, stay, quote=str(final_total)),
+    }
+    return render(request, 'payment_confirmation.html', context)
+
+# Staff Export View
+@staff_member_required
+def export_data(request, kind, fmt):
+    if kind not in EXPORTS or fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export.")
+
+    # Optional date range, e.g. ?start=2025-01-01&end=2025-12-31
+    try:
+        start = datetime.date.fromisoformat(request.GET['start']) if request.GET.get('start') else None
+        end = datetime.date.fromisoformat(request.GET['end']) if request.GET.get('end') else None
+    except ValueError:
+        return HttpResponseBadRequest("Dates must be in YYYY-MM-DD format.")
+
+    # The response streams rows straight from the database cursor
+    return export_response(kind, fmt, start=start, end=end)
+
+
+# Front Desk Views (staff only)
+def front_desk_day(request):
+    # ?date=YYYY-MM-DD, defaulting to today
+    try:
+        return datetime.date.fromisoformat(request.GET['date']) if request.GET.get('date') else datetime.date.today()
+    except ValueError:
+        return None
+
+@staff_member_required
+def front_desk(request, hotel_id):
+    hotel = get_object_or_404(Hotel, pk=hotel_id)
+    day = front_desk_day(request)
+    if day is None:
+        return HttpResponseBadRequest("Dates must be in YYYY-MM-DD format.")
+
+    kind = request.GET.get('list', 'arrivals')
+    if kind not in FRONT_DESK_LISTS:
+        kind = 'arrivals'
+
+    # 1. One count per list for the tabs, then one page of the selected list
+    counts = front_desk_counts(hotel_id, day)
+    paginator = Paginator(front_desk_bookings(hotel_id, day, kind), FRONT_DESK_PAGE_SIZE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    context = {
+        'hotel': hotel,
+        'day': day,
+        'kind': kind,
+        'tabs': [(key, label, counts[key]) for key, label in FRONT_DESK_LISTS.items()],
+        'page_obj': page_obj,
+    }
+    return render(request, 'front_desk.html', context)
+
+@staff_member_required
+def front_desk_export(request, hotel_id):
+    get_object_or_404(Hotel, pk=hotel_id)
+    day = front_desk_day(request)
+    kind = request.GET.get('list', 'arrivals')
+    if day is None or kind not in FRONT_DESK_LISTS:
+        return HttpResponseBadRequest("Unknown list or date.")
+
+    header = [label for label, field in FRONT_DESK_EXPORT_FIELDS]
+    fields = [field for label, field in FRONT_DESK_EXPORT_FIELDS]
+    rows = queryset_rows(front_desk_bookings(hotel_id, day, kind), fields)
+    return stream_csv(export_filename(f'front-desk-{hotel_id}-{kind}'), header, rows)
+
+
+# Phone Lookup View (staff only)
+@staff_member_required
+def phone_lookup(request):
+    # ?q= a whole number in any format, or at least its last four digits.
+    # Customers come from the phone index in one query, their upcoming
+    # bookings from one query per shard.
+    query = request.GET.get('q', '')
+    return JsonResponse({'query': query, 'customers': lookup_by_phone(query)})
+
+
+# Profiling Views (staff only)
+@staff_member_required
+def profile_list(request):
+    url_name = request.GET.get('view') or None
+    context = {
+        'summary': profile_summary(),
+        'profiles': slowest_profiles(url_name=url_name),
+        'url_name': url_name,
+    }
+    return render(request, 'profile_list.html', context)
+
+@staff_member_required
+def profile_detail(request, profile_id):
+    sort = request.GET.get('sort', 'cumulative')
+    if sort not in ('cumulative', 'tottime', 'ncalls'):
+        sort = 'cumulative'
+
+    report = profile_report(profile_id, sort=sort)
+    if report is None:
+        raise Http404("No such profile.")
+
+    context = {
+        'profile_id': profile_id,
+        'report': report,
+        'sort': sort,
+    }
+    return render(request, 'profile_detail.html', context)
+
+
+# Group Booking View (several rooms, same dates)
+@login_required
+def group_booking(request, hotel_id):
+    hotel = get_object_or_404(Hotel, pk=hotel_id)
+    rooms = list(Room.objects.filter(hotel=hotel, availability=True).order_by('room_number'))
+
+    if request.method == 'POST':
+        # Step 1: dates and rooms are checked against the ledger in one query
+        form = GroupBookingForm(request.POST, rooms=rooms)
+        if form.is_valid():
+            request.session['group_booking'] = {
+                'hotel_id': hotel_id,
+                'rooms': form.cleaned_data['rooms'],
+                'checkin': form.cleaned_data['checkin'].isoformat(),
+                'checkout': form.cleaned_data['checkout'].isoformat(),
+            }
+            return redirect('group-booking-confirmation', hotel_id=hotel_id)
+    else:
+        form = GroupBookingForm(rooms=rooms)
+
+    context = {
+        'hotel': hotel,
+        'form': form,
+    }
+    return render(request, 'group_booking.html', context)
+
+# Group Booking Payment View
+@login_required
+def group_booking_confirmation(request, hotel_id):
+    hotel = get_object_or_404(Hotel, pk=hotel_id)
+
+    # Get the selection from the session
+    selection = request.session.get('group_booking')
+    if not selection or selection['hotel_id'] != hotel_id:
+        messages.error(request, 'Something went wrong. Please select your rooms again.')
+        return redirect('group-booking', hotel_id=hotel_id)
+
+    checkin = datetime.date.fromisoformat(selection['checkin'])
+    checkout = datetime.date.fromisoformat(selection['checkout'])
+    num_nights = (checkout - checkin).days
+    rooms = list(Room.objects.filter(hotel=hotel, room_number__in=selection['rooms']).order_by('room_number'))
+
+    # Price every room, then apply the hotel's offer to each one
+    today = datetime.date.today()
+    active_offer = active_offer_for(hotel_id, today)
+    discount_rate = (active_offer.discount / 100) if active_offer else 0
+    for room in rooms:
+        room.quote = quote_stay(room, checkin, checkout, today)
+        room.subtotal = room.quote['subtotal']
+        room.total = room.subtotal - room.subtotal * discount_rate
+
+    subtotal = sum(room.subtotal for room in rooms)
+    final_total = sum(room.total for room in rooms)
+
+    if request.method == 'POST':
+        try:
+            create_group_booking(
+                request.user,
+                hotel_id,
+                {room.room_number: room.total for room in rooms},
+                checkin,
+                checkout,
+                today
+            )
+        except RoomNotAvailable:
+            # One of the rooms was taken since step 1; nothing was saved
+            messages.error(request, 'Sorry, one of these rooms was just booked for those dates. Please choose again.')
+            return redirect('group-booking', hotel_id=hotel_id)
+
+        del request.session['group_booking']
+        messages.success(request, f'Your {len(rooms)} rooms are confirmed and payment is complete!')
+        return redirect('my-bookings')
+
+    context = {
+        'hotel': hotel,
+        'rooms': rooms,
+        'checkin': checkin,
+        'checkout': checkout,
+        'num_nights': num_nights,
+        'subtotal': subtotal,
+        'active_offer': active_offer,
+        'discount': subtotal - final_total,
+        'final_total': final_total,
     }
-    return render(request, 'payment_confirmation.html', context)
\ No newline at end of file
+    return render(request, 'group_booking_confirmation.html', context)
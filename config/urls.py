@@ -49,7 +49,9 @@ urlpatterns = [
     
     # Hotel & Room
     path('hotels/', booking_views.hotel_list, name='hotel-list'),
+    path('hotels/autocomplete/', booking_views.hotel_autocomplete, name='hotel-autocomplete'),
     path('hotels/<int:hotel_id>/', booking_views.hotel_detail, name='hotel-detail'),
+    path('hotels/<int:hotel_id>/availability/stream/', booking_views.availability_stream, name='availability-stream'),
 
     # Booking & Payment
     path('book-room/<int:hotel_id>/<str:room_number>/', 
@@ -60,6 +62,14 @@ urlpatterns = [
          booking_views.payment_confirmation, 
          name='payment-confirmation'),
          
+    path('hotels/<int:hotel_id>/group-booking/',
+         booking_views.group_booking,
+         name='group-booking'),
+
+    path('hotels/<int:hotel_id>/group-booking/confirm/',
+         booking_views.group_booking_confirmation,
+         name='group-booking-confirmation'),
+
     path('my-bookings/', booking_views.my_bookings, name='my-bookings'),
     
     path('edit-booking/<int:booking_id>/', 
@@ -84,4 +94,29 @@ urlpatterns = [
     path('profile/delete-phone/<int:cust_id>/<str:phone_number>/', 
          booking_views.delete_phone, 
          name='delete-phone'),
+
+    # Staff Reporting
+    path('staff/front-desk/<int:hotel_id>/',
+         booking_views.front_desk,
+         name='front-desk'),
+
+    path('staff/front-desk/<int:hotel_id>/export.csv',
+         booking_views.front_desk_export,
+         name='front-desk-export'),
+
+    path('staff/phone-lookup/',
+         booking_views.phone_lookup,
+         name='phone-lookup'),
+
+    path('staff/profiles/',
+         booking_views.profile_list,
+         name='profile-list'),
+
+    path('staff/profiles/<str:profile_id>/',
+         booking_views.profile_detail,
+         name='profile-detail'),
+
+    path('staff/exports/<str:kind>.<str:fmt>',
+         booking_views.export_data,
+         name='export-data'),
 ]
@@ -0,0 +1,46 @@
+# Gunicorn settings for `gunicorn config.wsgi`
+#
+# Every worker thread holds its own persistent MySQL connection, so the
+# most connections this app can open is workers x threads. Keep that below
+# DB_MAX_CONNECTIONS (your share of MySQL's max_connections) or traffic
+# spikes will hit "Too many connections".
+import multiprocessing
+import os
+
+wsgi_app = 'config.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# GUNICORN_ASGI=True serves config.asgi with uvicorn workers instead, which
+# the live availability streams need: each open stream is then a coroutine,
+# not a thread held for as long as the page stays open. Sync views run in a
+# thread pool whose threads come and go, so the settings turn persistent
+# connections off (each request opens and closes its own) and
+# GUNICORN_THREADS doesn't apply.
+serving_asgi = os.environ.get('GUNICORN_ASGI', 'False') == 'True'
+if serving_asgi:
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+
+# Recycle workers now and then so long-lived connections and memory are released
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = 100
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+db_max_connections = int(os.environ.get('DB_MAX_CONNECTIONS', 100))
+
+
+def on_starting(server):
+    # Under ASGI the connection count follows concurrent requests, not threads
+    if serving_asgi:
+        return
+    connections = workers * threads
+    if connections > db_max_connections:
+        server.log.warning(
+            'workers x threads = %d database connections, above DB_MAX_CONNECTIONS=%d. '
+            'Lower GUNICORN_WORKERS/GUNICORN_THREADS or raise the limit.',
+            connections, db_max_connections
+        )